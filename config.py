@@ -42,6 +42,13 @@ class Config:
         music_channel = os.getenv("MUSIC_CHANNEL_ID", "")
         self.MUSIC_CHANNEL_ID = int(music_channel) if music_channel else None
 
+        # Modo sharded: N processos worker, cada um com parte dos shards
+        # (1 processo = modo normal, sem sharding)
+        self.SHARD_PROCESSES = int(os.getenv("SHARD_PROCESSES", "1"))
+        self.SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))  # 0 = um por processo
+        self.SHARD_COORDINATOR_PORT = int(os.getenv("SHARD_COORDINATOR_PORT", "50505"))
+        self.SHARD_IDS = None  # Definido pelo BotRunner em cada worker
+
         # YouTube Configuration
         self.YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "")
         self.YOUTUBE_CLIENT_ID = os.getenv("YOUTUBE_CLIENT_ID", "")
@@ -53,8 +60,37 @@ class Config:
         )
         self.TOKEN_PATH = Path(os.getenv("TOKEN_PATH", "config/token.json"))
 
+        # Pool de threads dedicado para chamadas bloqueantes da YouTube Data API
+        self.YOUTUBE_API_WORKERS = int(os.getenv("YOUTUBE_API_WORKERS", "4"))
+        self.YOUTUBE_API_TIMEOUT = float(
+            os.getenv("YOUTUBE_API_TIMEOUT", "15")
+        )  # Timeout por chamada em segundos
+
+        # Pool dedicado para o yt-dlp (extrações priorizadas por tipo)
+        self.EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "4"))
+
+        # Playlists: itens resolvidos em paralelo (ajustado pela latência observada)
+        self.PLAYLIST_CONCURRENCY = int(os.getenv("PLAYLIST_CONCURRENCY", "5"))
+        self.PLAYLIST_MAX_CONCURRENCY = int(os.getenv("PLAYLIST_MAX_CONCURRENCY", "10"))
+
+        # Playlists preguiçosas: enfileira só ID/título e resolve a stream sob demanda
+        self.PLAYLIST_LAZY_RESOLVE = (
+            os.getenv("PLAYLIST_LAZY_RESOLVE", "true").lower() == "true"
+        )
+
+        # Pré-carregamento: quantas músicas à frente manter com stream válida
+        self.PRELOAD_LOOKAHEAD = max(0, int(os.getenv("PRELOAD_LOOKAHEAD", "3")))
+
+        # Renovação antecipada de stream URLs das músicas na fila (background)
+        self.STREAM_REFRESH_INTERVAL = int(os.getenv("STREAM_REFRESH_INTERVAL", "60"))
+        self.STREAM_REFRESH_MARGIN = int(os.getenv("STREAM_REFRESH_MARGIN", "900"))
+        self.STREAM_REFRESH_BATCH = int(os.getenv("STREAM_REFRESH_BATCH", "5"))
+
         # AI Service (Groq API)
         self.GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
+        self.AI_HTTP_MAX_CONNECTIONS = int(
+            os.getenv("AI_HTTP_MAX_CONNECTIONS", "4")
+        )  # Conexões simultâneas com a Groq (pool com keep-alive)
 
         # Music Player Configuration
         self.MAX_QUEUE_SIZE = int(os.getenv("MAX_QUEUE_SIZE", "100"))
@@ -75,6 +111,18 @@ class Config:
         self.AUTOPLAY_MAX_DURATION = int(
             os.getenv("AUTOPLAY_MAX_DURATION", "15")
         )  # Duração máxima em minutos (evita playlists/lives)
+        self.AUTOPLAY_POOL_SIZE = int(
+            os.getenv("AUTOPLAY_POOL_SIZE", "8")
+        )  # Candidatos aprovados guardados para as próximas sessões
+        self.AUTOPLAY_POOL_TTL = int(
+            os.getenv("AUTOPLAY_POOL_TTL", "1800")
+        )  # Validade dos candidatos do pool (segundos)
+        self.AUTOPLAY_HEDGE_ENABLED = (
+            os.getenv("AUTOPLAY_HEDGE_ENABLED", "False").lower() == "true"
+        )  # Gerar as queries das próximas estratégias em paralelo
+        self.AUTOPLAY_HEDGE_QUOTA = int(
+            os.getenv("AUTOPLAY_HEDGE_QUOTA", "200")
+        )  # Teto de quota (unidades) por hedge: 100 por estratégia
 
         # Crossfade Configuration
         self.CROSSFADE_ENABLED = (
@@ -83,15 +131,29 @@ class Config:
         self.CROSSFADE_DURATION = int(
             os.getenv("CROSSFADE_DURATION", "10")
         )  # Duração do fade em segundos
-        self.CROSSFADE_STEPS = int(
-            os.getenv("CROSSFADE_STEPS", "50")
-        )  # Número de steps no fade (quanto maior, mais suave)
+
+        # Painel de controle: re-renderiza por evento + tick de progresso
+        self.PANEL_DEBOUNCE = float(os.getenv("PANEL_DEBOUNCE", "2"))
+        self.PANEL_PROGRESS_INTERVAL = float(os.getenv("PANEL_PROGRESS_INTERVAL", "15"))
+        self.PANEL_EDITS_PER_SECOND = float(os.getenv("PANEL_EDITS_PER_SECOND", "10"))
+
+        # Orçamento global de chamadas REST de mensagens (limite do Discord: 50/s)
+        self.MESSAGE_GLOBAL_RATE = float(os.getenv("MESSAGE_GLOBAL_RATE", "40"))
+
+        # Progresso de playlist: no máximo uma edição por intervalo (s)
+        self.PLAYLIST_PROGRESS_INTERVAL = float(
+            os.getenv("PLAYLIST_PROGRESS_INTERVAL", "3")
+        )
 
         # Audio Quality Settings
         self.AUDIO_FORMAT = os.getenv("AUDIO_FORMAT", "bestaudio/best")
         self.BITRATE = int(os.getenv("BITRATE", "192"))
 
         # FFmpeg Configuration
+        # Modo de reprodução: "pcm" (volume/crossfade em Python) ou "opus"
+        # (ffmpeg entrega Opus pronto; passthrough quando possível, menos CPU)
+        self.PLAYBACK_MODE = os.getenv("PLAYBACK_MODE", "pcm").lower()
+
         self.FFMPEG_OPTIONS = {
             "before_options": "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5",
             "options": "-vn",
@@ -107,6 +169,24 @@ class Config:
         self.CACHE_MAX_SIZE_MB = int(os.getenv("CACHE_MAX_SIZE_MB", "500"))
         self.VIDEO_CACHE_SIZE = int(os.getenv("VIDEO_CACHE_SIZE", "100"))
 
+        # Cache persistente de buscas do YouTube (CACHE_DIR/search.db)
+        # Cada busca custa 100 unidades de quota; 0 = desativado
+        self.SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "21600"))  # 6h
+        self.SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000"))
+
+        # Cache local de áudio (Opus em CACHE_DIR/audio, com limite próprio:
+        # CACHE_MAX_SIZE_MB vale só para o metadata.db)
+        self.AUDIO_CACHE_ENABLED = (
+            os.getenv("AUDIO_CACHE_ENABLED", "false").lower() == "true"
+        )
+        self.AUDIO_CACHE_MAX_SIZE_MB = int(os.getenv("AUDIO_CACHE_MAX_SIZE_MB", "1000"))
+        self.AUDIO_CACHE_DIR = self.CACHE_DIR / "audio"  # Modo sharded: um por worker
+        self.AUDIO_CACHE_MAX_DURATION = int(
+            os.getenv("AUDIO_CACHE_MAX_DURATION", "900")
+        )  # Só cacheia músicas de até 15 min
+        # Reproduções antes de cachear (o preenchimento baixa a stream de novo)
+        self.AUDIO_CACHE_MIN_PLAYS = int(os.getenv("AUDIO_CACHE_MIN_PLAYS", "2"))
+
         # Feature Flags
         self.ENABLE_PLAYLISTS = os.getenv("ENABLE_PLAYLISTS", "True").lower() == "true"
         self.ENABLE_FILTERS = os.getenv("ENABLE_FILTERS", "True").lower() == "true"
@@ -175,6 +255,30 @@ class Config:
 
         return options
 
+    def get_ytdl_stream_options(self) -> dict:
+        """
+        Perfil enxuto do yt-dlp para resolver apenas a URL de stream
+
+        Baseado em get_ytdl_options, mas só com formatos de áudio e sem
+        manifests HLS/DASH, legendas, thumbnails extras ou comentários
+        """
+        options = self.get_ytdl_options()
+        options.update(
+            {
+                "format": self.AUDIO_FORMAT,
+                "skip_download": True,
+                "writesubtitles": False,
+                "writeautomaticsub": False,
+                "writethumbnail": False,
+                "getcomments": False,
+                "check_formats": False,
+                "extractor_args": {
+                    "youtube": {"skip": ["hls", "dash", "translated_subs"]}
+                },
+            }
+        )
+        return options
+
     @classmethod
     def get_instance(cls) -> "Config":
         """Retorna a instância única da configuração"""
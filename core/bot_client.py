@@ -5,7 +5,7 @@ Bot Client Core - Singleton Pattern
 import asyncio
 import discord
 from discord.ext import commands
-from typing import Optional
+from typing import Optional, cast
 import logging
 from config import config
 
@@ -38,9 +38,24 @@ class MusicBot:
         intents.guilds = True
 
         # Criar bot
-        self.bot = commands.Bot(
-            command_prefix=config.COMMAND_PREFIX, intents=intents, help_command=None
-        )
+        self.bot: commands.Bot
+        if config.SHARD_IDS is not None:
+            # Worker do modo sharded: só os shards deste processo
+            # (AutoShardedBot tem a mesma API do Bot usada pelos cogs)
+            self.bot = cast(
+                commands.Bot,
+                commands.AutoShardedBot(
+                    command_prefix=config.COMMAND_PREFIX,
+                    intents=intents,
+                    help_command=None,
+                    shard_count=config.SHARD_COUNT,
+                    shard_ids=config.SHARD_IDS,
+                ),
+            )
+        else:
+            self.bot = commands.Bot(
+                command_prefix=config.COMMAND_PREFIX, intents=intents, help_command=None
+            )
 
         # Inicializar plugin_manager como None (será criado em load_cogs)
         self.plugin_manager = None
@@ -186,6 +201,36 @@ class MusicBot:
 
             quota_tracker.force_save()
 
+            # Encerrar pool de threads da YouTube API
+            from utils.api_executor import api_executor
+
+            api_executor.shutdown()
+
+            # Parar renovação de streams e fechar cache persistente de metadados
+            from services.music_service import MusicService
+
+            MusicService.get_instance().close_cache()
+
+            # Fechar cache de buscas do YouTube
+            from services.youtube_service import YouTubeService
+
+            YouTubeService.get_instance().close_cache()
+
+            # Encerrar pool de extração do yt-dlp
+            from services.extraction_scheduler import extraction_scheduler
+
+            extraction_scheduler.shutdown()
+
+            # Descartar mensagens pendentes do orçamento de envio
+            from services.message_scheduler import message_scheduler
+
+            message_scheduler.shutdown()
+
+            # Fechar sessão HTTP persistente da IA (Groq)
+            from services.ai_service import ai_service
+
+            await ai_service.close()
+
             # 1️⃣ Desconectar voice clients
             if hasattr(self.bot, "voice_clients") and self.bot.voice_clients:
                 self.logger.debug(
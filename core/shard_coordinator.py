@@ -0,0 +1,91 @@
+"""
+Shard Coordinator - Estado compartilhado entre processos do modo sharded
+O BotRunner sobe um coordenador local (multiprocessing.managers) e N
+processos worker, cada um dono de um subconjunto dos shards do Discord.
+A quota das APIs fica em um único QuotaTracker no coordenador (workers
+contam localmente e enviam em lote). Do cache de metadados só o arquivo
+SQLite é compartilhado (WAL, vários processos): o LRU em memória e as
+escritas pendentes são de cada worker. O cache de áudio não é compartilhado
+(um diretório por worker)
+"""
+
+from multiprocessing.managers import BaseManager
+from typing import Any, Callable, List, Tuple
+
+from core.logger import LoggerFactory
+
+logger = LoggerFactory.create_logger(__name__)
+
+# Métodos do QuotaTracker acessíveis pelos workers
+# (workers contam localmente e enviam em lote: sync_operations)
+QUOTA_METHODS = (
+    "sync_operations",
+    "get_stats",
+)
+
+
+def _get_quota_tracker():
+    """Quota única do processo coordenador (importada só lá)"""
+    from utils.quota_tracker import quota_tracker
+
+    return quota_tracker
+
+
+class CoordinatorManager(BaseManager):
+    """Servidor local que expõe o estado compartilhado aos workers"""
+
+    # Criado por register() abaixo
+    quota_tracker: Callable[[], Any]
+
+
+CoordinatorManager.register(
+    "quota_tracker", callable=_get_quota_tracker, exposed=QUOTA_METHODS
+)
+
+
+def start_coordinator(address: Tuple[str, int], authkey: bytes) -> CoordinatorManager:
+    """
+    Inicia o coordenador em um processo próprio
+
+    Args:
+        address: (host, porta) do servidor local
+        authkey: Chave compartilhada com os workers
+
+    Returns:
+        Manager iniciado (chamar shutdown() no encerramento)
+    """
+    manager = CoordinatorManager(address=address, authkey=authkey)
+    manager.start()
+    logger.info(f"🧭 Coordenador de shards em {address[0]}:{address[1]}")
+    return manager
+
+
+def connect_coordinator(address: Tuple[str, int], authkey: bytes):
+    """
+    Conecta um worker ao coordenador
+
+    Args:
+        address: (host, porta) do coordenador
+        authkey: Chave recebida do BotRunner
+
+    Returns:
+        Proxy do QuotaTracker compartilhado
+    """
+    manager = CoordinatorManager(address=address, authkey=authkey)
+    manager.connect()
+    return manager.quota_tracker()
+
+
+def split_shards(shard_count: int, processes: int) -> List[List[int]]:
+    """
+    Distribui os shards entre os processos (round-robin)
+
+    Args:
+        shard_count: Total de shards do bot
+        processes: Número de processos worker
+
+    Returns:
+        Lista de shard_ids por processo (sem listas vazias)
+    """
+    processes = max(1, min(processes, shard_count))
+    return [list(range(i, shard_count, processes)) for i in range(processes)]
@@ -9,8 +9,11 @@ from discord.ext import commands
 from typing import Optional
 
 from services import MusicService, YouTubeService
+from services.message_scheduler import MessagePriority, ProgressReporter, message_scheduler
+from services.title_filter import NON_MUSIC_RULES
 from core.logger import LoggerFactory
 from config import config
+from utils.api_executor import api_executor
 from utils.quota_tracker import quota_tracker
 
 
@@ -186,7 +189,7 @@ class MusicCommands(commands.Cog):
                 return
 
         # Mensagem de processamento
-        processing_msg = await ctx.send("🔍 Buscando música...")
+        processing_msg = await message_scheduler.send(ctx, "🔍 Buscando música...")
 
         try:
             # Obter player do servidor e garantir que tem canal de texto
@@ -197,24 +200,48 @@ class MusicCommands(commands.Cog):
 
             if is_playlist_url:
                 # Processar playlist
-                await processing_msg.edit(
+                await message_scheduler.edit(
+                    processing_msg,
+                    priority=MessagePriority.REPLY,
                     content="📋 Processando playlist... Isso pode levar alguns segundos.\n"
                     "💡 Use `.cancelar` para interromper o processamento."
                 )
 
                 # Variáveis para controle de adição
                 songs_added = 0
-                songs_failed = 0
+                songs_resolved = 0
                 first_song_playing = False
+                current_title = None
 
-                # Callback para atualizar progresso E adicionar músicas em tempo real
-                async def update_progress(
-                    current, total, processed, failed, current_title, song=None
-                ):
-                    nonlocal songs_added, songs_failed, first_song_playing
+                stream = await self.music_service.open_playlist(
+                    query, ctx.author, player
+                )
+
+                def render_progress():
+                    """Texto de progresso (lido pelo reporter, fora do loop)"""
+                    if current_title is None:
+                        return None
+                    return (
+                        f"📋 **Processando Playlist**\n\n"
+                        f"📊 Progresso: {stream.position}/{len(stream.entries)} itens\n"
+                        f"✅ Adicionadas: {songs_added} músicas\n"
+                        f"❌ Falhas: {len(stream.errors)}\n"
+                        f"🎵 Processando: {current_title[:40]}...\n\n"
+                        f"💡 Use `.cancelar` para interromper"
+                    )
 
-                    # Se recebeu uma música, adicionar à fila IMEDIATAMENTE
-                    if song:
+                # ⏱️ No máximo uma edição de progresso por intervalo
+                progress = ProgressReporter(
+                    processing_msg, render_progress, config.PLAYLIST_PROGRESS_INTERVAL
+                )
+                progress.start()
+
+                # Músicas chegam em ordem assim que resolvidas: a primeira começa
+                # a tocar sem esperar pelas demais (por mais lentas que sejam)
+                try:
+                    async for song in stream:
+                        songs_resolved += 1
+                        current_title = song.title
                         try:
                             # Primeira música: tocar imediatamente se nada está tocando
                             if not player.is_playing and not first_song_playing:
@@ -226,54 +253,35 @@ class MusicCommands(commands.Cog):
                                         player, ctx.voice_client, song
                                     )
                                 )
-                                self.logger.info(
-                                    f"🎵 Tocando primeira música: {song.title}"
-                                )
+                                self.logger.info(f"🎵 Tocando primeira música: {song.title}")
                             else:
                                 # Adicionar às próximas da fila
                                 if len(player.queue) < config.MAX_QUEUE_SIZE:
                                     player.add_song(song)
                                     songs_added += 1
-                                    self.logger.info(
-                                        f"➕ Adicionada à fila: {song.title}"
-                                    )
+                                    self.music_service.schedule_preload(player)
+                                    self.logger.info(f"➕ Adicionada à fila: {song.title}")
                         except Exception as e:
-                            songs_failed += 1
                             self.logger.warning(f"Erro ao adicionar música: {e}")
+                finally:
+                    progress.finish()
 
-                    # Atualizar mensagem de progresso
-                    try:
-                        progress_text = (
-                            f"📋 **Processando Playlist**\n\n"
-                            f"📊 Progresso: {current}/{total} itens\n"
-                            f"✅ Adicionadas: {songs_added} músicas\n"
-                            f"❌ Falhas: {failed}\n"
-                            f"🎵 Processando: {current_title[:40]}...\n\n"
-                            f"💡 Use `.cancelar` para interromper"
-                        )
-                        await processing_msg.edit(content=progress_text)
-                    except (discord.HTTPException, asyncio.TimeoutError) as e:
-                        self.logger.debug(f"Erro ao atualizar progresso: {e}")
-                        pass  # Ignorar erros de edição (rate limit, etc)
-                    except Exception as e:
-                        self.logger.error(
-                            f"Erro inesperado ao atualizar progresso: {e}"
-                        )
-
-                result = await self.music_service.extract_playlist(
-                    query, ctx.author, player, update_progress
-                )
+                # Resetar flag de cancelamento
+                player.cancel_playlist_processing = False
+                result = stream.summary()
 
-                # Músicas já foram adicionadas em tempo real pelo callback!
+                # Músicas já foram adicionadas em tempo real durante a iteração!
                 # Apenas verificar se alguma foi adicionada
-                if songs_added == 0 and not result["songs"]:
-                    await processing_msg.edit(
+                if songs_added == 0 and songs_resolved == 0:
+                    await message_scheduler.edit(
+                        processing_msg,
+                        priority=MessagePriority.REPLY,
                         content="❌ Nenhuma música pôde ser extraída da playlist."
                     )
                     return
 
                 # Calcular músicas que não couberam (se houver)
-                songs_skipped = max(0, len(result["songs"]) - songs_added)
+                songs_skipped = max(0, songs_resolved - songs_added)
 
                 # Criar embed com resumo
                 embed_title = "📋 Playlist Adicionada"
@@ -332,9 +340,11 @@ class MusicCommands(commands.Cog):
                         inline=False,
                     )
 
-                await processing_msg.edit(content=None, embed=embed)
+                await message_scheduler.edit(
+                    processing_msg, content=None, embed=embed, priority=MessagePriority.REPLY
+                )
 
-                # Primeira música já foi tocada automaticamente pelo callback!
+                # Primeira música já foi tocada automaticamente durante a iteração!
                 # Não precisa fazer nada aqui
 
             else:
@@ -344,6 +354,7 @@ class MusicCommands(commands.Cog):
                 # Se já está tocando, adicionar à fila
                 if player.is_playing:
                     player.add_song(song)
+                    self.music_service.schedule_preload(player)
 
                     embed = discord.Embed(
                         title="➕ Adicionado à Fila",
@@ -356,16 +367,25 @@ class MusicCommands(commands.Cog):
                     )
                     embed.set_thumbnail(url=song.thumbnail)
 
-                    await processing_msg.edit(content=None, embed=embed)
+                    await message_scheduler.edit(
+                        processing_msg, content=None, embed=embed, priority=MessagePriority.REPLY
+                    )
                 else:
                     # Tocar imediatamente
                     await self.music_service.play_song(player, ctx.voice_client, song)
-                    await processing_msg.edit(content=None, embed=song.to_embed())
+                    await message_scheduler.edit(
+                        processing_msg,
+                        content=None,
+                        embed=song.to_embed(),
+                        priority=MessagePriority.REPLY,
+                    )
 
         except ValueError as e:
             # Erros específicos de validação com mensagens amigáveis
             self.logger.warning(f"Erro de validação ao tocar música: {e}")
-            await processing_msg.edit(content=f"⚠️ {str(e)}")
+            await message_scheduler.edit(
+                processing_msg, content=f"⚠️ {str(e)}", priority=MessagePriority.REPLY
+            )
         except Exception as e:
             # Outros erros mais técnicos
             self.logger.error(f"Erro ao tocar música: {e}", exc_info=True)
@@ -394,7 +414,9 @@ class MusicCommands(commands.Cog):
             else:
                 error_msg = f"❌ Erro ao processar música: {str(e)[:100]}..."
 
-            await processing_msg.edit(content=error_msg)
+            await message_scheduler.edit(
+                processing_msg, content=error_msg, priority=MessagePriority.REPLY
+            )
 
     @commands.command(name="pause", aliases=["pausar"])
     async def pause(self, ctx: commands.Context):
@@ -561,9 +583,8 @@ class MusicCommands(commands.Cog):
             return
 
         # Remover música (position - 1 porque a fila começa em 0)
-        queue_list = list(player.queue)
-        removed_song = queue_list.pop(position - 1)
-        player.queue = __import__("collections").deque(queue_list)
+        removed_song = player.remove_song(position - 1)
+        self.music_service.schedule_preload(player)
 
         embed = discord.Embed(
             title="🗑️ Música Removida",
@@ -610,6 +631,7 @@ class MusicCommands(commands.Cog):
             return
 
         player.shuffle()
+        self.music_service.schedule_preload(player)
         await ctx.send("🔀 Fila embaralhada!")
 
     @commands.command(name="disconnect", aliases=["dc", "leave", "sair"])
@@ -635,7 +657,10 @@ class MusicCommands(commands.Cog):
         processing_msg = await ctx.send("🔍 Buscando no YouTube...")
 
         try:
-            results = await self.youtube_service.search_video(query, max_results=5)
+            # Sem conteúdo não-musical (react, explicações, canais bloqueados)
+            results = await self.youtube_service.search_video(
+                query, max_results=5, exclude_rules=NON_MUSIC_RULES
+            )
 
             if not results:
                 await processing_msg.edit(content="❌ Nenhum resultado encontrado!")
@@ -705,7 +730,12 @@ class MusicCommands(commands.Cog):
                 if len(player.autoplay_history) > 0:
                     embed.add_field(
                         name="📊 Estatísticas",
-                        value=f"Músicas no histórico: {len(player.autoplay_history)}",
+                        value=(
+                            f"Músicas no histórico: {len(player.autoplay_history)}\n"
+                            f"Candidatos guardados: {len(player.autoplay_pool)}\n"
+                            f"Sessões sem busca (pool): {player.autoplay_pool_hits}"
+                            f" / com busca: {player.autoplay_searches}"
+                        ),
                         inline=False,
                     )
             else:
@@ -727,6 +757,7 @@ class MusicCommands(commands.Cog):
                 return
 
             player.autoplay_enabled = True
+            player.notify_state_changed()
 
             embed = discord.Embed(
                 title="✅ Autoplay Ativado",
@@ -758,6 +789,7 @@ class MusicCommands(commands.Cog):
                 return
 
             player.autoplay_enabled = False
+            player.notify_state_changed()
 
             embed = discord.Embed(
                 title="🔴 Autoplay Desativado",
@@ -843,7 +875,7 @@ class MusicCommands(commands.Cog):
                 await ctx.send("ℹ️ Crossfade já está ativado!")
                 return
 
-            player.crossfade_enabled = True
+            player.set_crossfade(True)
 
             embed = discord.Embed(
                 title="✅ Crossfade Ativado",
@@ -875,12 +907,8 @@ class MusicCommands(commands.Cog):
                 await ctx.send("ℹ️ Crossfade já está desativado!")
                 return
 
-            player.crossfade_enabled = False
-
-            # Cancelar fade em andamento se houver
-            if player.fade_task:
-                player.fade_task.cancel()
-                player.fade_task = None
+            # Música atual termina sem fade out; próxima volta para a fila
+            player.set_crossfade(False)
 
             embed = discord.Embed(
                 title="🔴 Crossfade Desativado",
@@ -998,6 +1026,44 @@ class MusicCommands(commands.Cog):
                 inline=False,
             )
 
+        # 💾 Cache de buscas (cada acerto economiza uma busca de 100 unidades)
+        search_cache = self.youtube_service.search_cache
+        if search_cache:
+            cache_stats = search_cache.get_stats()
+            units_saved = cache_stats["hits"] * quota_tracker.OPERATION_COSTS["search"]
+            embed.add_field(
+                name="💾 Cache de Buscas (hoje)",
+                value=(
+                    f"```\n"
+                    f"Acertos: {cache_stats['hits']:,} | Erros: {cache_stats['misses']:,} "
+                    f"({cache_stats['hit_rate']:.1f}%)\n"
+                    f"Quota economizada: {units_saved:,} unidades\n"
+                    f"Buscas guardadas: {cache_stats['entries']:,} / {cache_stats['max_entries']:,} "
+                    f"(TTL {cache_stats['ttl_hours']:g}h)\n"
+                    f"```"
+                ),
+                inline=False,
+            )
+
+        # 🧵 Pool de threads da YouTube API (chamadas fora do event loop)
+        executor_stats = api_executor.get_stats()
+        if executor_stats["calls"]:
+            embed.add_field(
+                name="🧵 Execução da API",
+                value=(
+                    f"```\n"
+                    f"Chamadas: {executor_stats['calls']:,} | Em andamento: "
+                    f"{executor_stats['in_flight']}/{executor_stats['workers']}\n"
+                    f"Erros: {executor_stats['errors']} | Timeouts: {executor_stats['timeouts']}\n"
+                    f"Tempo na thread: média {executor_stats['avg_exec_ms']:.0f}ms | "
+                    f"máx {executor_stats['max_exec_ms']:.0f}ms\n"
+                    f"Espera por thread: média {executor_stats['avg_queue_wait_ms']:.0f}ms | "
+                    f"máx {executor_stats['max_queue_wait_ms']:.0f}ms\n"
+                    f"```"
+                ),
+                inline=False,
+            )
+
         # ═══════════════ Groq API ═══════════════
         groq_emoji = (
             "🟢"
@@ -1047,7 +1113,8 @@ class MusicCommands(commands.Cog):
         Mostra estatísticas do cache LRU de vídeos
 
         O cache armazena informações de vídeos já processados para
-        evitar reprocessamento e reduzir chamadas ao yt-dlp.
+        evitar reprocessamento e reduzir chamadas ao yt-dlp. Todas as
+        extrações (play, playlist, pré-carregamento, autoplay) passam por ele.
 
         Uso: !cachestats
         """
@@ -1091,6 +1158,36 @@ class MusicCommands(commands.Cog):
             inline=False,
         )
 
+        # 💾 Cache persistente (disco)
+        if stats["persistent"]:
+            embed.add_field(
+                name="💾 Disco",
+                value=(
+                    f"```\n"
+                    f"Vídeos:  {stats['disk_entries']:,}\n"
+                    f"Tamanho: {stats['disk_size_mb']:.1f}/{stats['disk_max_size_mb']:.0f} MB\n"
+                    f"Só stream renovada: {stats['stale']:,} (metadados reaproveitados)\n"
+                    f"```"
+                ),
+                inline=False,
+            )
+
+        # 💽 Cache de áudio local (opcional)
+        audio = stats["audio_cache"]
+        if audio:
+            embed.add_field(
+                name="💽 Áudio em Disco",
+                value=(
+                    f"```\n"
+                    f"Músicas: {audio['entries']:,} "
+                    f"({audio['size_mb']:.1f}/{audio['max_size_mb']:.0f} MB)\n"
+                    f"Tocadas do disco: {audio['hits']:,} ({audio['hit_rate']:.1f}%)\n"
+                    f"Salvando agora: {audio['filling']} | Removidas: {audio['evictions']:,}\n"
+                    f"```"
+                ),
+                inline=False,
+            )
+
         # 🎯 Hit Rate
         hits_bar = self._create_progress_bar(hit_rate, length=15)
         embed.add_field(
@@ -1099,18 +1196,133 @@ class MusicCommands(commands.Cog):
                 f"```\n"
                 f"Hits:   {stats['hits']:,} ({hit_rate:.1f}%)\n"
                 f"Misses: {stats['misses']:,}\n"
+                f"Coalescidas: {stats['coalesced']:,}\n"
                 f"{hits_bar}\n"
                 f"```"
             ),
             inline=False,
         )
 
+        # ⚡ Extrações economizadas (pedidos que aguardaram uma extração em andamento)
+        if stats["extractions_saved"]:
+            embed.add_field(
+                name="⚡ Extrações Economizadas",
+                value=(
+                    f"```\n"
+                    f"Economizadas: {stats['extractions_saved']:,}\n"
+                    f"Tempo salvo:  ~{stats['time_saved_s']:.1f}s "
+                    f"(média {stats['avg_extraction_s']:.1f}s/extração)\n"
+                    f"```"
+                ),
+                inline=False,
+            )
+
+        # 🔄 Renovação antecipada de stream URLs
+        refresh = stats["stream_refresh"]
+        embed.add_field(
+            name="🔄 Renovação de Streams",
+            value=(
+                f"```\n"
+                f"Renovadas: {refresh['refreshed']:,} | Falhas: {refresh['failed']:,}\n"
+                f"Antecedência: {refresh['margin_s'] // 60:.0f} min "
+                f"(varredura a cada {refresh['interval_s']:.0f}s)\n"
+                f"```"
+            ),
+            inline=False,
+        )
+
+        # 🎛️ Painéis de controle (todos os servidores)
+        panels = stats["panels"]
+        embed.add_field(
+            name="🎛️ Painéis",
+            value=(
+                f"```\n"
+                f"Edições: {panels['renders']:,} | Agrupadas: {panels['coalesced']:,}\n"
+                f"Adiadas por limite: {panels['throttled']:,} | Pendentes: {panels['pending']}\n"
+                f"Puladas (sem mudança): {panels['skipped']:,}\n"
+                f"```"
+            ),
+            inline=False,
+        )
+
+        # 📨 Orçamento de mensagens do bot (por tipo de rota)
+        outbound = message_scheduler.get_stats()
+        route_lines = [
+            f"{kind}: {route['sent']:,} ok | {route['superseded']:,} substituídas | "
+            f"{route['rate_limited']} 429 | espera média {route['avg_wait_ms']:.0f}ms"
+            for kind, route in outbound["by_route"].items()
+        ]
+        embed.add_field(
+            name="📨 Mensagens",
+            value=(
+                "```\n"
+                + "\n".join(route_lines)
+                + f"\nPendentes: {outbound['pending']} | Tokens globais: "
+                f"{outbound['global_tokens']:.0f}/{outbound['global_rate']:.0f}\n"
+                "```"
+            ),
+            inline=False,
+        )
+
+        # 🔌 Conexões com a IA (Groq)
+        from services.ai_service import ai_service
+
+        ai_http = ai_service.get_stats()
+        embed.add_field(
+            name="🔌 Conexões IA",
+            value=(
+                f"```\n"
+                f"Requisições: {ai_http['requests']:,} | Conexões novas: "
+                f"{ai_http['connections_created']:,}\n"
+                f"Reaproveitadas: {ai_http['connections_reused']:,} "
+                f"({ai_http['reuse_rate']:.1f}%)\n"
+                f"```"
+            ),
+            inline=False,
+        )
+
+        # 🚀 Pré-carregamento deste servidor (não há player em DM)
+        if ctx.guild:
+            preload = self.music_service.get_player(ctx.guild.id).get_preload_stats()
+            embed.add_field(
+                name="🚀 Pré-carregamento (este servidor)",
+                value=(
+                    f"```\n"
+                    f"Janela:   {preload['ready']}/{preload['window']} prontas "
+                    f"(lookahead {preload['lookahead']})\n"
+                    f"Hit rate: {preload['hit_rate']:.1f}% "
+                    f"({preload['hits']} prontas, {preload['misses']} extraídas na hora)\n"
+                    f"```"
+                ),
+                inline=False,
+            )
+
+        # ⚙️ Pool de extração do yt-dlp
+        scheduler = stats["scheduler"]
+        waits = "\n".join(
+            f"{name:<15} fila {info['pending']:>3} | espera média {info['avg_wait_ms']:>6.0f}ms"
+            for name, info in scheduler["by_priority"].items()
+        )
+        embed.add_field(
+            name="⚙️ Extrações (yt-dlp)",
+            value=(
+                f"```\n"
+                f"Workers: {scheduler['running']}/{scheduler['workers']} ocupados\n"
+                f"Fila:    {scheduler['queue_depth']} (máx. {scheduler['max_queue_depth']})\n"
+                f"Promovidas: {scheduler['promoted']}\n"
+                f"{waits}\n"
+                f"```"
+            ),
+            inline=False,
+        )
+
         # ℹ️ Informações
         embed.add_field(
             name="ℹ️ Como Funciona",
             value=(
                 "• **Hit:** Vídeo encontrado em cache (rápido)\n"
                 "• **Miss:** Vídeo precisa ser extraído (lento)\n"
+                "• **Coalescida:** Aproveitou extração já em andamento\n"
                 "• **LRU:** Remove vídeos menos usados quando cheio\n"
                 "• **Meta:** Hit rate >60% é considerado bom"
             ),
@@ -1125,13 +1337,13 @@ class MusicCommands(commands.Cog):
                     "Hit rate baixo pode indicar:\n"
                     "• Músicas muito variadas (normal)\n"
                     "• Cache muito pequeno (aumentar MAX_SIZE)\n"
-                    "• Bot reiniciado recentemente (cache limpo)"
+                    "• Cache persistente desativado (CACHE_ENABLED)"
                 ),
                 inline=False,
             )
 
         embed.set_footer(
-            text="💾 Cache é limpo ao reiniciar o bot | LRU = Least Recently Used"
+            text="💾 Metadados salvos em disco entre reinícios | LRU = Least Recently Used"
         )
 
         await ctx.send(embed=embed)
@@ -1257,7 +1469,7 @@ class MusicCommands(commands.Cog):
             # Verificar se o usuário está no canal de voz
             if not user.voice or not user.voice.channel:
                 try:
-                    await reaction.remove(user)
+                    await message_scheduler.remove_reaction(reaction, user)
                     self.logger.debug(
                         f"🚫 Reação removida - {user.name} não está no canal de voz"
                     )
@@ -1273,7 +1485,7 @@ class MusicCommands(commands.Cog):
             voice_client = player.voice_client
             if not voice_client:
                 try:
-                    await reaction.remove(user)
+                    await message_scheduler.remove_reaction(reaction, user)
                     self.logger.debug(f"🚫 Reação removida - bot não está conectado")
                 except discord.Forbidden:
                     self.logger.warning(
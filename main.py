@@ -4,6 +4,9 @@ Ponto de entrada da aplicação
 """
 
 import asyncio
+import multiprocessing
+import os
+import signal
 import sys
 import threading
 from pathlib import Path
@@ -22,7 +25,10 @@ from config import config
 
 
 class BotRunner:
-    """Gerenciador de execução do bot com suporte a threading"""
+    """Gerenciador de execução do bot com suporte a threading e modo sharded"""
+
+    # Espera antes de reiniciar um worker que caiu (s)
+    WORKER_RESTART_DELAY = 5.0
 
     def __init__(self):
         self.logger = LoggerFactory.create_logger(__name__)
@@ -31,6 +37,15 @@ class BotRunner:
         self.shutdown_event = threading.Event()
         self.loop = None
 
+        # 🧩 Modo sharded (SHARD_PROCESSES > 1)
+        self.coordinator = None
+        self.coordinator_address = None
+        self.authkey = None
+        self.shard_count = 0
+        self.shard_plan = []  # shard_ids de cada worker
+        self.workers = {}  # índice -> multiprocessing.Process
+        self.worker_restarts = 0
+
     def run_bot_in_thread(self):
         """Executa o bot em uma thread separada"""
         try:
@@ -89,6 +104,9 @@ class BotRunner:
                 self.logger.error(f"  - {error}")
             return False
 
+        if config.SHARD_PROCESSES > 1 and config.SHARD_IDS is None:
+            return self._start_sharded()
+
         # Criar instância do bot
         self.music_bot = MusicBot.get_instance()
 
@@ -99,6 +117,87 @@ class BotRunner:
         self.logger.info("✅ Bot iniciado (Pressione Ctrl+C para encerrar)")
         return True
 
+    def _start_sharded(self) -> bool:
+        """Sobe o coordenador local e um processo worker por grupo de shards"""
+        from core.shard_coordinator import split_shards, start_coordinator
+
+        self.shard_count = config.SHARD_COUNT or config.SHARD_PROCESSES
+        self.shard_plan = split_shards(self.shard_count, config.SHARD_PROCESSES)
+        self.coordinator_address = ("127.0.0.1", config.SHARD_COORDINATOR_PORT)
+        self.authkey = os.urandom(16)
+        self.coordinator = start_coordinator(self.coordinator_address, self.authkey)
+
+        self.logger.info(
+            f"🧩 Modo sharded: {self.shard_count} shard(s) em "
+            f"{len(self.shard_plan)} processo(s)"
+        )
+        for index in range(len(self.shard_plan)):
+            self._spawn_worker(index)
+
+        self.logger.info("✅ Workers iniciados (Pressione Ctrl+C para encerrar)")
+        return True
+
+    def _spawn_worker(self, index: int):
+        """Inicia (ou reinicia) o processo worker de um grupo de shards"""
+        # spawn: processo limpo, sem herdar threads/event loop do supervisor
+        context = multiprocessing.get_context("spawn")
+        process = context.Process(
+            target=run_shard_worker,
+            args=(
+                self.shard_plan[index],
+                self.shard_count,
+                len(self.shard_plan),
+                self.coordinator_address,
+                self.authkey,
+            ),
+            name=f"shard-worker-{index}",
+        )
+        process.start()
+        self.workers[index] = process
+        self.logger.info(
+            f"🧩 Worker {index} (PID {process.pid}): shards {self.shard_plan[index]}"
+        )
+
+    def _supervise(self):
+        """Reinicia workers que caíram até o encerramento"""
+        while not self.shutdown_event.is_set():
+            for index, process in list(self.workers.items()):
+                if process.is_alive() or self.shutdown_event.is_set():
+                    continue
+
+                self.worker_restarts += 1
+                self.logger.warning(
+                    f"⚠️ Worker {index} encerrou (código {process.exitcode}), "
+                    f"reiniciando em {self.WORKER_RESTART_DELAY:.0f}s..."
+                )
+                self.shutdown_event.wait(self.WORKER_RESTART_DELAY)
+                if not self.shutdown_event.is_set():
+                    self._spawn_worker(index)
+
+            self.shutdown_event.wait(1.0)
+
+    def _stop_sharded(self):
+        """Encerra os workers (SIGTERM → shutdown gracioso) e o coordenador"""
+        for process in self.workers.values():
+            if process.is_alive():
+                process.terminate()
+
+        for index, process in self.workers.items():
+            process.join(timeout=10)
+            if process.is_alive():
+                self.logger.warning(f"⚠️ Worker {index} não encerrou, forçando...")
+                process.kill()
+                process.join(timeout=1)
+
+        if self.coordinator:
+            try:
+                # Quota compartilhada é gravada pelo coordenador
+                self.coordinator.quota_tracker().force_save()
+            except Exception as e:
+                self.logger.debug(f"Erro ao salvar quota do coordenador: {e}")
+            self.coordinator.shutdown()
+            self.coordinator = None
+
     def stop(self):
         """Para o bot graciosamente"""
         if self.shutdown_event.is_set():
@@ -108,6 +207,15 @@ class BotRunner:
         self.shutdown_event.set()
         self.logger.info("\n🛑 Iniciando encerramento gracioso...")
 
+        if self.workers:
+            try:
+                self._stop_sharded()
+            except Exception as e:
+                self.logger.debug(f"Erro durante encerramento: {e}")
+            finally:
+                self.logger.info("✅ Encerramento concluído")
+            return
+
         try:
             if self.music_bot and self.loop and not self.loop.is_closed():
                 # Agendar encerramento no loop do bot
@@ -139,6 +247,10 @@ class BotRunner:
     def wait(self):
         """Aguarda até que Ctrl+C seja pressionado"""
         try:
+            if self.workers:
+                self._supervise()
+                return
+
             # Aguardar a thread do bot
             while self.bot_thread and self.bot_thread.is_alive():
                 self.bot_thread.join(timeout=0.5)
@@ -148,6 +260,49 @@ class BotRunner:
             self.stop()
 
 
+def run_shard_worker(
+    shard_ids, shard_count: int, processes: int, address, authkey: bytes
+):
+    """
+    Ponto de entrada de um processo worker do modo sharded
+
+    Args:
+        shard_ids: Shards deste processo
+        shard_count: Total de shards do bot
+        processes: Total de processos worker
+        address: Endereço do coordenador local
+        authkey: Chave do coordenador
+    """
+    # Ctrl+C é tratado pelo supervisor, que encerra os workers com SIGTERM
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    config.SHARD_COUNT = shard_count
+    config.SHARD_IDS = list(shard_ids)
+    # O limite global de mensagens do Discord é por token: dividir entre processos
+    # (o message_scheduler já foi criado no import, com o valor cheio)
+    config.MESSAGE_GLOBAL_RATE = config.MESSAGE_GLOBAL_RATE / processes
+
+    from core.shard_coordinator import connect_coordinator
+    from services.message_scheduler import message_scheduler
+    from utils.quota_tracker import quota_tracker
+
+    message_scheduler.set_global_rate(config.MESSAGE_GLOBAL_RATE)
+
+    # O índice do cache de áudio (index.json, .part) é de um processo só:
+    # cada worker usa o próprio diretório, com a sua parte do limite
+    config.AUDIO_CACHE_DIR = config.AUDIO_CACHE_DIR / f"shard-{shard_ids[0]}"
+    config.AUDIO_CACHE_MAX_SIZE_MB = config.AUDIO_CACHE_MAX_SIZE_MB // processes
+
+    quota_tracker.attach_coordinator(connect_coordinator(address, authkey))
+
+    runner = BotRunner()
+    runner.logger.info(f"🧩 Worker PID {os.getpid()}: shards {config.SHARD_IDS}")
+    signal.signal(signal.SIGTERM, lambda *_: runner.stop())
+
+    if runner.start():
+        runner.wait()
+
+
 def main():
     """Função principal"""
     logger = LoggerFactory.create_logger(__name__)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Extração completa vs. perfil enxuto do yt-dlp
+
+Compara tempo de parede e memória alocada (tracemalloc) entre
+config.get_ytdl_options() (extração completa) e
+config.get_ytdl_stream_options() + slim_info (só o necessário para tocar).
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import yt_dlp
+
+from config import config
+from services.metadata_resolver import build_video_record, slim_info
+
+DEFAULT_URLS = [
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?v=kJQP7kiw5Fk",
+    "https://www.youtube.com/watch?v=9bZkp7q19f0",
+]
+
+
+def parse_args():
+    """Parse argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(
+        description="Compara extração completa e enxuta do yt-dlp"
+    )
+    parser.add_argument(
+        "urls", nargs="*", default=DEFAULT_URLS, help="URLs de vídeos do YouTube"
+    )
+    parser.add_argument(
+        "-r", "--rounds", type=int, default=2, help="Repetições por URL (padrão: 2)"
+    )
+    return parser.parse_args()
+
+
+def measure(label: str, options: dict, urls: list, rounds: int, lean: bool) -> dict:
+    """
+    Extrai cada URL medindo tempo e pico de memória
+
+    Args:
+        label: Nome do perfil (exibido no relatório)
+        options: Opções do yt-dlp
+        urls: URLs a extrair
+        rounds: Repetições por URL
+        lean: Se True, compacta o resultado com slim_info (como o bot faz)
+
+    Returns:
+        Dicionário com tempos (s), picos de memória (MB) e tamanho do resultado
+    """
+    ytdl = yt_dlp.YoutubeDL(options)
+    times, peaks, kept = [], [], []
+
+    for _ in range(rounds):
+        for url in urls:
+            tracemalloc.start()
+            start = time.perf_counter()
+            try:
+                info = ytdl.extract_info(url, download=False)
+                if lean:
+                    info = slim_info(info)
+                record = build_video_record(info, url)
+            except Exception as e:
+                tracemalloc.stop()
+                print(f"   ❌ {label}: {url} ({str(e)[:60]})")
+                continue
+
+            elapsed = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            times.append(elapsed)
+            peaks.append(peak / 1024 / 1024)
+            kept.append(current / 1024 / 1024)
+
+            if not record["stream_url"]:
+                print(f"   ⚠️ {label}: sem stream_url para {url}")
+
+    return {"times": times, "peaks": peaks, "kept": kept}
+
+
+def report(label: str, result: dict):
+    """Exibe o resumo de um perfil"""
+    if not result["times"]:
+        print(f"\n{label}: nenhuma extração concluída")
+        return
+
+    print(f"\n📊 {label} ({len(result['times'])} extrações)")
+    print(f"   - Tempo médio:   {statistics.mean(result['times']):.2f}s")
+    print(f"   - Tempo mediano: {statistics.median(result['times']):.2f}s")
+    print(f"   - Pico de memória médio: {statistics.mean(result['peaks']):.1f} MB")
+    print(f"   - Memória retida média:  {statistics.mean(result['kept']):.2f} MB")
+
+
+def main() -> int:
+    """Função principal do script"""
+    args = parse_args()
+
+    print(f"🔍 Comparando perfis de extração ({len(args.urls)} URLs x {args.rounds})")
+
+    full = measure("Completa", config.get_ytdl_options(), args.urls, args.rounds, lean=False)
+    lean = measure(
+        "Enxuta", config.get_ytdl_stream_options(), args.urls, args.rounds, lean=True
+    )
+
+    report("Extração completa (get_ytdl_options)", full)
+    report("Extração enxuta (get_ytdl_stream_options + slim_info)", lean)
+
+    if full["times"] and lean["times"]:
+        speedup = statistics.mean(full["times"]) / statistics.mean(lean["times"])
+        memory = statistics.mean(full["peaks"]) / max(statistics.mean(lean["peaks"]), 1e-6)
+        print(f"\n✅ Enxuta: {speedup:.2f}x mais rápida, {memory:.2f}x menos pico de memória")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
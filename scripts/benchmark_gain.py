@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark: frames PCM por segundo de CPU no processamento de volume/ganho
+
+Mede só o custo em Python por frame de 20ms (sem ffmpeg nem encoder Opus),
+com uma fonte PCM sintética:
+
+- pcm-volume:   discord.PCMVolumeTransformer (volume constante, audioop)
+- gain:         GainTransformer com volume constante
+- gain-ramp:    GainTransformer com volume mudando a cada frame (pior caso)
+- crossfade:    CrossfadeMixer dentro da janela de crossfade (2 fontes)
+
+Os modos gain* e crossfade rodam com numpy (se instalado) e com o fallback
+sem numpy, para comparar.
+"""
+
+import argparse
+import array
+import math
+import sys
+import time
+from typing import Any, List, Tuple
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import discord
+
+from services.audio_sources import (
+    FRAME_SIZE,
+    FRAMES_PER_SECOND,
+    CrossfadeMixer,
+    GainProcessor,
+    GainTransformer,
+)
+
+MODES = ("pcm-volume", "gain", "gain-ramp", "crossfade")
+
+
+class SyntheticPCM(discord.AudioSource):
+    """Fonte PCM infinita com um seno de 440 Hz"""
+
+    def __init__(self):
+        samples = FRAME_SIZE // 4
+        wave = [int(12000 * math.sin(2 * math.pi * 440 * i / 48000)) for i in range(samples)]
+        self.frame = array.array("h", [s for sample in wave for s in (sample, sample)]).tobytes()
+
+    def read(self) -> bytes:
+        return self.frame
+
+
+def parse_args():
+    """Parse argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(
+        description="Mede frames/s por núcleo do processamento de ganho PCM"
+    )
+    parser.add_argument(
+        "-f", "--frames", type=int, default=20000, help="Frames por medição (padrão: 20000)"
+    )
+    parser.add_argument(
+        "-m", "--modes", nargs="+", choices=MODES, default=list(MODES), help="Modos a medir"
+    )
+    return parser.parse_args()
+
+
+def create_source(mode: str, use_numpy: bool) -> discord.AudioSource:
+    """Cria a fonte a medir"""
+    if mode == "pcm-volume":
+        return discord.PCMVolumeTransformer(SyntheticPCM(), volume=0.5)
+    if mode in ("gain", "gain-ramp"):
+        return GainTransformer(SyntheticPCM(), volume=0.5, processor=GainProcessor(use_numpy))
+
+    # Crossfade de 10s: a música atual já está no começo do fade out
+    fade_seconds = 10
+    mixer = CrossfadeMixer(
+        SyntheticPCM(),
+        "a",
+        duration=fade_seconds * 3,
+        crossfade=fade_seconds,
+        volume=0.5,
+        on_need_next=lambda tag: None,
+        on_handoff=lambda old, new: None,
+    )
+    mixer._processor = GainProcessor(use_numpy)
+    deck = mixer._current
+    assert deck is not None and deck.fade_out_start is not None
+    deck.position = deck.fade_out_start
+    deck.next_requested = True
+    mixer.queue_next(SyntheticPCM(), "b", duration=fade_seconds * 3)
+    return mixer
+
+
+def measure(mode: str, frames: int, use_numpy: bool) -> float:
+    """
+    Lê `frames` frames da fonte
+
+    Returns:
+        Frames processados por segundo de CPU (um núcleo)
+    """
+    ramp = mode == "gain-ramp"
+    chunks: List[Tuple[Any, int]]  # Any: .volume só existe nas fontes com ganho
+    if mode == "crossfade":
+        # Um mixer novo a cada janela de crossfade (criados fora da medição)
+        window = 10 * FRAMES_PER_SECOND
+        chunks = [(create_source(mode, use_numpy), window) for _ in range(-(-frames // window))]
+    else:
+        chunks = [(create_source(mode, use_numpy), frames)]
+
+    elapsed = 0.0
+    for source, count in chunks:
+        cpu_before = time.process_time()
+        for i in range(count):
+            if ramp:
+                source.volume = 0.3 + (i % 50) / 100
+            source.read()
+        elapsed += time.process_time() - cpu_before
+        source.cleanup()
+
+    return sum(count for _, count in chunks) / max(elapsed, 1e-9)
+
+
+def main() -> int:
+    """Função principal do script"""
+    args = parse_args()
+    backends = [False, True] if GainProcessor().use_numpy else [False]
+    if len(backends) == 1:
+        print("ℹ️ numpy não instalado: medindo só o fallback sem numpy")
+
+    print(f"🔍 {args.frames} frames de 20ms por medição\n")
+    for mode in args.modes:
+        for use_numpy in backends if mode != "pcm-volume" else [False]:
+            label = mode if mode == "pcm-volume" else f"{mode} ({'numpy' if use_numpy else 'array'})"
+            fps = measure(mode, args.frames, use_numpy)
+            print(
+                f"📊 {label:<22} {fps:>10,.0f} frames/s por núcleo "
+                f"(~{fps / FRAMES_PER_SECOND:,.0f} streams em tempo real)"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
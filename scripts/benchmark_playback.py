@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CPU por stream nos modos de reprodução (PLAYBACK_MODE)
+
+Lê o áudio o mais rápido possível, como o VoiceClient faria em tempo real,
+e mede o CPU gasto (processo Python + processos ffmpeg) por segundo de áudio:
+
+- pcm:         FFmpegPCMAudio + GainTransformer + encoder Opus do discord.py
+- opus-volume: ControlledOpusAudio com volume aplicado no ffmpeg (libopus)
+- opus-copy:   ControlledOpusAudio em passthrough (só remux; exige fonte Opus)
+
+Requer ffmpeg no PATH e libopus (para o modo pcm).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import discord
+import psutil
+from discord.opus import Encoder
+
+from services.audio_sources import ControlledOpusAudio, GainTransformer
+
+FRAMES_PER_SECOND = 50  # Frames de 20ms
+MODES = ("pcm", "opus-volume", "opus-copy")
+
+
+def parse_args():
+    """Parse argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(
+        description="Compara o CPU por stream dos modos de reprodução"
+    )
+    parser.add_argument(
+        "source", help="Arquivo de áudio ou URL (use um arquivo Opus/WebM para opus-copy)"
+    )
+    parser.add_argument(
+        "-s", "--streams", type=int, default=4, help="Streams simultâneas (padrão: 4)"
+    )
+    parser.add_argument(
+        "-d", "--seconds", type=int, default=60, help="Segundos de áudio por stream (padrão: 60)"
+    )
+    parser.add_argument(
+        "-m", "--modes", nargs="+", choices=MODES, default=list(MODES), help="Modos a medir"
+    )
+    return parser.parse_args()
+
+
+def create_source(mode: str, source: str) -> discord.AudioSource:
+    """Cria a fonte de áudio como o MusicService faria em cada modo"""
+    if mode == "pcm":
+        return GainTransformer(
+            discord.FFmpegPCMAudio(source, options="-vn"), volume=0.5
+        )
+    return ControlledOpusAudio(
+        source,
+        volume=0.5 if mode == "opus-volume" else 1.0,
+        passthrough=mode == "opus-copy",
+        options="-vn",
+    )
+
+
+def children_cpu() -> float:
+    """CPU (usuário + sistema) dos processos ffmpeg ainda em execução"""
+    total = 0.0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            times = child.cpu_times()
+            total += times.user + times.system
+        except psutil.NoSuchProcess:
+            pass
+    return total
+
+
+def measure(mode: str, source: str, streams: int, seconds: int) -> dict:
+    """
+    Lê `seconds` de áudio de cada stream (round-robin, sem esperar o tempo real)
+
+    Returns:
+        Dicionário com CPU do Python, CPU do ffmpeg, tempo de parede e frames lidos
+    """
+    encoder = Encoder() if mode == "pcm" else None
+    cpu_before = time.process_time()
+    wall_before = time.perf_counter()
+
+    sources = [create_source(mode, source) for _ in range(streams)]
+    frames = 0
+    try:
+        for _ in range(seconds * FRAMES_PER_SECOND):
+            for audio in sources:
+                data = audio.read()
+                if not data:
+                    continue
+                if encoder is not None:
+                    # O VoiceClient codifica cada frame PCM em Opus antes de enviar
+                    encoder.encode(data, Encoder.SAMPLES_PER_FRAME)
+                frames += 1
+        # Medir antes do cleanup (processos encerrados somem da lista)
+        ffmpeg_cpu = children_cpu()
+    finally:
+        for audio in sources:
+            audio.cleanup()
+
+    return {
+        "python_cpu": time.process_time() - cpu_before,
+        "ffmpeg_cpu": ffmpeg_cpu,
+        "wall": time.perf_counter() - wall_before,
+        "frames": frames,
+    }
+
+
+def report(mode: str, result: dict, streams: int):
+    """Exibe o custo por stream de um modo"""
+    audio_seconds = result["frames"] / FRAMES_PER_SECOND
+    if not audio_seconds:
+        print(f"\n❌ {mode}: nenhum frame lido (fonte inválida?)")
+        return None
+
+    total_cpu = result["python_cpu"] + result["ffmpeg_cpu"]
+    # % de um núcleo para manter UMA stream em tempo real
+    core_percent = total_cpu / audio_seconds * 100
+
+    print(f"\n📊 {mode} ({streams} streams, {audio_seconds:.0f}s de áudio no total)")
+    print(f"   - CPU Python: {result['python_cpu']:.2f}s | CPU ffmpeg: {result['ffmpeg_cpu']:.2f}s")
+    print(f"   - CPU por stream em tempo real: {core_percent:.2f}% de um núcleo")
+    print(f"   - Streams por núcleo (estimado): {100 / max(core_percent, 1e-6):.0f}")
+    return core_percent
+
+
+def main() -> int:
+    """Função principal do script"""
+    args = parse_args()
+
+    if "pcm" in args.modes and not discord.opus.is_loaded():
+        if not discord.opus._load_default():
+            print("❌ libopus não encontrada (necessária para o modo pcm)")
+            return 1
+
+    print(f"🔍 Medindo {', '.join(args.modes)} com {args.streams} stream(s) de {args.seconds}s")
+
+    results = {}
+    for mode in args.modes:
+        try:
+            result = measure(mode, args.source, args.streams, args.seconds)
+        except discord.ClientException as e:
+            print(f"\n❌ {mode}: {e}")
+            continue
+        results[mode] = report(mode, result, args.streams)
+
+    baseline = results.get("pcm")
+    if baseline:
+        for mode in ("opus-volume", "opus-copy"):
+            if results.get(mode):
+                print(f"\n✅ {mode}: {baseline / results[mode]:.1f}x menos CPU que pcm")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
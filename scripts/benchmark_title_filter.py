@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark: filtro de títulos do autoplay (title_filter vs. listas por chamada)
+
+Compara, sobre um corpus de títulos:
+
+- legacy:  como o get_related_videos fazia (listas recriadas a cada chamada,
+           list comprehensions por regra e re.search sem compilar)
+- compiled: services.title_filter (uma regex por regra, compiladas no import)
+
+Também confere se as duas versões aceitam/rejeitam exatamente os mesmos
+títulos. Use um corpus real com --corpus (um título por linha, ou
+"título<TAB>canal"); sem ele, usa uma amostra embutida replicada.
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from services.title_filter import (
+    ALTERNATIVE_VERSION_KEYWORDS,
+    EXCLUDED_KEYWORDS,
+    EXPLANATORY_PATTERNS,
+    SUSPICIOUS_CHANNEL_KEYWORDS,
+    title_filter,
+)
+
+SAMPLE = [
+    ("Marília Mendonça - Todo Mundo Vai Sofrer (Official Video)", "Marília Mendonça"),
+    ("Jorge & Mateus - Propaganda (Ao Vivo)", "Jorge & Mateus"),
+    ("Henrique e Juliano - Liberdade Provisória [Clipe Oficial]", "Henrique e Juliano"),
+    ("Anitta - Envolver (Official Music Video)", "Anitta"),
+    ("Queen – Bohemian Rhapsody (Official Video Remastered)", "Queen Official"),
+    ("REAGINDO a Bohemian Rhapsody pela primeira vez", "Canal do React"),
+    ("Como tocar Wonderwall no violão - aula completa", "Aprenda Violão"),
+    ("De onde vem o funk carioca?", "História da Música"),
+    ("Top 50 músicas sertanejas 2024 - playlist 3 horas", "Mix Sertanejo"),
+    ("Coldplay - Yellow (Official Video)", "Coldplay"),
+    ("The Weeknd - Blinding Lights (slowed + reverb)", "Slowed Nation"),
+    ("Legião Urbana - Tempo Perdido", "Legião Urbana"),
+    ("Podcast com Zeca Pagodinho - bastidores", "Flow Podcast"),
+    ("Tim Maia - Primavera (Vai Chuva) [Áudio Oficial]", "Tim Maia"),
+    ("Linkin Park - Numb (Official Music Video) [4K UPGRADE]", "Linkin Park"),
+    ("Why does this song sound so sad? Music theory explained", "Music Explains"),
+    ("Djavan - Oceano (Lyric Video)", "Djavan"),
+    ("Gusttavo Lima - Bloqueado (DVD O Embaixador)", "Gusttavo Lima"),
+    ("Billie Eilish - bad guy (Karaoke Version)", "Sing King"),
+    ("Luan Santana - Acordando o Prédio", "Luan Santana"),
+]
+
+
+def parse_args():
+    """Parse argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(
+        description="Compara o filtro de títulos compilado com a versão por chamada"
+    )
+    parser.add_argument(
+        "--corpus", type=Path, help="Arquivo com um título por linha (opcional: título<TAB>canal)"
+    )
+    parser.add_argument(
+        "-n", "--titles", type=int, default=50000, help="Títulos da amostra embutida (padrão: 50000)"
+    )
+    parser.add_argument(
+        "-b", "--batch", type=int, default=15, help="Títulos por chamada simulada (padrão: 15)"
+    )
+    return parser.parse_args()
+
+
+def load_corpus(args) -> list:
+    """Carrega o corpus de (título, canal)"""
+    if args.corpus:
+        corpus = []
+        for line in args.corpus.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                title, _, channel = line.partition("\t")
+                corpus.append((title.strip(), channel.strip()))
+        return corpus
+
+    # Variar a amostra para não medir só títulos repetidos idênticos
+    rng = random.Random(42)
+    return [
+        (f"{title} #{rng.randrange(10000)}", channel)
+        for title, channel in (rng.choice(SAMPLE) for _ in range(args.titles))
+    ]
+
+
+def legacy_filter(batch: list) -> list:
+    """Filtros como eram feitos no get_related_videos (listas por chamada)"""
+    excluded_keywords = list(EXCLUDED_KEYWORDS)
+    alternative_version_keywords = list(ALTERNATIVE_VERSION_KEYWORDS)
+    explanatory_patterns = list(EXPLANATORY_PATTERNS)
+    suspicious_channel_keywords = list(SUSPICIOUS_CHANNEL_KEYWORDS)
+
+    passed = []
+    for title, channel in batch:
+        title_lower = title.lower()
+        channel_lower = channel.lower()
+        if any(re.search(pattern, title_lower) for pattern in explanatory_patterns):
+            continue
+        if [kw for kw in suspicious_channel_keywords if kw in channel_lower]:
+            continue
+        if [kw for kw in excluded_keywords if kw in title_lower]:
+            continue
+        if [kw for kw in alternative_version_keywords if kw in title_lower]:
+            continue
+        passed.append(title)
+    return passed
+
+
+def compiled_filter(batch: list) -> list:
+    """Filtros pelo title_filter compilado"""
+    return [title for title, channel in batch if title_filter.check(title, channel) is None]
+
+
+def measure(func, batches: list) -> tuple:
+    """Executa o filtro em todos os lotes; retorna (segundos, aprovados)"""
+    start = time.perf_counter()
+    approved = [func(batch) for batch in batches]
+    return time.perf_counter() - start, approved
+
+
+def main() -> int:
+    """Função principal do script"""
+    args = parse_args()
+    corpus = load_corpus(args)
+    if not corpus:
+        print("❌ Corpus vazio")
+        return 1
+
+    batches = [corpus[i : i + args.batch] for i in range(0, len(corpus), args.batch)]
+    print(f"🔍 {len(corpus):,} títulos em {len(batches):,} chamadas de {args.batch}")
+
+    legacy_time, legacy_approved = measure(legacy_filter, batches)
+    compiled_time, compiled_approved = measure(compiled_filter, batches)
+
+    if legacy_approved != compiled_approved:
+        diff = sum(
+            len(set(a) ^ set(b)) for a, b in zip(legacy_approved, compiled_approved)
+        )
+        print(f"❌ Resultados divergem em {diff} título(s)")
+        return 1
+
+    approved = sum(len(batch) for batch in compiled_approved)
+    print(f"✅ Mesmo resultado: {approved:,} aprovados / {len(corpus) - approved:,} rejeitados")
+    for name, elapsed in (("legacy", legacy_time), ("compiled", compiled_time)):
+        print(
+            f"   - {name:8s}: {elapsed:.3f}s "
+            f"({len(corpus) / elapsed:,.0f} títulos/s, {elapsed / len(corpus) * 1e6:.2f} µs/título)"
+        )
+    print(f"\n🚀 {legacy_time / compiled_time:.1f}x mais rápido")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
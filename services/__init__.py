@@ -8,6 +8,23 @@ from .youtube_service import (
     YouTubeAPIKeyStrategy,
 )
 from .music_service import MusicService, Song, MusicPlayer
+from .metadata_resolver import MetadataResolver
+from .extraction_scheduler import (
+    ExtractionScheduler,
+    ExtractionPriority,
+    extraction_scheduler,
+)
+from .playlist_stream import PlaylistStream, AdaptiveConcurrency
+from .stream_refresher import StreamRefresher
+from .panel_scheduler import PanelScheduler
+from .message_scheduler import (
+    MessageScheduler,
+    MessagePriority,
+    ProgressReporter,
+    message_scheduler,
+)
+from .audio_sources import ControlledOpusAudio, CrossfadeMixer, GainTransformer
+from .title_filter import TitleFilter, title_filter
 from .ai_service import AIService, ai_service
 
 __all__ = [
@@ -17,6 +34,23 @@ __all__ = [
     "MusicService",
     "Song",
     "MusicPlayer",
+    "MetadataResolver",
+    "ExtractionScheduler",
+    "ExtractionPriority",
+    "extraction_scheduler",
+    "PlaylistStream",
+    "AdaptiveConcurrency",
+    "StreamRefresher",
+    "PanelScheduler",
+    "MessageScheduler",
+    "MessagePriority",
+    "ProgressReporter",
+    "message_scheduler",
+    "ControlledOpusAudio",
+    "CrossfadeMixer",
+    "GainTransformer",
+    "TitleFilter",
+    "title_filter",
     "AIService",
     "ai_service",
 ]
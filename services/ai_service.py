@@ -17,6 +17,11 @@ class AIService:
 
     _instance: Optional["AIService"] = None
 
+    # Conexões ociosas com a Groq ficam abertas por até N segundos
+    KEEPALIVE_TIMEOUT = 60
+    # Cache de DNS do host da API (s)
+    DNS_CACHE_TTL = 300
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -33,6 +38,14 @@ class AIService:
         self.api_url = "https://api.groq.com/openai/v1/chat/completions"
         self.model = "llama-3.3-70b-versatile"  # Modelo mais inteligente (melhor para análise musical)
 
+        # 🔌 Sessão HTTP persistente (criada sob demanda no event loop do bot):
+        # keep-alive reaproveita a conexão TCP+TLS com a Groq entre chamadas
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._requests = 0  # Requisições enviadas pela sessão
+        self._connections_created = 0  # Conexões novas (handshake TCP+TLS)
+        self._connections_reused = 0  # Requisições servidas por conexão do pool
+
         # Cache de respostas (24h TTL)
         self._response_cache: Dict[str, tuple[Dict[str, Any], float]] = {}
         self._cache_ttl = 86400  # 24 horas em segundos
@@ -94,78 +107,78 @@ class AIService:
         prompt = self._build_prompt(current_title, current_channel, history, strategy)
 
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                }
+            session = self._get_session()
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            }
+
+            payload = {
+                "model": self.model,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "Você é um especialista em música que analisa músicas e gera queries de busca otimizadas para YouTube. Responda SEMPRE em JSON válido.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                "temperature": 0.3
+                + (strategy * 0.2),  # Mais criativo conforme estratégia aumenta
+                "max_tokens": 300,
+                "response_format": {"type": "json_object"},
+            }
+
+            # LOG: Mostrar prompt enviado para IA (debug)
+            self.logger.debug(
+                f"📤 Prompt enviado para IA (estratégia {strategy}):\n{prompt[:500]}..."
+            )
 
-                payload = {
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "Você é um especialista em música que analisa músicas e gera queries de busca otimizadas para YouTube. Responda SEMPRE em JSON válido.",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    "temperature": 0.3
-                    + (strategy * 0.2),  # Mais criativo conforme estratégia aumenta
-                    "max_tokens": 300,
-                    "response_format": {"type": "json_object"},
-                }
+            timeout = aiohttp.ClientTimeout(total=10)
+            async with session.post(
+                self.api_url, headers=headers, json=payload, timeout=timeout
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    self.logger.error(
+                        f"❌ Erro na API Groq ({response.status}): {error_text[:200]}"
+                    )
+                    return self._fallback_query_generation(
+                        current_title, current_channel, strategy
+                    )
 
-                # LOG: Mostrar prompt enviado para IA (debug)
-                self.logger.debug(
-                    f"📤 Prompt enviado para IA (estratégia {strategy}):\n{prompt[:500]}..."
+                # ✅ Rastrear uso da API Groq
+                quota_tracker.track_operation(
+                    "groq_autoplay", f"estratégia {strategy} | {current_title[:40]}"
                 )
 
-                timeout = aiohttp.ClientTimeout(total=10)
-                async with session.post(
-                    self.api_url, headers=headers, json=payload, timeout=timeout
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        self.logger.error(
-                            f"❌ Erro na API Groq ({response.status}): {error_text[:200]}"
-                        )
-                        return self._fallback_query_generation(
-                            current_title, current_channel, strategy
-                        )
-
-                    # ✅ Rastrear uso da API Groq
-                    quota_tracker.track_operation(
-                        "groq_autoplay", f"estratégia {strategy} | {current_title[:40]}"
-                    )
+                result = await response.json()
+                content = result["choices"][0]["message"]["content"]
 
-                    result = await response.json()
-                    content = result["choices"][0]["message"]["content"]
+                # Parse da resposta JSON
+                analysis = json.loads(content)
 
-                    # Parse da resposta JSON
-                    analysis = json.loads(content)
-
-                    # LOG: Mostrar resposta completa da IA (debug)
-                    self.logger.debug(
-                        f"🤖 Resposta completa da IA: {json.dumps(analysis, ensure_ascii=False)}"
-                    )
+                # LOG: Mostrar resposta completa da IA (debug)
+                self.logger.debug(
+                    f"🤖 Resposta completa da IA: {json.dumps(analysis, ensure_ascii=False)}"
+                )
 
-                    self.logger.info(
-                        f"🤖 IA gerou query: '{analysis.get('query', 'N/A')}'"
-                    )
-                    self.logger.debug(
-                        f"   Tipo: {analysis.get('tipo', 'N/A')} | Gênero: {analysis.get('genero', 'N/A')}"
-                    )
-                    self.logger.debug(
-                        f"   Internacional: {analysis.get('internacional', False)} | {analysis.get('explicacao', '')}"
-                    )
+                self.logger.info(
+                    f"🤖 IA gerou query: '{analysis.get('query', 'N/A')}'"
+                )
+                self.logger.debug(
+                    f"   Tipo: {analysis.get('tipo', 'N/A')} | Gênero: {analysis.get('genero', 'N/A')}"
+                )
+                self.logger.debug(
+                    f"   Internacional: {analysis.get('internacional', False)} | {analysis.get('explicacao', '')}"
+                )
 
-                    # Salvar no cache
-                    import time
+                # Salvar no cache
+                import time
 
-                    self._response_cache[cache_key] = (analysis, time.time())
-                    self.logger.debug(f"💾 Resposta salva no cache (TTL: 24h)")
+                self._response_cache[cache_key] = (analysis, time.time())
+                self.logger.debug(f"💾 Resposta salva no cache (TTL: 24h)")
 
-                    return analysis
+                return analysis
 
         except asyncio.TimeoutError:
             self.logger.warning("⏱️ Timeout na API Groq - usando fallback")
@@ -542,108 +555,108 @@ EXEMPLOS DE APROVAÇÃO:
 ❌ "A história do Juvenile e seu maior hit" → REJEITAR (documentário, não é música)
 ❌ "Reagindo a Back That Thang Up" → REJEITAR (reação, não é música)"""
 
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                }
-
-                payload = {
-                    "model": self.model,
-                    "messages": [
+            session = self._get_session()
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            }
+
+            payload = {
+                "model": self.model,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "Você é um validador de conteúdo musical. Responda SEMPRE em JSON válido.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                "temperature": 0.2,  # Baixa temperatura para ser consistente
+                "max_tokens": 500,
+                "response_format": {"type": "json_object"},
+            }
+
+            timeout = aiohttp.ClientTimeout(total=15)
+            async with session.post(
+                self.api_url, headers=headers, json=payload, timeout=timeout
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    self.logger.error(
+                        f"❌ Erro na validação IA ({response.status}): {error_text[:200]}"
+                    )
+                    # Em caso de erro, aprovar todos (dar benefício da dúvida)
+                    return [
                         {
-                            "role": "system",
-                            "content": "Você é um validador de conteúdo musical. Responda SEMPRE em JSON válido.",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    "temperature": 0.2,  # Baixa temperatura para ser consistente
-                    "max_tokens": 500,
-                    "response_format": {"type": "json_object"},
-                }
+                            **video,
+                            "approved": True,
+                            "reason": "Erro na IA (aprovado por padrão)",
+                        }
+                        for video in videos
+                    ]
+
+                # Rastrear uso da API
+                quota_tracker.track_operation(
+                    "groq_validation", f"validando {len(videos)} vídeos"
+                )
 
-                timeout = aiohttp.ClientTimeout(total=15)
-                async with session.post(
-                    self.api_url, headers=headers, json=payload, timeout=timeout
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        self.logger.error(
-                            f"❌ Erro na validação IA ({response.status}): {error_text[:200]}"
-                        )
-                        # Em caso de erro, aprovar todos (dar benefício da dúvida)
-                        return [
-                            {
-                                **video,
-                                "approved": True,
-                                "reason": "Erro na IA (aprovado por padrão)",
-                            }
-                            for video in videos
-                        ]
+                result = await response.json()
+                content = result["choices"][0]["message"]["content"]
+                validation_data = json.loads(content)
+
+                # Processar resultados
+                validated_videos = []
+                validations = validation_data.get("validations", [])
+                approved_count = 0
+                rejected_count = 0
 
-                    # Rastrear uso da API
-                    quota_tracker.track_operation(
-                        "groq_validation", f"validando {len(videos)} vídeos"
+                for i, video in enumerate(videos):
+                    validation = next(
+                        (v for v in validations if v.get("index") == i + 1), None
                     )
 
-                    result = await response.json()
-                    content = result["choices"][0]["message"]["content"]
-                    validation_data = json.loads(content)
+                    if validation:
+                        approved = validation.get("approved", False)
+                        reason = validation.get("reason", "Validado pela IA")
+                        confidence = 0.95 if approved else 0.85  # Mock confidence
 
-                    # Processar resultados
-                    validated_videos = []
-                    validations = validation_data.get("validations", [])
-                    approved_count = 0
-                    rejected_count = 0
+                        validated_videos.append(
+                            {**video, "approved": approved, "reason": reason}
+                        )
 
-                    for i, video in enumerate(videos):
-                        validation = next(
-                            (v for v in validations if v.get("index") == i + 1), None
+                        status = "✅" if approved else "❌"
+                        self.logger.info(
+                            f"{status} IA validação [{i+1}]: \"{video['title'][:50]}...\" - {reason}"
                         )
 
-                        if validation:
-                            approved = validation.get("approved", False)
-                            reason = validation.get("reason", "Validado pela IA")
-                            confidence = 0.95 if approved else 0.85  # Mock confidence
-
-                            validated_videos.append(
-                                {**video, "approved": approved, "reason": reason}
-                            )
-
-                            status = "✅" if approved else "❌"
-                            self.logger.info(
-                                f"{status} IA validação [{i+1}]: \"{video['title'][:50]}...\" - {reason}"
-                            )
-
-                            # 📊 LOG AUTOPLAY: Resultado da validação IA por vídeo
-                            autoplay_logger.log_ai_validation_result(
-                                video_title=video["title"],
-                                approved=approved,
-                                reason=reason,
-                                confidence=confidence,
-                            )
-
-                            if approved:
-                                approved_count += 1
-                            else:
-                                rejected_count += 1
-                        else:
-                            # Se não encontrou validação, aprovar por segurança
-                            validated_videos.append(
-                                {
-                                    **video,
-                                    "approved": True,
-                                    "reason": "Validação não encontrada (aprovado)",
-                                }
-                            )
+                        # 📊 LOG AUTOPLAY: Resultado da validação IA por vídeo
+                        autoplay_logger.log_ai_validation_result(
+                            video_title=video["title"],
+                            approved=approved,
+                            reason=reason,
+                            confidence=confidence,
+                        )
+
+                        if approved:
                             approved_count += 1
+                        else:
+                            rejected_count += 1
+                    else:
+                        # Se não encontrou validação, aprovar por segurança
+                        validated_videos.append(
+                            {
+                                **video,
+                                "approved": True,
+                                "reason": "Validação não encontrada (aprovado)",
+                            }
+                        )
+                        approved_count += 1
 
-                    # 📊 LOG AUTOPLAY: Resumo da validação IA
-                    autoplay_logger.log_ai_summary(
-                        approved=approved_count, rejected=rejected_count, quota_used=1
-                    )
+                # 📊 LOG AUTOPLAY: Resumo da validação IA
+                autoplay_logger.log_ai_summary(
+                    approved=approved_count, rejected=rejected_count, quota_used=1
+                )
 
-                    return validated_videos
+                return validated_videos
 
         except asyncio.TimeoutError:
             self.logger.warning("⏱️ Timeout na validação IA - aprovando todos")
@@ -658,6 +671,97 @@ EXEMPLOS DE APROVAÇÃO:
                 for video in videos
             ]
 
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Retorna a sessão HTTP compartilhada, criando-a na primeira chamada
+
+        Recriada se foi fechada ou se o event loop mudou (sessões do aiohttp
+        ficam presas ao loop em que foram criadas).
+
+        Returns:
+            ClientSession com pool de conexões e cache de DNS
+        """
+        loop = asyncio.get_running_loop()
+        if self._session and not self._session.closed and self._session_loop is loop:
+            return self._session
+
+        self._discard_session()
+        connector = aiohttp.TCPConnector(
+            limit_per_host=config.AI_HTTP_MAX_CONNECTIONS,
+            keepalive_timeout=self.KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=self.DNS_CACHE_TTL,
+        )
+
+        # 📊 Métricas de reaproveitamento de conexões
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_connection_create_end.append(self._on_connection_created)
+        trace.on_connection_reuseconn.append(self._on_connection_reused)
+
+        self._session = aiohttp.ClientSession(connector=connector, trace_configs=[trace])
+        self._session_loop = loop
+        self.logger.debug(
+            f"🔌 Sessão HTTP da IA criada (até {config.AI_HTTP_MAX_CONNECTIONS} conexões)"
+        )
+        return self._session
+
+    def _discard_session(self):
+        """
+        Fecha a sessão de um event loop anterior (inutilizável no loop atual)
+
+        O fechamento é agendado no loop dono da sessão; se ele já foi
+        fechado, a sessão só é desligada do connector (os sockets presos ao
+        loop morto são liberados pelo GC).
+        """
+        old, old_loop = self._session, self._session_loop
+        self._session = None
+        self._session_loop = None
+        if old is None or old.closed:
+            return
+
+        if old_loop is not None and not old_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(old.close(), old_loop)
+        else:
+            old.detach()
+        self.logger.debug("🔌 Sessão HTTP da IA de outro event loop descartada")
+
+    async def _on_request_start(self, session, context, params):
+        """Trace do aiohttp: requisição enviada"""
+        self._requests += 1
+
+    async def _on_connection_created(self, session, context, params):
+        """Trace do aiohttp: conexão nova aberta"""
+        self._connections_created += 1
+
+    async def _on_connection_reused(self, session, context, params):
+        """Trace do aiohttp: conexão ociosa do pool reaproveitada"""
+        self._connections_reused += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas da sessão HTTP da IA
+
+        Returns:
+            Dicionário com requisições, conexões novas/reaproveitadas e taxa de reuso
+        """
+        connections = self._connections_created + self._connections_reused
+        return {
+            "requests": self._requests,
+            "connections_created": self._connections_created,
+            "connections_reused": self._connections_reused,
+            "reuse_rate": (
+                self._connections_reused / connections * 100 if connections else 0.0
+            ),
+            "open": bool(self._session and not self._session.closed),
+        }
+
+    async def close(self):
+        """Fecha a sessão HTTP compartilhada (chamar no shutdown do bot)"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
     @classmethod
     def get_instance(cls) -> "AIService":
         """Retorna instância singleton"""
@@ -0,0 +1,558 @@
+"""
+Audio Sources - Fontes de áudio usadas pelo player
+- Modo "opus": o ffmpeg entrega pacotes Opus prontos ao discord.py, sem o
+  ciclo PCM -> volume em Python -> Opus de cada frame de 20ms
+- Modo "pcm": GainTransformer aplica o volume com rampas por amostra e o
+  CrossfadeMixer sobrepõe o fim de uma música ao início da próxima
+"""
+
+import math
+import subprocess
+import threading
+from array import array
+from typing import IO, Any, Callable, List, Optional, Tuple
+
+import discord
+
+from core.logger import LoggerFactory
+
+try:
+    import numpy as np
+except ImportError:  # Opcional: sem numpy, rampas usam array + audioop
+    np = None
+
+try:
+    import audioop
+except ImportError:  # Removido no Python 3.13: cai no caminho com array puro
+    audioop = None  # type: ignore[assignment]
+
+logger = LoggerFactory.create_logger(__name__)
+
+
+class ControlledOpusAudio(discord.FFmpegOpusAudio):
+    """
+    Fonte Opus do ffmpeg com volume controlado dentro do próprio ffmpeg
+
+    - passthrough=True: stream já é Opus e volume 1.0 -> `-c:a copy`
+      (só remux, sem decodificar nem recodificar)
+    - passthrough=False: filtro `volume` + libopus no ffmpeg; mudanças de
+      volume (comando .volume, fades) vão pelo stdin do ffmpeg (canal de
+      controle "c <alvo> <tempo> <comando> <argumento>")
+
+    Expõe `.volume` como o PCMVolumeTransformer, então set_volume
+    funciona sem saber qual fonte está tocando. Fade in/out (crossfade
+    sequencial) são filtros afade do próprio ffmpeg: nenhum wakeup no loop.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        *,
+        volume: float = 1.0,
+        passthrough: bool = False,
+        fade_in: float = 0,
+        fade_out_at: Optional[float] = None,
+        fade_duration: float = 0,
+        before_options: Optional[str] = None,
+        options: Optional[str] = None,
+    ):
+        """
+        Args:
+            source: URL da stream ou caminho do arquivo
+            volume: Volume inicial (0.0 a 1.0)
+            passthrough: Copiar o Opus original (só se a stream já for Opus)
+            fade_in: Duração do fade in no início (s, 0 = sem fade)
+            fade_out_at: Instante (s) em que o fade out começa (None = sem fade)
+            fade_duration: Duração do fade out (s)
+            before_options: Opções do ffmpeg antes do -i (ex: reconnect)
+            options: Opções extras de saída (ex: -vn)
+        """
+        # Definidos antes do super().__init__: _spawn_process é chamado lá dentro
+        self.passthrough = passthrough
+        self._volume = volume
+        self._control: Optional[IO[bytes]] = None
+
+        if not passthrough:
+            filters = []
+            if fade_in:
+                filters.append(f"afade=t=in:d={fade_in}")
+            if fade_out_at is not None and fade_duration:
+                filters.append(f"afade=t=out:st={fade_out_at}:d={fade_duration}")
+            filters.append(f"volume={volume:.3f}")
+            options = f"{options or ''} -af {','.join(filters)}".strip()
+
+        super().__init__(
+            source,
+            codec="copy" if passthrough else None,
+            before_options=before_options,
+            options=options,
+        )
+
+    def _spawn_process(self, args, **subprocess_kwargs) -> subprocess.Popen:
+        """Abre o stdin do ffmpeg como canal de controle (modo com filtro)"""
+        if not self.passthrough:
+            subprocess_kwargs["stdin"] = subprocess.PIPE
+
+        process = super()._spawn_process(args, **subprocess_kwargs)
+        if not self.passthrough:
+            self._control = process.stdin
+        return process
+
+    @property
+    def volume(self) -> float:
+        """Volume atual (0.0 a 1.0)"""
+        return self._volume
+
+    @volume.setter
+    def volume(self, value: float):
+        value = max(0.0, value)
+        if abs(value - self._volume) < 0.001:
+            return
+
+        if self._control is None:
+            # Passthrough: não há filtro para ajustar (vale na próxima música)
+            logger.debug("🔇 Volume não ajustável em passthrough; aplicado na próxima música")
+            self._volume = value
+            return
+
+        self._volume = value
+        try:
+            # Tecla "c" + comando para o primeiro filtro "volume" (tempo -1 = agora)
+            self._control.write(f"cvolume -1 volume {value:.3f}\n".encode())
+            self._control.flush()
+        except (BrokenPipeError, OSError, ValueError):
+            self._control = None  # ffmpeg já encerrou
+
+    def cleanup(self) -> None:
+        control, self._control = self._control, None
+        super().cleanup()
+        if control is not None and not control.closed:
+            try:
+                control.close()
+            except OSError:
+                pass
+
+
+# Frames de 20ms: 48kHz, estéreo, 16 bits
+FRAME_SIZE = discord.opus.Encoder.FRAME_SIZE
+FRAMES_PER_SECOND = 50
+
+
+def _mul_samples(data: bytes, gain: float) -> bytes:
+    """Multiplica amostras int16 pelo ganho (com saturação), como audioop.mul"""
+    if audioop is not None:
+        result: bytes = audioop.mul(data, 2, gain)
+        return result
+    samples = array("h", data)
+    for i, sample in enumerate(samples):
+        samples[i] = max(-32768, min(32767, math.floor(sample * gain)))
+    return samples.tobytes()
+
+
+def _add_samples(first: bytes, second: bytes) -> bytes:
+    """Soma amostras int16 de dois frames (com saturação), como audioop.add"""
+    if audioop is not None:
+        result: bytes = audioop.add(first, second, 2)
+        return result
+    samples = array("h", first)
+    for i, sample in enumerate(array("h", second)):
+        samples[i] = max(-32768, min(32767, samples[i] + sample))
+    return samples.tobytes()
+
+
+class GainProcessor:
+    """
+    Ganho e mixagem de frames PCM 16 bits estéreo com buffers reutilizados
+
+    O ganho vai de `start` a `end` em uma rampa linear por amostra dentro do
+    frame: mudanças de volume/curvas de fade não geram degraus audíveis
+    ("zipper noise") a cada 20ms.
+
+    - Com numpy: operações vetorizadas sobre buffers pré-alocados
+    - Sem numpy: rampa em RAMP_BLOCKS degraus de ~0,8ms (audioop por bloco)
+      escritos em um bytearray reutilizado; sem audioop (Python 3.13+), o
+      mesmo cálculo roda sobre array("h")
+    """
+
+    SAMPLES = FRAME_SIZE // 2  # Amostras int16 por frame (2 canais)
+    RAMP_BLOCKS = 24  # Degraus da rampa sem numpy (960 pares / 24 = 40 pares)
+
+    def __init__(self, use_numpy: Optional[bool] = None):
+        """
+        Args:
+            use_numpy: Forçar (True/False) o uso do numpy; None = usar se instalado
+        """
+        self.use_numpy = np is not None if use_numpy is None else use_numpy and np is not None
+
+        if self.use_numpy:
+            # Rampa 0 -> 1 por par de amostras (L/R recebem o mesmo ganho)
+            pairs = self.SAMPLES // 2
+            self._ramp = np.repeat(np.arange(1, pairs + 1, dtype=np.float32) / pairs, 2)
+            self._gains = np.empty(self.SAMPLES, dtype=np.float32)
+            self._work = np.empty(self.SAMPLES, dtype=np.float32)
+            self._mix = np.empty(self.SAMPLES, dtype=np.int32)
+            self._out = np.empty(self.SAMPLES, dtype=np.int16)
+        else:
+            self._bytes = bytearray(FRAME_SIZE)
+
+    def apply(self, data: bytes, start: float, end: Optional[float] = None) -> bytes:
+        """
+        Aplica o ganho a um frame
+
+        Args:
+            data: Frame PCM 16 bits estéreo
+            start: Ganho no início do frame
+            end: Ganho no fim do frame (None = constante)
+
+        Returns:
+            Frame com o ganho aplicado
+        """
+        if end is None or abs(end - start) < 0.0005 or len(data) != FRAME_SIZE:
+            gain = start if end is None else end
+            if abs(gain - 1.0) < 0.0005:
+                return data
+            if not self.use_numpy or len(data) != FRAME_SIZE:
+                return _mul_samples(data, gain)
+            np.multiply(np.frombuffer(data, dtype=np.int16), gain, out=self._work)
+            return self._to_bytes()
+
+        if self.use_numpy:
+            np.multiply(self._ramp, end - start, out=self._gains)
+            self._gains += start
+            np.multiply(np.frombuffer(data, dtype=np.int16), self._gains, out=self._work)
+            return self._to_bytes()
+
+        return self._apply_ramp_array(data, start, end)
+
+    def _to_bytes(self) -> bytes:
+        """Converte o buffer float de trabalho para int16 (com saturação)"""
+        np.clip(self._work, -32768, 32767, out=self._work)
+        np.copyto(self._out, self._work, casting="unsafe")
+        data: bytes = self._out.tobytes()
+        return data
+
+    def _apply_ramp_array(self, data: bytes, start: float, end: float) -> bytes:
+        """Rampa de ganho sem numpy (só roda durante fades/mudanças de volume)"""
+        block = FRAME_SIZE // self.RAMP_BLOCKS
+        step = (end - start) / self.RAMP_BLOCKS
+        for i in range(self.RAMP_BLOCKS):
+            offset = i * block
+            self._bytes[offset : offset + block] = _mul_samples(
+                data[offset : offset + block], start + step * (i + 1)
+            )
+        return bytes(self._bytes)
+
+    def mix(self, first: bytes, second: bytes) -> bytes:
+        """Soma dois frames (com saturação)"""
+        if len(first) != len(second):
+            size = max(len(first), len(second))
+            first, second = first.ljust(size, b"\0"), second.ljust(size, b"\0")
+
+        if not self.use_numpy or len(first) != FRAME_SIZE:
+            return _add_samples(first, second)
+
+        np.add(
+            np.frombuffer(first, dtype=np.int16),
+            np.frombuffer(second, dtype=np.int16),
+            out=self._mix,
+            dtype=np.int32,
+        )
+        np.clip(self._mix, -32768, 32767, out=self._mix)
+        np.copyto(self._out, self._mix, casting="unsafe")
+        data: bytes = self._out.tobytes()
+        return data
+
+
+class GainTransformer(discord.AudioSource):
+    """
+    Substituto do discord.PCMVolumeTransformer
+
+    Mudanças de volume viram uma rampa dentro do próximo frame (sem
+    degrau), com o processamento vetorizado do GainProcessor.
+    """
+
+    def __init__(
+        self,
+        original: discord.AudioSource,
+        volume: float = 1.0,
+        processor: Optional[GainProcessor] = None,
+    ):
+        """
+        Args:
+            original: Fonte PCM original
+            volume: Volume inicial (0.0 a 2.0)
+            processor: GainProcessor a usar (None = cria um)
+        """
+        if original.is_opus():
+            raise discord.ClientException("GainTransformer requer uma fonte PCM")
+
+        self.original = original
+        self._volume = max(0.0, min(2.0, volume))
+        self._applied = self._volume  # Ganho no fim do último frame
+        self._processor = processor or GainProcessor()
+
+    @property
+    def volume(self) -> float:
+        """Volume atual (0.0 a 2.0)"""
+        return self._volume
+
+    @volume.setter
+    def volume(self, value: float):
+        self._volume = max(0.0, min(2.0, value))
+
+    def read(self) -> bytes:
+        data = self.original.read()
+        if not data:
+            return data
+
+        start, self._applied = self._applied, self._volume
+        return self._processor.apply(data, start, self._volume)
+
+    def cleanup(self) -> None:
+        self.original.cleanup()
+
+
+def equal_power_curves(frames: int) -> Tuple[List[float], List[float]]:
+    """
+    Curvas de ganho (fim de cada frame) de um crossfade de potência constante
+
+    Seno/cosseno: a soma das potências fica constante durante a transição
+    (sem o "buraco" de volume de um fade linear).
+
+    Args:
+        frames: Duração do crossfade em frames de 20ms
+
+    Returns:
+        (curva de fade in, curva de fade out)
+    """
+    fade_in = [math.sin((i + 1) / frames * math.pi / 2) for i in range(frames)]
+    fade_out = [math.cos((i + 1) / frames * math.pi / 2) for i in range(frames)]
+    return fade_in, fade_out
+
+
+class _Deck:
+    """Uma música dentro do CrossfadeMixer"""
+
+    def __init__(
+        self,
+        source: discord.AudioSource,
+        tag: Any,
+        duration: float,
+        fade_frames: int,
+    ):
+        self.source = source
+        self.tag = tag
+        self.position = 0  # Frames já lidos
+
+        # Fade out nos últimos fade_frames (só se a música for longa o suficiente)
+        total_frames = int(duration * FRAMES_PER_SECOND)
+        self.fade_out_start: Optional[int] = (
+            total_frames - fade_frames if total_frames > fade_frames * 2 else None
+        )
+        self.next_requested = False
+
+    @property
+    def fading_out(self) -> bool:
+        return self.fade_out_start is not None and self.position >= self.fade_out_start
+
+    def cleanup(self):
+        try:
+            self.source.cleanup()
+        except Exception:
+            pass
+
+
+class CrossfadeMixer(discord.AudioSource):
+    """
+    Fonte PCM que encadeia músicas com crossfade real
+
+    - Fade in da primeira música e fade out da última (sem próxima na fila)
+    - Crossfade: os últimos segundos da música atual tocam junto com o
+      início da próxima, com curvas de ganho pré-calculadas (potência
+      constante) interpoladas por amostra na thread de áudio
+    - Sem tasks nem sleeps no event loop: o mixer avisa o MusicService
+      (on_need_next) com antecedência para ele preparar a próxima fonte
+
+    Callbacks são chamados na thread de áudio do discord.py (usar
+    run_coroutine_threadsafe do lado do serviço).
+    """
+
+    def __init__(
+        self,
+        source: discord.AudioSource,
+        tag: Any,
+        duration: float,
+        crossfade: float,
+        volume: float,
+        on_need_next: Callable[[Any], None],
+        on_handoff: Callable[[Any, Any], None],
+        lead_time: float = 10.0,
+    ):
+        """
+        Args:
+            source: Fonte PCM da primeira música
+            tag: Identificador da música (ex: Song), repassado aos callbacks
+            duration: Duração da música em segundos (0 = desconhecida, sem fade out)
+            crossfade: Duração do crossfade em segundos
+            volume: Volume inicial (0.0 a 1.0)
+            on_need_next: Chamado (tag atual) quando é hora de enfileirar a próxima
+            on_handoff: Chamado (tag anterior, tag nova) quando a próxima começa
+            lead_time: Antecedência (s) do on_need_next em relação ao crossfade
+        """
+        self.volume = volume
+        self._applied_volume = volume  # Volume no fim do último frame (rampa)
+        self._processor = GainProcessor()
+        self._fade_frames = max(1, int(crossfade * FRAMES_PER_SECOND))
+        self._fade_in_curve, self._fade_out_curve = equal_power_curves(self._fade_frames)
+        self._lead_frames = int(lead_time * FRAMES_PER_SECOND)
+        self._on_need_next = on_need_next
+        self._on_handoff = on_handoff
+        self._enabled = True
+
+        self._lock = threading.Lock()
+        self._current: Optional[_Deck] = _Deck(source, tag, duration, self._fade_frames)
+        self._incoming: Optional[_Deck] = None  # Já tocando junto (crossfade)
+        self._queued: Optional[_Deck] = None  # Aguardando a janela de crossfade
+
+    def is_opus(self) -> bool:
+        return False
+
+    def queue_next(self, source: discord.AudioSource, tag: Any, duration: float) -> bool:
+        """
+        Enfileira a próxima música (começa na janela de crossfade da atual)
+
+        Returns:
+            False se o mixer já terminou (chamador deve tocar a música normalmente)
+        """
+        with self._lock:
+            if self._current is None or self._queued is not None:
+                return False
+            self._queued = _Deck(source, tag, duration, self._fade_frames)
+            return True
+
+    def drop_queued(self) -> Optional[Any]:
+        """
+        Descarta a próxima música enfileirada que ainda não começou
+
+        Returns:
+            Tag da música descartada (para voltar à fila) ou None
+        """
+        with self._lock:
+            queued, self._queued = self._queued, None
+
+        if queued is None:
+            return None
+        queued.cleanup()
+        return queued.tag
+
+    def cancel_crossfade(self) -> Optional[Any]:
+        """
+        Desativa o crossfade (a música atual toca até o fim sem fade out)
+
+        Returns:
+            Tag da música enfileirada que ainda não começou (para voltar à fila)
+        """
+        with self._lock:
+            self._enabled = False
+            if self._current is not None and not self._current.fading_out:
+                self._current.fade_out_start = None
+        return self.drop_queued()
+
+    def _gain(self, deck: _Deck) -> Optional[Tuple[float, float]]:
+        """
+        Ganho no início e no fim do próximo frame do deck
+
+        Returns:
+            (início, fim) para a rampa por amostra ou None se o fade out terminou
+        """
+        start = end = 1.0
+        position = deck.position
+        if position < self._fade_frames and self._enabled:
+            start = self._fade_in_curve[position - 1] if position else 0.0
+            end = self._fade_in_curve[position]
+        fade_out_start = deck.fade_out_start
+        if fade_out_start is not None and position >= fade_out_start:  # deck.fading_out
+            index = position - fade_out_start
+            if index >= self._fade_frames:
+                return None
+            start *= self._fade_out_curve[index - 1] if index else 1.0
+            end *= self._fade_out_curve[index]
+        return start, end
+
+    def _read_deck(self, deck: _Deck) -> Optional[bytes]:
+        """Lê um frame do deck já com o ganho aplicado (None = terminou)"""
+        gain = self._gain(deck)
+        if gain is None:
+            return None
+        data = deck.source.read()
+        if not data:
+            return None
+        deck.position += 1
+        return self._processor.apply(data, *gain)
+
+    def _mix(self, events: list) -> bytes:
+        """Produz o próximo frame (com o lock); callbacks vão para `events`"""
+        while self._current is not None:
+            current = self._current
+
+            # Avisar com antecedência: hora de preparar a próxima música
+            if (
+                self._enabled
+                and not current.next_requested
+                and current.fade_out_start is not None
+                and current.position >= current.fade_out_start - self._lead_frames
+            ):
+                current.next_requested = True
+                events.append((self._on_need_next, (current.tag,)))
+
+            # Janela de crossfade: a próxima começa junto com o fade out da atual
+            if self._incoming is None and self._queued is not None and current.fading_out:
+                self._incoming, self._queued = self._queued, None
+                events.append((self._on_handoff, (current.tag, self._incoming.tag)))
+
+            frame = self._read_deck(current)
+            incoming = self._read_deck(self._incoming) if self._incoming else None
+
+            if frame is not None:
+                if incoming is None:
+                    return frame
+                return self._processor.mix(frame, incoming)
+
+            # Música atual terminou: a próxima (já tocando ou enfileirada) assume
+            current.cleanup()
+            if self._incoming is not None:
+                self._current, self._incoming = self._incoming, None
+                if incoming is not None:
+                    return incoming
+            elif self._queued is not None:
+                self._current, self._queued = self._queued, None
+                events.append((self._on_handoff, (current.tag, self._current.tag)))
+            else:
+                self._current = None
+
+        return b""
+
+    def read(self) -> bytes:
+        events: list = []
+        with self._lock:
+            frame = self._mix(events)
+
+        # Callbacks fora do lock (podem chamar queue_next)
+        for callback, args in events:
+            try:
+                callback(*args)
+            except Exception:
+                logger.exception("Erro em callback do CrossfadeMixer")
+
+        if not frame:
+            return frame
+        start, self._applied_volume = self._applied_volume, self.volume
+        return self._processor.apply(frame, start, self.volume)
+
+    def cleanup(self) -> None:
+        with self._lock:
+            decks = [self._current, self._incoming, self._queued]
+            self._current = self._incoming = self._queued = None
+        for deck in decks:
+            if deck is not None:
+                deck.cleanup()
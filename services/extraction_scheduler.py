@@ -0,0 +1,287 @@
+"""
+Extraction Scheduler - Pool dedicado e priorizado para o yt-dlp
+Evita que o backfill de uma playlist grande atrase a música que precisa
+tocar agora (ou o pré-carregamento da próxima)
+"""
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, Optional
+
+from core.logger import LoggerFactory
+from config import config
+
+logger = LoggerFactory.create_logger(__name__)
+
+
+class ExtractionPriority(IntEnum):
+    """Classes de prioridade (menor valor = executa antes)"""
+
+    PLAY_NOW = 0  # Música pedida agora (.play)
+    PRELOAD = 1  # Próxima música da fila
+    STREAM_REFRESH = 2  # Renovação de stream_url em background (StreamRefresher)
+    AUTOPLAY = 3  # Músicas relacionadas do autoplay
+    PLAYLIST = 4  # Backfill de playlists
+
+
+class ExtractionJob:
+    """Extração aguardando um worker"""
+
+    def __init__(
+        self,
+        func: Callable[[], Any],
+        future: asyncio.Future,
+        priority: ExtractionPriority,
+        guild_id: Optional[int],
+        key: Optional[str],
+    ):
+        self.func = func
+        self.future = future
+        self.priority = priority
+        self.guild_id = guild_id
+        self.key = key
+        self.enqueued_at = time.perf_counter()
+
+
+class ExtractionScheduler:
+    """
+    Singleton que executa as extrações do yt-dlp em um pool próprio
+
+    - Número de workers configurável (EXTRACTION_WORKERS)
+    - Fila por prioridade (play-now > preload > stream refresh > autoplay > playlist)
+    - Dentro de cada prioridade, round-robin entre servidores (um servidor
+      com uma playlist enorme não monopoliza os workers)
+    - Extração pendente é promovida se um pedido mais urgente coalescer nela
+    - Métricas de profundidade de fila e tempo de espera por prioridade
+    """
+
+    _instance: Optional["ExtractionScheduler"] = None
+    _initialized: bool
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.max_workers = max(1, config.EXTRACTION_WORKERS)
+
+        # Pool criado sob demanda (evita threads ociosas)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # prioridade -> (guild_id -> fila de jobs), na ordem do round-robin
+        self._pending: Dict[ExtractionPriority, "OrderedDict[Optional[int], Deque[ExtractionJob]]"] = {
+            priority: OrderedDict() for priority in ExtractionPriority
+        }
+        self._running = 0
+
+        # 📊 Métricas por prioridade
+        self._started = {priority: 0 for priority in ExtractionPriority}
+        self._completed = {priority: 0 for priority in ExtractionPriority}
+        self._promoted = 0
+        self._total_wait = {priority: 0.0 for priority in ExtractionPriority}
+        self._max_wait = {priority: 0.0 for priority in ExtractionPriority}
+        self._max_depth = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Retorna o pool de threads (cria na primeira chamada)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="ytdl"
+            )
+        return self._executor
+
+    def _enqueue(self, job: ExtractionJob):
+        """Coloca o job na fila do seu servidor dentro da sua prioridade"""
+        guilds = self._pending[job.priority]
+        guilds.setdefault(job.guild_id, deque()).append(job)
+
+    def _next_job(self) -> Optional[ExtractionJob]:
+        """Retira o próximo job (maior prioridade, round-robin entre servidores)"""
+        for priority in ExtractionPriority:
+            guilds = self._pending[priority]
+            while guilds:
+                guild_id, jobs = next(iter(guilds.items()))
+                job = jobs.popleft()
+
+                # Servidor vai para o fim da fila (ou sai, se não tem mais jobs)
+                if jobs:
+                    guilds.move_to_end(guild_id)
+                else:
+                    del guilds[guild_id]
+
+                # Chamador desistiu (timeout/cancelamento) antes de começar
+                if job.future.done():
+                    continue
+                return job
+        return None
+
+    def _dispatch(self):
+        """Inicia jobs enquanto houver workers livres"""
+        while self._running < self.max_workers:
+            job = self._next_job()
+            if job is None:
+                return
+
+            wait = time.perf_counter() - job.enqueued_at
+            self._started[job.priority] += 1
+            self._total_wait[job.priority] += wait
+            self._max_wait[job.priority] = max(self._max_wait[job.priority], wait)
+
+            self._running += 1
+            loop = asyncio.get_running_loop()
+            task = loop.run_in_executor(self._get_executor(), job.func)
+            task.add_done_callback(functools.partial(self._on_job_done, job))
+
+    def _on_job_done(self, job: ExtractionJob, task: asyncio.Future):
+        """Repassa o resultado ao chamador e libera o worker"""
+        self._running -= 1
+        self._completed[job.priority] += 1
+
+        if not job.future.done():
+            error = None if task.cancelled() else task.exception()
+            if task.cancelled():
+                job.future.cancel()
+            elif error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(task.result())
+        elif not task.cancelled():
+            task.exception()  # Consumir exceção de chamador que desistiu
+
+        self._dispatch()
+
+    async def run(
+        self,
+        func: Callable[[], Any],
+        priority: ExtractionPriority = ExtractionPriority.PLAY_NOW,
+        guild_id: Optional[int] = None,
+        key: Optional[str] = None,
+    ) -> Any:
+        """
+        Executa uma extração bloqueante no pool dedicado
+
+        Args:
+            func: Função síncrona sem argumentos (ex: ytdl.extract_info)
+            priority: Classe de prioridade
+            guild_id: Servidor que pediu (para o round-robin)
+            key: Identificador (ex: ID do vídeo) para promoção de prioridade
+
+        Returns:
+            Resultado da função
+        """
+        loop = asyncio.get_running_loop()
+        job = ExtractionJob(
+            func=func,
+            future=loop.create_future(),
+            priority=ExtractionPriority(priority),
+            guild_id=guild_id,
+            key=key,
+        )
+
+        self._enqueue(job)
+        self._max_depth = max(self._max_depth, self.queue_depth())
+        self._dispatch()
+
+        return await job.future
+
+    def promote(self, key: str, priority: ExtractionPriority):
+        """
+        Sobe a prioridade de um job pendente (ex: .play de um vídeo que a
+        playlist ainda ia extrair)
+
+        Args:
+            key: Identificador passado em run()
+            priority: Nova prioridade (só aplica se for mais urgente)
+        """
+        for current in ExtractionPriority:
+            if current <= priority:
+                continue
+
+            for guild_id, jobs in list(self._pending[current].items()):
+                for job in list(jobs):
+                    if job.key != key or job.future.done():
+                        continue
+
+                    jobs.remove(job)
+                    if not jobs:
+                        del self._pending[current][guild_id]
+
+                    job.priority = ExtractionPriority(priority)
+                    self._enqueue(job)
+                    self._promoted += 1
+                    logger.debug(
+                        f"⏫ Extração promovida: {key} ({current.name} → {job.priority.name})"
+                    )
+                    return
+
+    def queue_depth(self, priority: Optional[ExtractionPriority] = None) -> int:
+        """
+        Número de jobs aguardando worker
+
+        Args:
+            priority: Filtrar por prioridade (None = todas)
+
+        Returns:
+            Quantidade de jobs pendentes
+        """
+        priorities = [priority] if priority is not None else list(ExtractionPriority)
+        return sum(
+            len(jobs) for p in priorities for jobs in self._pending[p].values()
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do scheduler
+
+        Returns:
+            Dicionário com workers, jobs em execução, profundidade da fila e
+            tempo de espera por prioridade
+        """
+        by_priority = {}
+        for priority in ExtractionPriority:
+            started = self._started[priority]
+            by_priority[priority.name] = {
+                "pending": self.queue_depth(priority),
+                "completed": self._completed[priority],
+                "avg_wait_ms": (
+                    self._total_wait[priority] / started * 1000 if started else 0.0
+                ),
+                "max_wait_ms": self._max_wait[priority] * 1000,
+            }
+
+        return {
+            "workers": self.max_workers,
+            "running": self._running,
+            "queue_depth": self.queue_depth(),
+            "max_queue_depth": self._max_depth,
+            "promoted": self._promoted,
+            "by_priority": by_priority,
+        }
+
+    def shutdown(self):
+        """Encerra o pool de threads (chamar no shutdown do bot)"""
+        for guilds in self._pending.values():
+            for jobs in guilds.values():
+                for job in jobs:
+                    if not job.future.done():
+                        job.future.cancel()
+            guilds.clear()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.debug("🧹 Pool de extração do yt-dlp encerrado")
+
+
+# Instância global (Singleton)
+extraction_scheduler = ExtractionScheduler()
@@ -0,0 +1,532 @@
+"""
+Message Scheduler - Orçamento central das chamadas REST de mensagens
+Envios, edições e reações iniciados pelo bot passam por uma fila única:
+respostas ao usuário saem antes de edições cosméticas, edições superadas da
+mesma mensagem são descartadas e cada rota respeita o limite do Discord
+(sem 429 e sem o discord.py dormindo dentro das nossas corrotinas)
+"""
+
+import asyncio
+import bisect
+import itertools
+import time
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import discord
+
+from core.logger import LoggerFactory
+from config import config
+
+logger = LoggerFactory.create_logger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket simples (relógio monotônico)
+
+    `capacity` tokens no máximo, repostos a `rate` tokens por segundo.
+    """
+
+    def __init__(self, capacity: float, rate: float):
+        """
+        Args:
+            capacity: Rajada máxima
+            rate: Tokens repostos por segundo
+        """
+        self.capacity = capacity
+        self.rate = rate
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, now: Optional[float] = None) -> float:
+        """Segundos até haver um token disponível (0 = disponível agora)"""
+        self._refill(time.monotonic() if now is None else now)
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def take(self, now: Optional[float] = None) -> bool:
+        """Consome um token se houver"""
+        if self.delay(now) > 0:
+            return False
+        self._tokens -= 1
+        return True
+
+    @property
+    def tokens(self) -> float:
+        """Tokens disponíveis agora"""
+        self._refill(time.monotonic())
+        return self._tokens
+
+    @property
+    def full(self) -> bool:
+        """True se o bucket está cheio (pode ser descartado)"""
+        return self.tokens >= self.capacity
+
+
+class MessagePriority(IntEnum):
+    """Classes de prioridade (menor valor = sai antes)"""
+
+    REPLY = 0  # Resposta a um comando do usuário
+    NOTIFICATION = 1  # Avisos (autoplay, painel novo)
+    PROGRESS = 2  # Progresso de playlist
+    PANEL = 3  # Edições e reações do painel (cosmético)
+
+
+# Rotas do Discord (por canal): tipo -> (rajada, janela em segundos)
+ROUTE_LIMITS: Dict[str, Tuple[int, float]] = {
+    "send": (5, 5.0),  # POST /channels/{id}/messages
+    "edit": (5, 5.0),  # PATCH /channels/{id}/messages/{id}
+    "reaction": (1, 0.25),  # PUT/DELETE /channels/{id}/messages/{id}/reactions
+}
+
+
+class OutboundJob:
+    """Chamada REST aguardando orçamento"""
+
+    def __init__(
+        self,
+        kind: str,
+        channel_id: int,
+        priority: MessagePriority,
+        call: Callable[..., Awaitable[Any]],
+        args: tuple,
+        kwargs: Dict[str, Any],
+        future: asyncio.Future,
+        key: Optional[int] = None,
+    ):
+        self.kind = kind
+        self.channel_id = channel_id
+        self.priority = priority
+        self.call = call
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+        self.key = key  # ID da mensagem (edições superáveis)
+        self.dead = False  # Superada por uma edição mais nova
+        self.enqueued_at = time.monotonic()
+
+    @property
+    def route(self) -> str:
+        return f"{self.kind}:{self.channel_id}"
+
+
+class MessageScheduler:
+    """
+    Singleton que envia as mensagens do bot dentro do orçamento do Discord
+
+    - Fila por prioridade (resposta > aviso > progresso > painel)
+    - Bucket por rota e canal (ROUTE_LIMITS) + bucket global
+      (MESSAGE_GLOBAL_RATE por segundo); uma rota no limite não trava as outras
+    - Edição pendente da mesma mensagem é substituída pela nova (campos
+      mesclados; quem esperava a antiga recebe False)
+    - Métricas por tipo de rota: enviadas, descartadas, espera e 429s
+    """
+
+    _instance: Optional["MessageScheduler"] = None
+    _initialized: bool
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        rate = max(1.0, config.MESSAGE_GLOBAL_RATE)
+        self._global = TokenBucket(rate, rate)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._blocked_until: Dict[str, float] = {}  # Rota -> fim do 429
+
+        self._pending: List[Tuple[int, int, OutboundJob]] = []  # (prioridade, seq, job)
+        self._edits: Dict[int, OutboundJob] = {}  # message_id -> edição pendente
+        self._seq = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight: set = set()
+
+        # 📊 Métricas por tipo de rota
+        self._stats: Dict[str, Dict[str, float]] = {
+            kind: {
+                "sent": 0,
+                "failed": 0,
+                "superseded": 0,
+                "rate_limited": 0,
+                "total_wait": 0.0,
+                "max_wait": 0.0,
+            }
+            for kind in ROUTE_LIMITS
+        }
+
+        logger.info(f"📨 Message scheduler: {rate:.0f} chamadas/s no total")
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    async def send(
+        self,
+        target: discord.abc.Messageable,
+        content: Optional[str] = None,
+        *,
+        priority: MessagePriority = MessagePriority.REPLY,
+        **kwargs,
+    ) -> discord.Message:
+        """
+        Envia uma mensagem (canal ou ctx)
+
+        Args:
+            target: Canal de texto ou Context
+            content: Texto da mensagem
+            priority: Prioridade do envio
+            **kwargs: Argumentos do send (embed, view, ...)
+
+        Returns:
+            Mensagem enviada
+        """
+        if content is not None:
+            kwargs["content"] = content
+        channel: Any = getattr(target, "channel", target)
+        message: discord.Message = await self._submit(
+            "send", channel.id, priority, target.send, (), kwargs
+        )
+        return message
+
+    async def edit(
+        self,
+        message: discord.Message,
+        *,
+        priority: MessagePriority = MessagePriority.PANEL,
+        wait: bool = True,
+        **kwargs,
+    ) -> bool:
+        """
+        Edita uma mensagem (substitui edição pendente da mesma mensagem)
+
+        Args:
+            message: Mensagem a editar
+            priority: Prioridade da edição
+            wait: False = não aguardar (progresso; erros só vão para o log)
+            **kwargs: Campos do edit (content, embed, ...)
+
+        Returns:
+            True se enviada, False se superada por uma edição mais nova
+            (com wait=False, sempre True)
+        """
+        future = self._submit(
+            "edit", message.channel.id, priority, message.edit, (), kwargs, key=message.id
+        )
+        if not wait:
+            future.add_done_callback(self._log_background_error)
+            return True
+
+        await future
+        return future.result() is not None
+
+    async def add_reaction(
+        self,
+        message: discord.Message,
+        emoji: str,
+        *,
+        priority: MessagePriority = MessagePriority.PANEL,
+    ):
+        """Adiciona uma reação a uma mensagem"""
+        await self._submit(
+            "reaction", message.channel.id, priority, message.add_reaction, (emoji,), {}
+        )
+
+    async def remove_reaction(
+        self,
+        reaction: discord.Reaction,
+        user: discord.abc.Snowflake,
+        *,
+        priority: MessagePriority = MessagePriority.PANEL,
+    ):
+        """Remove a reação de um usuário"""
+        await self._submit(
+            "reaction", reaction.message.channel.id, priority, reaction.remove, (user,), {}
+        )
+
+    # ------------------------------------------------------------------
+    # Fila
+    # ------------------------------------------------------------------
+
+    def _submit(
+        self,
+        kind: str,
+        channel_id: int,
+        priority: MessagePriority,
+        call: Callable[..., Awaitable[Any]],
+        args: tuple,
+        kwargs: Dict[str, Any],
+        key: Optional[int] = None,
+    ) -> asyncio.Future:
+        """Enfileira uma chamada e retorna o future do resultado"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        job = OutboundJob(kind, channel_id, priority, call, args, kwargs, future, key)
+
+        previous = self._edits.get(key) if key is not None else None
+        if previous is not None:
+            # Edição superada: mescla os campos, herda a vez e a maior prioridade
+            previous.dead = True
+            job.kwargs = {**previous.kwargs, **kwargs}
+            job.priority = min(previous.priority, priority)
+            job.enqueued_at = previous.enqueued_at
+            self._stats[kind]["superseded"] += 1
+            if not previous.future.done():
+                previous.future.set_result(None)
+
+        if key is not None:
+            self._edits[key] = job
+
+        bisect.insort(
+            self._pending,
+            (int(job.priority), next(self._seq), job),
+            key=lambda item: item[:2],
+        )
+        self._ensure_running().set()
+        return future
+
+    def _ensure_running(self) -> asyncio.Event:
+        """
+        Garante o loop de despacho no event loop atual
+
+        Returns:
+            Event que acorda o loop de despacho
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._wakeup is None:
+            # Primeiro uso (ou novo event loop): Event/task pertencem ao loop atual
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._task = None
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(self._wakeup))
+        return self._wakeup
+
+    def _bucket(self, job: OutboundJob) -> TokenBucket:
+        bucket = self._buckets.get(job.route)
+        if bucket is None:
+            burst, window = ROUTE_LIMITS[job.kind]
+            bucket = self._buckets[job.route] = TokenBucket(burst, burst / window)
+        return bucket
+
+    def _next_ready(self) -> Tuple[Optional[OutboundJob], Optional[float]]:
+        """
+        Próximo job (em ordem de prioridade) cuja rota tem orçamento
+
+        Returns:
+            (job, None) ou (None, segundos até o próximo job poder sair)
+        """
+        now = time.monotonic()
+        wait: Optional[float] = None
+        self._pending = [item for item in self._pending if not item[2].dead]
+
+        for index, (_, _, job) in enumerate(self._pending):
+            route_wait = max(
+                self._bucket(job).delay(now),
+                self._blocked_until.get(job.route, 0) - now,
+            )
+            if route_wait > 0:
+                wait = route_wait if wait is None else min(wait, route_wait)
+                continue
+
+            global_wait = self._global.delay(now)
+            if global_wait > 0:
+                # Sem orçamento global: o job mais urgente disponível espera na frente
+                return None, global_wait
+
+            del self._pending[index]
+            return job, None
+
+        return None, wait
+
+    async def _run(self, wakeup: asyncio.Event):
+        """Loop de despacho"""
+        while True:
+            job, wait = self._next_ready()
+            if job is None:
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = time.monotonic()
+            self._bucket(job).take(now)
+            self._global.take(now)
+            if job.key is not None and self._edits.get(job.key) is job:
+                del self._edits[job.key]
+
+            task = asyncio.create_task(self._execute(job))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+            # Descartar buckets cheios (canais sem atividade)
+            if len(self._buckets) > 256:
+                for route in [r for r, b in self._buckets.items() if b.full]:
+                    del self._buckets[route]
+
+    async def _execute(self, job: OutboundJob):
+        """Faz a chamada REST e resolve o future"""
+        stats = self._stats[job.kind]
+        waited = time.monotonic() - job.enqueued_at
+        stats["total_wait"] += waited
+        stats["max_wait"] = max(stats["max_wait"], waited)
+
+        try:
+            result = await job.call(*job.args, **job.kwargs)
+        except Exception as e:
+            stats["failed"] += 1
+            if isinstance(e, discord.HTTPException) and e.status == 429:
+                # Orçamento estimado abaixo do real: segurar a rota um pouco
+                stats["rate_limited"] += 1
+                self._blocked_until[job.route] = time.monotonic() + ROUTE_LIMITS[job.kind][1]
+            if not job.future.done():
+                job.future.set_exception(e)
+            return
+
+        stats["sent"] += 1
+        if not job.future.done():
+            # Edições retornam a mensagem; None é reservado para "superada"
+            job.future.set_result(result if result is not None else True)
+
+    @staticmethod
+    def _log_background_error(future: asyncio.Future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.debug(f"Erro em mensagem em background: {future.exception()}")
+
+    # ------------------------------------------------------------------
+    # Configuração / métricas / shutdown
+    # ------------------------------------------------------------------
+
+    def set_global_rate(self, rate: float):
+        """
+        Troca o orçamento global (o scheduler é criado no import)
+
+        Usado pelos workers do modo sharded, que dividem o limite global
+        do token entre os processos.
+
+        Args:
+            rate: Mensagens por segundo (mínimo 1)
+        """
+        rate = max(1.0, rate)
+        self._global = TokenBucket(rate, rate)
+        logger.info(f"📨 Orçamento global de mensagens: {rate:.1f}/s")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna métricas do orçamento de mensagens
+
+        Returns:
+            Dicionário com fila, orçamento global e métricas por tipo de rota
+        """
+        pending = [job for _, _, job in self._pending if not job.dead]
+        by_route = {}
+        for kind, stats in self._stats.items():
+            done = stats["sent"] + stats["failed"]
+            burst, window = ROUTE_LIMITS[kind]
+            by_route[kind] = {
+                "limit": f"{burst}/{window:g}s",
+                "pending": sum(1 for job in pending if job.kind == kind),
+                "sent": int(stats["sent"]),
+                "failed": int(stats["failed"]),
+                "superseded": int(stats["superseded"]),
+                "rate_limited": int(stats["rate_limited"]),
+                "avg_wait_ms": stats["total_wait"] / done * 1000 if done else 0.0,
+                "max_wait_ms": stats["max_wait"] * 1000,
+            }
+
+        return {
+            "pending": len(pending),
+            "in_flight": len(self._in_flight),
+            "global_rate": self._global.rate,
+            "global_tokens": self._global.tokens,
+            "routes": len(self._buckets),
+            "by_route": by_route,
+        }
+
+    def shutdown(self):
+        """Cancela o despacho e as mensagens pendentes (chamar no shutdown do bot)"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+        for _, _, job in self._pending:
+            if not job.future.done():
+                job.future.cancel()
+        self._pending.clear()
+        self._edits.clear()
+
+
+# Instância global (Singleton)
+message_scheduler = MessageScheduler()
+
+
+class ProgressReporter:
+    """
+    Progresso de uma tarefa longa em uma mensagem, limitado por tempo
+
+    Quem processa só altera o próprio estado; uma task separada chama
+    `render()` a cada `interval` segundos e edita a mensagem se o texto
+    mudou (no máximo uma edição por intervalo, nenhuma espera no loop).
+    `finish()` encerra a task; o resumo final é editado por quem chamou.
+    """
+
+    def __init__(
+        self,
+        message: discord.Message,
+        render: Callable[[], Optional[str]],
+        interval: float,
+    ):
+        """
+        Args:
+            message: Mensagem de progresso
+            render: Retorna o texto atual (None = nada para mostrar ainda)
+            interval: Intervalo mínimo entre edições (s)
+        """
+        self._message = message
+        self._render = render
+        self.interval = max(0.5, interval)
+        self._last_text: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self.edits = 0
+
+    def start(self):
+        """Inicia a task de atualização (idempotente)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                text = self._render()
+                if text is None or text == self._last_text:
+                    continue
+                self._last_text = text
+                self.edits += 1
+                await message_scheduler.edit(
+                    self._message,
+                    content=text,
+                    priority=MessagePriority.PROGRESS,
+                    wait=False,
+                )
+            except Exception as e:
+                logger.debug(f"Erro ao atualizar progresso: {e}")
+
+    def finish(self):
+        """Para as atualizações (antes da edição final com o resumo)"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
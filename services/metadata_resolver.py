@@ -0,0 +1,482 @@
+"""
+Metadata Resolver - Camada única de cache para extrações do yt-dlp
+Todos os caminhos de extração (play, playlist, pré-carregamento, autoplay,
+renovação de stream) passam por aqui
+"""
+
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from core.logger import LoggerFactory
+from services.extraction_scheduler import ExtractionPriority, extraction_scheduler
+from utils.metadata_store import MetadataStore
+
+# URLs de stream do YouTube expiram em ~6h; 5h se a URL não informar (expire=)
+STREAM_URL_TTL = 5 * 3600
+
+# Validade mínima restante para reutilizar uma stream_url do cache
+STREAM_URL_MIN_REMAINING = 10 * 60
+
+# Função que extrai o info bruto do yt-dlp para uma URL
+Extractor = Callable[[str], Awaitable[Optional[Dict[str, Any]]]]
+
+
+# URLs de manifesto trazem a expiração no caminho (/expire/<timestamp>/)
+_EXPIRE_PATH_PATTERN = re.compile(r"/expire/(\d+)")
+
+# Formatos de URL suportados (youtube.com, m., music., www., youtu.be, nocookie)
+# IDs de vídeo do YouTube: 11 caracteres [A-Za-z0-9_-]
+_VIDEO_URL_PATTERNS = [
+    re.compile(
+        r"(?:https?://)?(?:www\.|m\.|music\.)?youtube(?:-nocookie)?\.com/"
+        r"(?:watch\?(?:.*&)?v=|embed/|shorts/|live/|v/|e/)([A-Za-z0-9_-]{11})"
+    ),
+    re.compile(r"(?:https?://)?youtu\.be/([A-Za-z0-9_-]{11})"),
+]
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """
+    Extrai o ID normalizado do vídeo de uma URL do YouTube
+
+    Aceita watch (com v= em qualquer posição), youtu.be, shorts, embed, live
+    e domínios m./music., para que URLs diferentes do mesmo vídeo usem a
+    mesma chave.
+
+    Args:
+        url: URL do YouTube
+
+    Returns:
+        ID do vídeo ou None
+    """
+    if not url:
+        return None
+
+    for pattern in _VIDEO_URL_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+
+    return None
+
+
+def normalize_query(query: str) -> str:
+    """Normaliza um termo de busca (minúsculas, espaços colapsados)"""
+    return " ".join(query.lower().split())
+
+
+def cache_key(url: str) -> str:
+    """
+    Chave de coalescência de uma URL: ID do vídeo ou termo de busca normalizado
+
+    Args:
+        url: URL do vídeo ou termo de busca
+
+    Returns:
+        ID do vídeo ou "query:<termo normalizado>"
+    """
+    return extract_video_id(url) or f"query:{normalize_query(url)}"
+
+
+def stream_url_expiry(stream_url: str) -> float:
+    """
+    Timestamp de expiração de uma stream_url do googlevideo
+
+    Lê o parâmetro real `expire=` da URL (ou /expire/<ts>/ em manifestos);
+    se não houver, assume STREAM_URL_TTL a partir de agora.
+
+    Args:
+        stream_url: URL da stream
+
+    Returns:
+        Timestamp Unix da expiração (0 se não houver URL)
+    """
+    if not stream_url:
+        return 0
+
+    parsed = urlparse(stream_url)
+    expire: Optional[str] = parse_qs(parsed.query).get("expire", [None])[0]
+    if expire is None:
+        match = _EXPIRE_PATH_PATTERN.search(parsed.path)
+        expire = match.group(1) if match else None
+
+    try:
+        return float(expire) if expire is not None else time.time() + STREAM_URL_TTL
+    except ValueError:
+        return time.time() + STREAM_URL_TTL
+
+
+def build_video_record(info: Dict[str, Any], url: str) -> Dict[str, Any]:
+    """
+    Converte o info do yt-dlp em um registro compacto (formato do Song)
+
+    Args:
+        info: Dicionário retornado por extract_info do yt-dlp
+        url: URL original (fallback)
+
+    Returns:
+        Registro com url, title, duration, thumbnail, uploader, stream_url e acodec
+    """
+    # Formato selecionado pelo yt-dlp; senão, primeiro formato com áudio
+    stream_url = info.get("url")
+    acodec = info.get("acodec")
+    if not stream_url:
+        for fmt in info.get("formats", []):
+            if fmt.get("acodec") != "none":
+                stream_url = fmt.get("url")
+                acodec = fmt.get("acodec")
+                break
+
+    return {
+        "url": info.get("webpage_url") or url,
+        "title": info.get("title"),
+        "duration": info.get("duration", 0) or 0,  # Garantir que não seja None
+        "thumbnail": info.get("thumbnail") or "",
+        "uploader": info.get("uploader") or "Unknown",
+        "stream_url": stream_url or "",
+        "stream_url_expires": stream_url_expiry(stream_url or ""),
+        "acodec": acodec or "",
+    }
+
+
+def slim_info(info: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Reduz o info do yt-dlp aos campos usados por build_video_record
+
+    Chamado na thread do yt-dlp, logo após a extração: a lista completa de
+    formatos/legendas é descartada antes de voltar ao event loop.
+
+    Args:
+        info: Dicionário retornado por extract_info do yt-dlp
+
+    Returns:
+        Dicionário compacto (mesmas chaves do info original) ou None
+    """
+    if not info:
+        return info
+
+    if "entries" in info:
+        # Playlist/busca: só o primeiro vídeo é usado
+        entries = info["entries"] or []
+        first = next(iter(entries), None)
+        return {"entries": [slim_info(first)] if entries else []}
+
+    stream_url = info.get("url")
+    acodec = info.get("acodec")
+    if not stream_url:
+        for fmt in info.get("formats", []):
+            if fmt.get("acodec") != "none":
+                stream_url = fmt.get("url")
+                acodec = fmt.get("acodec")
+                break
+
+    return {
+        "id": info.get("id"),
+        "webpage_url": info.get("webpage_url"),
+        "title": info.get("title"),
+        "duration": info.get("duration"),
+        "thumbnail": info.get("thumbnail"),
+        "uploader": info.get("uploader"),
+        "url": stream_url,
+        "acodec": acodec,
+    }
+
+
+class MetadataResolver:
+    """
+    Resolve metadados de vídeos com cache em duas camadas
+
+    - LRU em memória (registros compactos) + cache persistente em disco
+    - Chave: ID normalizado do vídeo (termos de busca só coalescem)
+    - Requisições simultâneas para a mesma chave compartilham uma única extração
+    """
+
+    def __init__(self, cache_size: int, store: Optional[MetadataStore] = None):
+        self.logger = LoggerFactory.create_logger(__name__)
+        self._cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._cache_max_size = cache_size
+        self._store = store
+
+        # Extrações em andamento (video_id ou "query:<termo>" -> task)
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}  # Chamadores aguardando cada extração
+
+        # 📊 Métricas
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0  # Extrações economizadas (aguardaram uma em andamento)
+        self._stale = 0  # Misses com metadados em cache (só a stream expirou)
+        self._extractions = 0
+        self._extraction_time = 0.0
+
+        if self._store:
+            self._warm_cache()
+
+    def _warm_cache(self):
+        """Carrega no LRU os vídeos mais recentes do cache persistente"""
+        if not self._store:
+            return
+        records = self._store.load_recent(
+            self._cache_max_size, min_ttl=STREAM_URL_MIN_REMAINING
+        )
+        for video_id, record in records:
+            self._cache[video_id] = record
+
+        if records:
+            self.logger.info(
+                f"💾 Cache de vídeos aquecido com {len(records)} registro(s) do disco"
+            )
+
+    def _lookup_record(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Busca no LRU e depois no disco, com ou sem stream válida (sem contar hit/miss)"""
+        record = self._cache.get(video_id)
+        if record is not None:
+            # Move para o final (marca como recentemente usado)
+            self._cache.move_to_end(video_id)
+        elif self._store:
+            record = self._store.get(video_id, min_ttl=STREAM_URL_MIN_REMAINING)
+            if record is not None:
+                self._remember(video_id, record)
+        return record
+
+    @staticmethod
+    def _has_stream(record: Dict[str, Any], min_ttl: float) -> bool:
+        """True se a stream_url do registro ainda vale por pelo menos min_ttl"""
+        return bool(
+            record.get("stream_url")
+            and record.get("stream_url_expires", 0) - time.time() > min_ttl
+        )
+
+    def _lookup(
+        self, video_id: str, min_ttl: float = STREAM_URL_MIN_REMAINING
+    ) -> Optional[Dict[str, Any]]:
+        """Busca um registro com stream_url válida (sem contar hit/miss)"""
+        record = self._lookup_record(video_id)
+        if record and self._has_stream(record, min_ttl):
+            return record
+        return None
+
+    def _remember(self, video_id: str, record: Dict[str, Any]):
+        """Insere no LRU em memória (remove o mais antigo se cheio)"""
+        if video_id in self._cache:
+            self._cache.move_to_end(video_id)
+        elif len(self._cache) >= self._cache_max_size:
+            self._cache.popitem(last=False)
+        self._cache[video_id] = record
+
+    def put(self, video_id: Optional[str], record: Dict[str, Any]):
+        """
+        Salva um vídeo no LRU e no cache persistente
+
+        Args:
+            video_id: ID do vídeo
+            record: Registro compacto (ver build_video_record)
+        """
+        if not video_id or not record.get("title") or not record.get("stream_url"):
+            return
+
+        self._remember(video_id, record)
+        if self._store:
+            self._store.put(video_id, record)
+
+    @staticmethod
+    def _unwrap_entry(info: Dict[str, Any]) -> Dict[str, Any]:
+        """Se o resultado for playlist/busca, retorna o primeiro vídeo"""
+        if "entries" in info:
+            entries = list(info["entries"] or [])
+            if not entries:
+                raise ValueError("Playlist vazia ou sem vídeos disponíveis.")
+            info = entries[0]
+
+            # Verificar se o primeiro vídeo da playlist também não é None
+            if info is None:
+                raise ValueError("O primeiro vídeo da playlist não está disponível.")
+        return info
+
+    async def _extract(
+        self, url: str, video_id: Optional[str], extract: Extractor
+    ) -> Optional[Dict[str, Any]]:
+        """Executa a extração e salva o resultado no cache"""
+        start = time.perf_counter()
+        try:
+            info = await extract(url)
+        finally:
+            self._extractions += 1
+            self._extraction_time += time.perf_counter() - start
+
+        if not info:
+            return None
+
+        info = self._unwrap_entry(info)
+        record = build_video_record(info, url)
+        self.put(info.get("id") or video_id, record)
+        return record
+
+    async def resolve(
+        self,
+        url: str,
+        extract: Extractor,
+        priority: Optional[ExtractionPriority] = None,
+        min_ttl: float = STREAM_URL_MIN_REMAINING,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Resolve os metadados de um vídeo (cache ou extração)
+
+        Se já houver uma extração em andamento para o mesmo vídeo, aguarda
+        o resultado dela em vez de iniciar outra (promovendo sua prioridade
+        no ExtractionScheduler, se este pedido for mais urgente).
+
+        Args:
+            url: URL do vídeo (ou termo de busca)
+            extract: Corrotina que recebe a URL e retorna o info do yt-dlp
+            priority: Prioridade deste pedido no ExtractionScheduler
+            min_ttl: Validade mínima (s) da stream_url para aceitar o cache
+
+        Returns:
+            Registro compacto ou None se a extração não retornar dados
+        """
+        video_id = extract_video_id(url)
+
+        if video_id:
+            record = self._lookup_record(video_id)
+            if record and self._has_stream(record, min_ttl):
+                self._hits += 1
+                return record
+            if record:
+                # Campos estáticos não expiram: só a stream precisa ser extraída
+                self._stale += 1
+
+        # Termo de busca: sem cache, mas buscas idênticas simultâneas coalescem
+        key = cache_key(url)
+
+        task = self._in_flight.get(key)
+        if task and task.cancelled():
+            # Cancelada pelo último chamador e ainda não removida: extrair de novo
+            task = None
+        if task:
+            self._coalesced += 1
+            self.logger.debug(f"🔗 Aguardando extração em andamento: {key}")
+            if priority is not None:
+                # Pedido mais urgente herdando uma extração de baixa prioridade
+                extraction_scheduler.promote(key, priority)
+            return await self._wait_shared(key, task)
+
+        self._misses += 1
+
+        task = asyncio.create_task(self._extract(url, video_id, extract))
+        self._in_flight[key] = task
+
+        def on_done(t: asyncio.Task, key=key):
+            if self._in_flight.get(key) is t:
+                del self._in_flight[key]
+            # Consumir exceção (evita aviso se todos os chamadores desistiram)
+            if not t.cancelled():
+                t.exception()
+
+        task.add_done_callback(on_done)
+        return await self._wait_shared(key, task)
+
+    async def _wait_shared(self, key: str, task: asyncio.Task) -> Optional[Dict[str, Any]]:
+        """
+        Aguarda uma extração compartilhada
+
+        shield: timeout/cancelamento de um chamador não cancela os demais.
+        Se o último chamador desistir (ex: pré-carregamento cancelado ao
+        embaralhar a fila), a extração é cancelada e sai da fila do scheduler.
+        """
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1 and not task.done():
+                task.cancel()
+                # Sair do in_flight já: quem chegar agora inicia outra extração
+                # em vez de herdar a cancelada
+                if self._in_flight.get(key) is task:
+                    del self._in_flight[key]
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def get_cached(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca um vídeo apenas no cache (sem extrair)
+
+        Args:
+            url: URL do vídeo
+
+        Returns:
+            Registro compacto com stream válida ou None
+        """
+        video_id = extract_video_id(url)
+        return self._lookup(video_id) if video_id else None
+
+    def get_metadata(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca os campos estáticos de um vídeo no cache, mesmo com stream expirada
+
+        Args:
+            url: URL do vídeo
+
+        Returns:
+            Registro compacto (stream_url vazia se expirada) ou None
+        """
+        video_id = extract_video_id(url)
+        record = self._lookup_record(video_id) if video_id else None
+        if record is None:
+            return None
+        if self._has_stream(record, STREAM_URL_MIN_REMAINING):
+            return record
+        return {**record, "stream_url": "", "stream_url_expires": 0}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do cache
+
+        Returns:
+            Dicionário com tamanho, hits, misses, coalescidas, extrações
+            economizadas (e tempo estimado) e uso em disco
+        """
+        total_requests = self._hits + self._misses + self._coalesced
+        hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
+        avg_extraction = (
+            self._extraction_time / self._extractions if self._extractions else 0.0
+        )
+
+        disk_stats = (
+            self._store.get_stats()
+            if self._store
+            else {"entries": 0, "size_mb": 0.0, "max_size_mb": 0.0}
+        )
+
+        return {
+            "size": len(self._cache),
+            "max_size": self._cache_max_size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "coalesced": self._coalesced,
+            "stale": self._stale,
+            "in_flight": len(self._in_flight),
+            "extractions": self._extractions,
+            "avg_extraction_s": avg_extraction,
+            "extractions_saved": self._coalesced,
+            "time_saved_s": self._coalesced * avg_extraction,
+            "total_requests": total_requests,
+            "hit_rate": hit_rate,
+            "persistent": self._store is not None,
+            "disk_entries": disk_stats["entries"],
+            "disk_size_mb": disk_stats["size_mb"],
+            "disk_max_size_mb": disk_stats["max_size_mb"],
+        }
+
+    def close(self):
+        """Fecha o cache persistente (chamar no shutdown do bot)"""
+        if self._store:
+            self._store.close()
+            self._store = None
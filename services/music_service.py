@@ -4,16 +4,38 @@ Gerencia reprodução de música, fila e estado
 """
 
 import asyncio
+import copy
+import json
 import discord
 import yt_dlp
 import aiohttp
-from typing import Optional, List, Dict, Any, Callable
-from collections import deque, OrderedDict
+from typing import Optional, List, Dict, Any, Callable, Mapping, Tuple
+from collections import deque
 from datetime import datetime
+from itertools import islice
 import time
 
 from core.logger import LoggerFactory, autoplay_logger
 from config import config
+from utils.audio_cache import AudioCache
+from utils.metadata_store import MetadataStore
+from services.metadata_resolver import (
+    MetadataResolver,
+    STREAM_URL_MIN_REMAINING,
+    cache_key,
+    extract_video_id,
+    slim_info,
+    stream_url_expiry,
+)
+from services.extraction_scheduler import ExtractionPriority, extraction_scheduler
+from services.playlist_stream import AdaptiveConcurrency, PlaylistStream
+from services.stream_refresher import StreamRefresher
+from services.panel_scheduler import PanelScheduler
+from services.message_scheduler import MessagePriority, message_scheduler
+from services.audio_sources import ControlledOpusAudio, CrossfadeMixer, GainTransformer
+
+# Títulos que o YouTube usa para itens indisponíveis na extração flat
+UNAVAILABLE_FLAT_TITLES = ("[Deleted video]", "[Private video]")
 
 
 # Decorator para retry com backoff exponencial
@@ -60,19 +82,99 @@ class Song:
         self.thumbnail = data.get("thumbnail", "")
         self.uploader = data.get("uploader", "Unknown")
         self.stream_url = data.get("stream_url", "")
+        self.acodec = data.get("acodec") or ""  # Codec da stream (ex: "opus")
         self.requester = requester
         self.requested_at = datetime.now()
+        self.from_autoplay = False  # Adicionada pelo autoplay (marcada no painel)
+
+        # Expiração da stream URL (parâmetro expire= da URL do googlevideo)
+        # Registros vindos do cache persistente já trazem a expiração original
+        # Música "preguiçosa" (playlist): sem stream até ser resolvida sob demanda
+        if self.stream_url:
+            self.stream_url_expires = data.get(
+                "stream_url_expires"
+            ) or stream_url_expiry(self.stream_url)
+        else:
+            self.stream_url_expires = 0
 
-        # TTL para stream URL (URLs do YouTube expiram em ~6h, usar 5h de segurança)
-        import time
+        # 🖼️ Embed memoizado: (chave dos dados exibidos, dict do embed)
+        self._embed_cache: Optional[Tuple[tuple, Mapping[str, Any]]] = None
+
+    @classmethod
+    def from_flat_entry(
+        cls, entry: Dict[str, Any], url: str, requester: discord.Member
+    ) -> "Song":
+        """
+        Cria uma música preguiçosa a partir de um item de playlist (extract_flat)
+
+        Só tem ID/título (e duração/canal, quando a playlist informa);
+        a stream é resolvida pelo pré-carregamento ou na hora de tocar.
+
+        Args:
+            entry: Item retornado pela extração flat
+            url: URL do vídeo
+            requester: Membro que solicitou
+
+        Returns:
+            Song sem stream_url
+        """
+        thumbnails = entry.get("thumbnails") or []
+        return cls(
+            {
+                "url": url,
+                "title": entry.get("title") or "Unknown",
+                "duration": int(entry.get("duration") or 0),
+                "thumbnail": thumbnails[-1].get("url", "") if thumbnails else "",
+                "uploader": entry.get("uploader") or entry.get("channel") or "Unknown",
+                "stream_url": "",
+            },
+            requester,
+        )
+
+    @property
+    def is_resolved(self) -> bool:
+        """True se a música já tem stream_url (não é preguiçosa)"""
+        return bool(self.stream_url)
+
+    @property
+    def is_ready(self) -> bool:
+        """True se a stream está resolvida e não expira tão cedo (toca sem extração)"""
+        return (
+            self.is_resolved
+            and self.stream_url_expires - time.time() > STREAM_URL_MIN_REMAINING
+        )
 
-        self.stream_url_expires = time.time() + (5 * 3600)  # 5 horas
+    def apply_record(self, record: Dict[str, Any]):
+        """
+        Atualiza a música com um registro resolvido (stream + metadados)
+
+        Args:
+            record: Registro compacto do MetadataResolver
+        """
+        self.stream_url = record["stream_url"]
+        self.stream_url_expires = record["stream_url_expires"]
+        self.acodec = record.get("acodec") or self.acodec
+        self.duration = record.get("duration") or self.duration
+        self.thumbnail = record.get("thumbnail") or self.thumbnail
+        if self.uploader == "Unknown":
+            self.uploader = record.get("uploader") or self.uploader
 
     def __str__(self):
         return f"{self.title} - {self.uploader}"
 
     def to_embed(self) -> discord.Embed:
-        """Cria um embed com informações da música"""
+        """Cria um embed com informações da música (memoizado enquanto os dados não mudam)"""
+        key = (self.title, self.uploader, self.duration, self.thumbnail, self.url)
+        cached = self._embed_cache
+        if cached is None or cached[0] != key:
+            cached = (key, self._build_embed().to_dict())
+            self._embed_cache = cached
+
+        # Cópia: quem recebe pode alterar o embed sem afetar o cache
+        return discord.Embed.from_dict(copy.deepcopy(cached[1]))
+
+    def _build_embed(self) -> discord.Embed:
+        """Monta o embed da música"""
         embed = discord.Embed(
             title="🎵 Tocando Agora",
             description=f"**{self.title}**",
@@ -122,6 +224,7 @@ class MusicPlayer:
         self.last_video_id: Optional[str] = None
         self.last_video_title: Optional[str] = None
         self.last_video_channel: Optional[str] = None
+        self.last_video_from_autoplay = False  # Referência veio do próprio autoplay
         self.last_requester: Optional[discord.Member] = (
             None  # Último usuário que solicitou música
         )
@@ -133,20 +236,34 @@ class MusicPlayer:
         self.autoplay_failures = 0  # Contador de falhas consecutivas ao buscar autoplay
         self.current_search_strategy = 0  # Estratégia de busca atual (0-3)
 
+        # 🎯 Pool de candidatos: aprovados (filtros + IA) que sobraram de uma
+        # busca, usados nas próximas sessões sem nova busca/IA
+        self.autoplay_pool: deque[Tuple[Dict[str, Any], float]] = deque(
+            maxlen=config.AUTOPLAY_POOL_SIZE
+        )  # (vídeo, expira_em)
+        self.autoplay_pool_source: Optional[str] = None  # Referência que gerou o pool
+        self.autoplay_pool_hits = 0  # Sessões atendidas pelo pool
+        self.autoplay_searches = 0  # Sessões que precisaram de busca
+
         # Crossfade configuration
         self.crossfade_enabled = config.CROSSFADE_ENABLED
         self.crossfade_duration = config.CROSSFADE_DURATION
-        self.fade_task: Optional[asyncio.Task] = None  # Task do fade em andamento
+        self.mixer: Optional[CrossfadeMixer] = None  # Mixer tocando (modo pcm + crossfade)
 
         # 🎛️ Control Panel - Painel visual interativo
         self.control_panel_message: Optional[discord.Message] = None
-        self.panel_update_task: Optional[asyncio.Task] = None
-        self.panel_debounce_task: Optional[asyncio.Task] = None  # Task de debounce (2s)
         self.song_start_time: Optional[float] = None  # Timestamp do início da música
+        self.panel_payload: Optional[bytes] = None  # Último conteúdo enviado ao painel
+        self._panel_static: Optional[Tuple[tuple, Dict[str, Any]]] = None  # (chave, partes)
 
-        # 🚀 Pré-carregamento - Reduz latência entre músicas
-        self.preloaded_song: Optional[Song] = None  # Próxima música pré-carregada
+        # 👀 Observers - chamados (guild_id) a cada mudança de estado (ex: painel)
+        self._observers: List[Callable[[int], None]] = []
+
+        # 🚀 Pré-carregamento - Mantém as próximas PRELOAD_LOOKAHEAD músicas prontas
         self.preload_task: Optional[asyncio.Task] = None  # Task de pré-carregamento
+        self.queue_version = 0  # Incrementado quando a fila é reordenada/limpa
+        self.preload_hits = 0  # Músicas que começaram com stream já pronta
+        self.preload_misses = 0  # Músicas que precisaram de extração na hora
 
         self.logger = LoggerFactory.create_logger(__name__)
 
@@ -156,8 +273,87 @@ class MusicPlayer:
             raise ValueError(f"Fila cheia! Máximo: {config.MAX_QUEUE_SIZE}")
 
         self.queue.append(song)
+        self.notify_state_changed()
         self.logger.info(f"Música adicionada à fila: {song.title}")
 
+    def store_autoplay_candidates(
+        self, videos: List[Dict[str, Any]], source_id: Optional[str]
+    ) -> None:
+        """
+        Guarda candidatos aprovados do autoplay para as próximas sessões
+
+        Args:
+            videos: Vídeos aprovados que não entraram na fila
+            source_id: ID do vídeo de referência da busca
+        """
+        if not videos or not self.autoplay_pool.maxlen:
+            return
+
+        expires_at = time.time() + config.AUTOPLAY_POOL_TTL
+        self.autoplay_pool.extend((video, expires_at) for video in videos)
+        self.autoplay_pool_source = source_id
+
+    def take_autoplay_candidates(
+        self,
+        count: int,
+        reference_id: Optional[str] = None,
+        reference_from_autoplay: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Retira até `count` candidatos válidos do pool (mais antigos primeiro)
+
+        Descarta os expirados e os que já tocaram ou estão na fila. Se a
+        referência da sessão é uma música pedida por usuário diferente da
+        que gerou o pool, o pool é descartado (pode ser de outro gênero).
+
+        Args:
+            count: Quantidade desejada
+            reference_id: ID do vídeo de referência da sessão (None = não verificar)
+            reference_from_autoplay: Se a referência foi adicionada pelo autoplay
+
+        Returns:
+            Vídeos do pool (lista vazia = precisa buscar)
+        """
+        if (
+            reference_id is not None
+            and not reference_from_autoplay
+            and reference_id != self.autoplay_pool_source
+        ):
+            self.clear_autoplay_pool()
+            return []
+
+        now = time.time()
+        played = set(self.autoplay_history)
+        queued = {song.url for song in self.queue}
+
+        taken: List[Dict[str, Any]] = []
+        while self.autoplay_pool and len(taken) < count:
+            video, expires_at = self.autoplay_pool.popleft()
+            if (
+                expires_at > now
+                and video["id"] not in played
+                and video["url"] not in queued
+            ):
+                taken.append(video)
+        return taken
+
+    def clear_autoplay_pool(self) -> None:
+        """Descarta os candidatos do autoplay (referência mudou)"""
+        self.autoplay_pool.clear()
+        self.autoplay_pool_source = None
+
+    def subscribe(self, observer: Callable[[int], None]) -> None:
+        """Registra um observer de mudanças de estado (recebe o guild_id)"""
+        self._observers.append(observer)
+
+    def notify_state_changed(self) -> None:
+        """Notifica os observers (música, pausa, volume, fila, configurações)"""
+        for observer in self._observers:
+            try:
+                observer(self.guild_id)
+            except Exception as e:
+                self.logger.debug(f"Erro em observer do player: {e}")
+
     def get_queue(self) -> List[Song]:
         """Retorna a fila atual"""
         return list(self.queue)
@@ -169,15 +365,12 @@ class MusicPlayer:
         self.is_fetching_autoplay = False  # Cancelar busca de autoplay em andamento
         self.stopped_manually = True  # Marcar que foi parado manualmente
 
-        # �️ Cancelar fade task se existir
-        if self.fade_task and not self.fade_task.done():
-            self.fade_task.cancel()
-            self.fade_task = None
+        # 🎚️ Descartar a próxima música já entregue ao mixer (ainda não começou)
+        if self.mixer:
+            self.mixer.drop_queued()
 
-        # �🚀 Cancelar pré-carregamento se existir
-        if self.preload_task and not self.preload_task.done():
-            self.preload_task.cancel()
-        self.preloaded_song = None
+        # 🚀 Cancelar pré-carregamento se existir
+        self._queue_reordered()
 
         self.logger.info("Fila limpa e processamento cancelado")
 
@@ -188,15 +381,67 @@ class MusicPlayer:
         queue_list = list(self.queue)
         random.shuffle(queue_list)
         self.queue = deque(queue_list)
+        self._queue_reordered()
         self.logger.info("Fila embaralhada")
 
+    def remove_song(self, index: int) -> Song:
+        """
+        Remove uma música da fila
+
+        Args:
+            index: Posição na fila (começando em 0)
+
+        Returns:
+            Música removida
+        """
+        song = self.queue[index]
+        del self.queue[index]
+        self._queue_reordered()
+        self.logger.info(f"Música removida da fila: {song.title}")
+        return song
+
+    def _queue_reordered(self) -> None:
+        """Invalida o pré-carregamento em andamento (janela de músicas mudou)"""
+        self.notify_state_changed()
+        self.queue_version += 1
+        if self.preload_task and not self.preload_task.done():
+            self.preload_task.cancel()
+        self.preload_task = None
+
+    def next_from_queue(self) -> Song:
+        """
+        Retira a próxima música da fila, contabilizando o pré-carregamento
+
+        Returns:
+            Próxima música
+        """
+        song = self.queue.popleft()
+        if song.is_ready:
+            self.preload_hits += 1
+        else:
+            self.preload_misses += 1
+        return song
+
+    def get_preload_stats(self) -> Dict[str, Any]:
+        """
+        Retorna o hit rate do pré-carregamento deste servidor
+
+        Returns:
+            Dicionário com hits, misses, hit_rate (%) e músicas prontas na janela
+        """
+        total = self.preload_hits + self.preload_misses
+        window = list(self.queue)[: config.PRELOAD_LOOKAHEAD]
+        return {
+            "lookahead": config.PRELOAD_LOOKAHEAD,
+            "ready": sum(1 for song in window if song.is_ready),
+            "window": len(window),
+            "hits": self.preload_hits,
+            "misses": self.preload_misses,
+            "hit_rate": (self.preload_hits / total * 100) if total else 0.0,
+        }
+
     def skip(self) -> Optional[Song]:
         """Pula a música atual"""
-        # 🛡️ Cancelar fade task se estiver rodando
-        if self.fade_task and not self.fade_task.done():
-            self.fade_task.cancel()
-            self.fade_task = None
-
         if self.voice_client and self.voice_client.is_playing():
             self.voice_client.stop()
         return self.current_song
@@ -209,123 +454,39 @@ class MusicPlayer:
         if self.voice_client.is_paused():
             self.voice_client.resume()
             self.is_paused = False
+            self.notify_state_changed()
             self.logger.info("Reprodução retomada")
             return False
         elif self.voice_client.is_playing():
             self.voice_client.pause()
             self.is_paused = True
+            self.notify_state_changed()
             self.logger.info("Reprodução pausada")
             return True
 
         return False
 
-    async def fade_out(self, duration: float):
+    def set_crossfade(self, enabled: bool) -> None:
         """
-        Reduz o volume gradualmente (fade out) com transição suave
-
-        Args:
-            duration: Duração do fade em segundos
+        Ativa/desativa o crossfade
 
-        Melhorias (Otimização #17):
-            - 50 steps para transição imperceptível (antes: 20)
-            - Cancelamento suave sem "click"
-            - Curva de volume não-linear para naturalidade
+        Desativando no meio de uma música, a atual toca até o fim sem fade
+        out e a próxima já entregue ao mixer volta para o início da fila.
         """
-        if not self.voice_client or not self.voice_client.source:
+        self.crossfade_enabled = enabled
+        if enabled or not self.mixer:
             return
 
-        original_volume = self.volume
-        steps = config.CROSSFADE_STEPS  # 🆕 Configurável via .env (default: 50)
-        step_duration = duration / steps
-
-        try:
-            for i in range(steps):
-                # Verificar se ainda está tocando
-                if not self.voice_client or not self.voice_client.is_playing():
-                    # Cancelado - fade out suave para evitar click
-                    if self.voice_client and self.voice_client.source:
-                        # Volume atual → 0 em 50ms (suave, não abrupto)
-                        current_volume = self.voice_client.source.volume
-                        for j in range(5):
-                            self.voice_client.source.volume = current_volume * (1 - j/5)
-                            await asyncio.sleep(0.01)  # 10ms x 5 = 50ms
-                        self.voice_client.source.volume = 0.0
-                    break
-
-                # 🆕 CURVA NÃO-LINEAR (mais natural)
-                # Reduz mais rápido no início, mais devagar no final
-                progress = (i + 1) / steps
-                # Curva quadrática: y = x²
-                curve_factor = progress ** 2
-                new_volume = original_volume * (1 - curve_factor)
-                new_volume = max(0.0, new_volume)
-
-                self.voice_client.source.volume = new_volume
-
-                await asyncio.sleep(step_duration)
-
-        except asyncio.CancelledError:
-            # Fade cancelado - mute suave
-            if self.voice_client and self.voice_client.source:
-                current_volume = self.voice_client.source.volume
-                for j in range(5):
-                    self.voice_client.source.volume = current_volume * (1 - j/5)
-                    await asyncio.sleep(0.01)
-                self.voice_client.source.volume = 0.0
-            raise
-        except Exception as e:
-            self.logger.debug(f"Fade out interrompido: {e}")
-
-    async def fade_in(self, duration: float):
-        """
-        Aumenta o volume gradualmente (fade in) com transição suave
-
-        Args:
-            duration: Duração do fade em segundos
-
-        Melhorias (Otimização #17):
-            - 50 steps para transição imperceptível (antes: 20)
-            - Curva não-linear inversa do fade out
-        """
-        if not self.voice_client or not self.voice_client.source:
-            return
-
-        target_volume = self.volume
-        steps = config.CROSSFADE_STEPS  # 🆕 Configurável via .env (default: 50)
-        step_duration = duration / steps
-
-        # Começar do silêncio
-        self.voice_client.source.volume = 0.0
-
-        try:
-            for i in range(steps):
-                if not self.voice_client or not self.voice_client.is_playing():
-                    break
-
-                # 🆕 CURVA NÃO-LINEAR (inversa do fade out)
-                progress = (i + 1) / steps
-                # Curva raiz quadrada: y = √x (aumenta rápido no início)
-                curve_factor = progress ** 0.5
-                new_volume = target_volume * curve_factor
-                new_volume = min(target_volume, new_volume)
-
-                self.voice_client.source.volume = new_volume
-
-                await asyncio.sleep(step_duration)
-
-        except asyncio.CancelledError:
-            # Fade cancelado - definir volume final
-            if self.voice_client and self.voice_client.source:
-                self.voice_client.source.volume = target_volume
-            raise
-        except Exception as e:
-            self.logger.debug(f"Fade in interrompido: {e}")
+        pending = self.mixer.cancel_crossfade()
+        if pending is not None:
+            self.queue.appendleft(pending)
 
     def set_volume(self, volume: float) -> None:
         """Define o volume (0.0 a 1.0)"""
         self.volume = max(0.0, min(1.0, volume))
         if self.voice_client and self.voice_client.source:
             self.voice_client.source.volume = self.volume
+        self.notify_state_changed()
         self.logger.info(f"Volume definido para {self.volume * 100:.0f}%")
 
     def _format_duration(self, seconds: int) -> str:
@@ -348,61 +509,54 @@ class MusicPlayer:
         bar = "━" * filled + "─" * (length - filled)
         return f"[{bar}]"
 
-    async def create_control_panel_embed(self) -> discord.Embed:
-        """Cria embed do painel de controle com status atual"""
-        embed = discord.Embed(
-            title="🎛️ Painel de Controle - Music Bot",
-            color=discord.Color.blue() if self.is_playing else discord.Color.greyple(),
-            timestamp=datetime.now(),
+    def _panel_static_key(self) -> tuple:
+        """Estado que muda as partes estáticas do painel (tudo menos o progresso)"""
+        song = self.current_song
+        return (
+            id(song),
+            (song.title, song.uploader, song.duration, song.thumbnail) if song else None,
+            self.is_playing,
+            self.is_paused,
+            len(self.queue),
+            tuple((id(s), s.title, s.duration) for s in islice(self.queue, 5)),
+            self.loop_mode,
+            self.autoplay_enabled,
+            round(self.volume, 2),
         )
 
-        # 🎵 Música Atual
-        if self.current_song:
-            elapsed = 0
-            if self.song_start_time and not self.is_paused:
-                import time
-
-                elapsed = int(time.time() - self.song_start_time)
-                elapsed = min(elapsed, self.current_song.duration)
-
-            progress_bar = self._get_progress_bar(elapsed, self.current_song.duration)
-            elapsed_str = self._format_duration(elapsed)
-            total_str = self._format_duration(self.current_song.duration)
+    def _build_panel_static(self) -> Dict[str, Any]:
+        """Monta as partes do painel que só mudam com música/fila/configurações"""
+        parts: Dict[str, Any] = {}
 
+        # 🎵 Música Atual (sem a linha de progresso)
+        if self.current_song:
             status_icon = "⏸️" if self.is_paused else "▶️"
-
-            current_info = (
+            parts["current"] = (
                 f"{status_icon} **{self.current_song.title}**\n"
                 f"🎤 {self.current_song.uploader}\n"
                 f"👤 Pedido por: {self.current_song.requester.mention}\n"
-                f"⏱️ {elapsed_str} {progress_bar} {total_str}"
-            )
-            embed.add_field(name="🎵 Tocando Agora", value=current_info, inline=False)
-
-            if self.current_song.thumbnail:
-                embed.set_thumbnail(url=self.current_song.thumbnail)
-        else:
-            embed.add_field(
-                name="🎵 Tocando Agora", value="*Nenhuma música tocando*", inline=False
             )
+            parts["total"] = self._format_duration(self.current_song.duration)
+            parts["thumbnail"] = self.current_song.thumbnail
 
         # 📋 Fila
         if self.queue:
             queue_text = ""
-            for i, song in enumerate(list(self.queue)[:5], 1):
+            has_autoplay = False
+            for i, song in enumerate(islice(self.queue, 5), 1):
                 duration = self._format_duration(song.duration)
-                queue_text += f"`{i}.` **{song.title}** [{duration}]\n"
+                marker = "🎲 " if song.from_autoplay else ""
+                has_autoplay = has_autoplay or song.from_autoplay
+                queue_text += f"`{i}.` {marker}**{song.title}** [{duration}]\n"
 
             if len(self.queue) > 5:
                 queue_text += f"\n*...e mais {len(self.queue) - 5} música(s)*"
+            if has_autoplay:
+                queue_text += "\n*🎲 = adicionada pelo autoplay*"
 
-            embed.add_field(
-                name=f"📋 Fila ({len(self.queue)} música(s))",
-                value=queue_text,
-                inline=False,
-            )
+            parts["queue"] = (f"📋 Fila ({len(self.queue)} música(s))", queue_text)
         else:
-            embed.add_field(name="📋 Fila", value="*Fila vazia*", inline=False)
+            parts["queue"] = ("📋 Fila", "*Fila vazia*")
 
         # ⚙️ Configurações
         loop_status = (
@@ -414,12 +568,56 @@ class MusicPlayer:
         volume_bars = int(self.volume * 10)
         volume_display = "🔊" + "█" * volume_bars + "░" * (10 - volume_bars)
 
-        config_text = (
+        parts["config"] = (
             f"🔁 Loop: {loop_status}\n"
             f"🎲 Autoplay: {autoplay_status}\n"
             f"🔊 Volume: {volume_display} {int(self.volume * 100)}%"
         )
-        embed.add_field(name="⚙️ Configurações", value=config_text, inline=False)
+        return parts
+
+    async def create_control_panel_embed(self) -> discord.Embed:
+        """
+        Cria embed do painel de controle com status atual
+
+        As partes estáticas (música, fila, configurações) são memoizadas pela
+        chave de estado; a cada tick só a linha de progresso é recalculada.
+        """
+        key = self._panel_static_key()
+        if self._panel_static is None or self._panel_static[0] != key:
+            self._panel_static = (key, self._build_panel_static())
+        parts = self._panel_static[1]
+
+        embed = discord.Embed(
+            title="🎛️ Painel de Controle - Music Bot",
+            color=discord.Color.blue() if self.is_playing else discord.Color.greyple(),
+            timestamp=datetime.now(),
+        )
+
+        # 🎵 Música Atual
+        if self.current_song:
+            elapsed = 0
+            if self.song_start_time and not self.is_paused:
+                elapsed = int(time.time() - self.song_start_time)
+                elapsed = min(elapsed, self.current_song.duration)
+
+            progress_bar = self._get_progress_bar(elapsed, self.current_song.duration)
+            elapsed_str = self._format_duration(elapsed)
+
+            current_info = (
+                f"{parts['current']}⏱️ {elapsed_str} {progress_bar} {parts['total']}"
+            )
+            embed.add_field(name="🎵 Tocando Agora", value=current_info, inline=False)
+
+            if parts["thumbnail"]:
+                embed.set_thumbnail(url=parts["thumbnail"])
+        else:
+            embed.add_field(
+                name="🎵 Tocando Agora", value="*Nenhuma música tocando*", inline=False
+            )
+
+        queue_name, queue_text = parts["queue"]
+        embed.add_field(name=queue_name, value=queue_text, inline=False)
+        embed.add_field(name="⚙️ Configurações", value=parts["config"], inline=False)
 
         # 🎮 Controles
         controls_text = (
@@ -457,14 +655,29 @@ class MusicService:
         self.logger = LoggerFactory.create_logger(__name__)
         self.players: Dict[int, MusicPlayer] = {}
 
-        # 🚀 Cache LRU para informações de vídeos (evita reprocessamento)
-        self._video_info_cache: OrderedDict[str, Dict] = OrderedDict()
-        self._cache_max_size = config.VIDEO_CACHE_SIZE
-        self._cache_hits = 0
-        self._cache_misses = 0
+        # 🚀 Cache de informações de vídeos (LRU + disco), usado por toda extração
+        # O cache persistente sobrevive a reinícios e aquece o LRU na inicialização
+        metadata_store = (
+            MetadataStore(config.CACHE_DIR / "metadata.db", config.CACHE_MAX_SIZE_MB)
+            if config.CACHE_ENABLED
+            else None
+        )
+        self.metadata_resolver = MetadataResolver(config.VIDEO_CACHE_SIZE, metadata_store)
+
+        # 💽 Cache local de áudio (opcional): músicas repetidas tocam do disco
+        self.audio_cache: Optional[AudioCache] = (
+            AudioCache(
+                config.AUDIO_CACHE_DIR,
+                config.AUDIO_CACHE_MAX_SIZE_MB,
+                config.AUDIO_CACHE_MAX_DURATION,
+                min_plays=config.AUDIO_CACHE_MIN_PLAYS,
+            )
+            if config.AUDIO_CACHE_ENABLED
+            else None
+        )
 
-        # Configurar yt-dlp para músicas individuais
-        self.ytdl = yt_dlp.YoutubeDL(config.get_ytdl_options())
+        # Configurar yt-dlp para músicas individuais (perfil enxuto: só stream de áudio)
+        self.ytdl = yt_dlp.YoutubeDL(config.get_ytdl_stream_options())
 
         # Configurar yt-dlp para playlists (ignora erros e continua)
         playlist_options = config.get_ytdl_options().copy()
@@ -473,17 +686,118 @@ class MusicService:
         playlist_options["quiet"] = False  # Mostrar progresso
         self.ytdl_playlist = yt_dlp.YoutubeDL(playlist_options)
 
+        # 🔄 Renovação antecipada das stream URLs da fila (todos os servidores)
+        self.stream_refresher = StreamRefresher(
+            get_players=lambda: self.players.values(),
+            refresh=self._refresh_stream,
+            interval=config.STREAM_REFRESH_INTERVAL,
+            margin=config.STREAM_REFRESH_MARGIN,
+            batch_size=config.STREAM_REFRESH_BATCH,
+        )
+        self.stream_refresher.start()
+
+        # 🎛️ Painéis de controle: uma task para todos os servidores, por evento
+        self.panel_scheduler = PanelScheduler(
+            render=self._render_panel,
+            get_active=lambda: [
+                guild_id
+                for guild_id, player in self.players.items()
+                if player.is_playing and not player.is_paused and player.control_panel_message
+            ],
+            debounce=config.PANEL_DEBOUNCE,
+            progress_interval=config.PANEL_PROGRESS_INTERVAL,
+            edits_per_second=config.PANEL_EDITS_PER_SECOND,
+        )
+        self.panel_scheduler.start()
+        self.panel_edits_skipped = 0  # Edições puladas (conteúdo idêntico ao último)
+
         # 🧹 Iniciar task de cleanup de players inativos
         asyncio.create_task(self.cleanup_inactive_players())
 
     def get_player(self, guild_id: int) -> MusicPlayer:
         """Obtém ou cria um player para o servidor"""
         if guild_id not in self.players:
-            self.players[guild_id] = MusicPlayer(guild_id)
+            player = MusicPlayer(guild_id)
+            player.subscribe(self.panel_scheduler.mark_dirty)
+            self.players[guild_id] = player
             self.logger.info(f"Player criado para servidor {guild_id}")
 
         return self.players[guild_id]
 
+    def _make_extractor(
+        self,
+        ytdl: yt_dlp.YoutubeDL,
+        priority: ExtractionPriority,
+        guild_id: Optional[int] = None,
+        max_retries: int = 1,
+    ):
+        """
+        Cria a função de extração usada pelo MetadataResolver
+
+        Args:
+            ytdl: Instância do yt-dlp a usar
+            priority: Prioridade no ExtractionScheduler
+            guild_id: Servidor que pediu (round-robin entre servidores)
+            max_retries: Tentativas com backoff exponencial (1 = sem retry)
+
+        Returns:
+            Corrotina que recebe a URL e retorna o info do yt-dlp
+        """
+
+        async def extract(url: str) -> Optional[Dict[str, Any]]:
+            async def run() -> Optional[Dict[str, Any]]:
+                # Compactar na própria thread: o info completo não chega ao loop
+                info: Optional[Dict[str, Any]] = await extraction_scheduler.run(
+                    lambda: slim_info(ytdl.extract_info(url, download=False)),
+                    priority=priority,
+                    guild_id=guild_id,
+                    key=cache_key(url),
+                )
+                return info
+
+            if max_retries <= 1:
+                return await run()
+
+            info: Optional[Dict[str, Any]] = await retry_with_backoff(
+                run,
+                max_retries=max_retries,
+                base_delay=1.0,
+                exceptions=(Exception,)  # yt-dlp lança Exception genérica para erros de rede
+            )
+            return info
+
+        return extract
+
+    async def _resolve(
+        self,
+        url: str,
+        priority: ExtractionPriority,
+        guild_id: Optional[int] = None,
+        ytdl: Optional[yt_dlp.YoutubeDL] = None,
+        max_retries: int = 1,
+        min_ttl: float = STREAM_URL_MIN_REMAINING,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Resolve metadados via cache/MetadataResolver com a prioridade indicada
+
+        Args:
+            url: URL do vídeo ou termo de busca
+            priority: Prioridade no ExtractionScheduler
+            guild_id: Servidor que pediu
+            ytdl: Instância do yt-dlp (padrão: self.ytdl)
+            max_retries: Tentativas com backoff exponencial
+            min_ttl: Validade mínima (s) da stream_url para aceitar o cache
+
+        Returns:
+            Registro compacto ou None
+        """
+        extractor = self._make_extractor(
+            ytdl or self.ytdl, priority, guild_id, max_retries
+        )
+        return await self.metadata_resolver.resolve(
+            url, extractor, priority=priority, min_ttl=min_ttl
+        )
+
     async def extract_info(self, url: str, requester: discord.Member) -> Song:
         """
         Extrai informações de uma música do YouTube
@@ -496,71 +810,33 @@ class MusicService:
             Objeto Song com as informações
         """
         try:
-            # Executar em thread separada com retry (3 tentativas, backoff 1s→2s→4s)
-            loop = asyncio.get_event_loop()
-
-            async def extract_with_retry():
-                return await loop.run_in_executor(
-                    None, lambda: self.ytdl.extract_info(url, download=False)
-                )
-
-            data = await retry_with_backoff(
-                extract_with_retry,
+            # Cache (LRU + disco) ou extração com retry (3 tentativas, backoff 1s→2s→4s)
+            song_data = await self._resolve(
+                url,
+                ExtractionPriority.PLAY_NOW,
+                guild_id=self._guild_id_of(requester),
                 max_retries=3,
-                base_delay=1.0,
-                exceptions=(Exception,)  # yt-dlp lança Exception genérica para erros de rede
             )
 
             # Verificar se data não é None
-            if data is None:
+            if song_data is None:
                 raise ValueError(
                     "Não foi possível extrair informações do vídeo. Verifique se a URL está correta ou se o vídeo está disponível."
                 )
 
-            # Se for playlist, pegar primeiro vídeo
-            if "entries" in data:
-                if not data["entries"]:
-                    raise ValueError("Playlist vazia ou sem vídeos disponíveis.")
-                data = data["entries"][0]
-
-                # Verificar se o primeiro vídeo da playlist também não é None
-                if data is None:
-                    raise ValueError(
-                        "O primeiro vídeo da playlist não está disponível."
-                    )
-
-            # Obter URL de stream
-            formats = data.get("formats", [])
-            stream_url = data.get("url")
-
-            # Procurar melhor formato de áudio
-            for fmt in formats:
-                if fmt.get("acodec") != "none":
-                    stream_url = fmt.get("url")
-                    break
-
             # Verificar se conseguimos obter uma URL de stream válida
-            if not stream_url:
+            if not song_data["stream_url"]:
                 # Tentar usar a URL original como fallback
-                stream_url = data.get("webpage_url", url)
+                song_data = {**song_data, "stream_url": song_data["url"]}
                 self.logger.warning(
-                    f"Usando URL original como fallback para stream: {stream_url}"
+                    f"Usando URL original como fallback para stream: {song_data['stream_url']}"
                 )
 
             # Validar dados essenciais
-            title = data.get("title")
+            title = song_data["title"]
             if not title or title.strip() == "":
                 raise ValueError("Título do vídeo não disponível.")
 
-            song_data = {
-                "url": data.get("webpage_url", url),
-                "title": title,
-                "duration": data.get("duration", 0) or 0,  # Garantir que não seja None
-                "thumbnail": data.get("thumbnail", ""),
-                "uploader": data.get("uploader", "Unknown"),
-                "stream_url": stream_url,
-            }
-
             song = Song(song_data, requester)
             self.logger.info(f"Informações extraídas: {song.title}")
 
@@ -570,24 +846,26 @@ class MusicService:
             self.logger.error(f"Erro ao extrair informações: {e}", exc_info=True)
             raise
 
-    async def extract_playlist(
+    async def open_playlist(
         self,
         url: str,
         requester: discord.Member,
-        player: "MusicPlayer" = None,
-        progress_callback=None,
-    ) -> Dict[str, Any]:
+        player: Optional["MusicPlayer"] = None,
+    ) -> PlaylistStream:
         """
-        Extrai informações de uma playlist do YouTube
+        Abre uma playlist do YouTube para ingestão em pipeline
+
+        Faz apenas a extração rápida (flat) da lista; os detalhes de cada
+        vídeo são resolvidos durante a iteração do PlaylistStream retornado,
+        que entrega as músicas em ordem assim que ficam prontas.
 
         Args:
             url: URL da playlist
             requester: Membro que solicitou
             player: Player para verificar cancelamento
-            progress_callback: Função async para atualizar progresso (opcional)
 
         Returns:
-            Dicionário com estatísticas e lista de músicas
+            PlaylistStream (iterável assíncrono de Song)
         """
         try:
             # Resetar flag de cancelamento (caso tenha ficado de operação anterior)
@@ -611,12 +889,14 @@ class MusicService:
             )
 
             ytdl_flat = yt_dlp.YoutubeDL(flat_options)
-            loop = asyncio.get_event_loop()
+            guild_id = player.guild_id if player else self._guild_id_of(requester)
 
             self.logger.info(f"📥 Fase 1: Extraindo lista de URLs (rápido)")
 
-            data = await loop.run_in_executor(
-                None, lambda: ytdl_flat.extract_info(url, download=False)
+            data = await extraction_scheduler.run(
+                lambda: ytdl_flat.extract_info(url, download=False),
+                priority=ExtractionPriority.PLAY_NOW,
+                guild_id=guild_id,
             )
 
             self.logger.info(f"✅ Lista extraída: {data is not None}")
@@ -625,35 +905,36 @@ class MusicService:
                 self.logger.error("❌ Data retornado é None")
                 raise ValueError("Não foi possível extrair informações da playlist.")
 
+            concurrency = AdaptiveConcurrency(
+                initial=config.PLAYLIST_CONCURRENCY,
+                maximum=config.PLAYLIST_MAX_CONCURRENCY,
+            )
+
             # Verificar se é realmente uma playlist
             if "entries" not in data:
                 # É apenas um vídeo, não uma playlist
                 song = await self.extract_info(url, requester)
-                return {
-                    "is_playlist": False,
-                    "songs": [song],
-                    "total": 1,
-                    "added": 1,
-                    "failed": 0,
-                    "errors": [],
-                }
 
-            entries = data["entries"]
+                async def single_song(idx, entry):
+                    return song
+
+                return PlaylistStream(
+                    [{"url": url}], single_song, concurrency, is_playlist=False
+                )
+
+            entries = list(data["entries"])
             playlist_title = data.get("title", "Playlist")
 
             # Nota: yt-dlp já limitou com playlistend, então len(entries) <= max_items
             total_in_playlist = data.get("playlist_count") or len(entries)
 
-            songs = []
-            errors = []
-
             self.logger.info(
                 f"📋 Fase 2: Processando {len(entries)} de {total_in_playlist} itens"
             )
 
             # FASE 2: Extrair detalhes de cada vídeo individualmente (com cancelamento)
             # Criar ytdl para extrair detalhes individuais
-            detail_options = config.get_ytdl_options().copy()
+            detail_options = config.get_ytdl_stream_options()
             detail_options.update(
                 {
                     "quiet": True,
@@ -663,251 +944,510 @@ class MusicService:
             )
             ytdl_detail = yt_dlp.YoutubeDL(detail_options)
 
-            # OTIMIZAÇÃO #1: Processar em batches paralelos (5 vídeos por vez)
-            BATCH_SIZE = 5
-            total_processed = 0
+            async def resolve_entry(idx: int, entry: Dict[str, Any]) -> Song:
+                # Pegar URL do vídeo
+                video_url = entry.get("url") or entry.get("webpage_url")
+                if not video_url:
+                    video_id = entry.get("id")
+                    if not video_id:
+                        raise ValueError("URL não encontrada")
+                    video_url = f"https://www.youtube.com/watch?v={video_id}"
+
+                if config.PLAYLIST_LAZY_RESOLVE:
+                    # Vídeos removidos/privados aparecem na lista flat só com título
+                    if entry.get("title") in UNAVAILABLE_FLAT_TITLES:
+                        raise ValueError("Vídeo indisponível")
+
+                    # Já em cache: metadados completos (e a stream, se ainda
+                    # válida); senão, resolvida sob demanda
+                    cached = self.metadata_resolver.get_metadata(video_url)
+                    if cached:
+                        return Song({**cached, "url": video_url}, requester)
+                    return Song.from_flat_entry(entry, video_url, requester)
+
+                # Extrair detalhes (cache primeiro)
+                video_data = await self._resolve(
+                    video_url,
+                    ExtractionPriority.PLAYLIST,
+                    guild_id=guild_id,
+                    ytdl=ytdl_detail,
+                )
+
+                if not video_data:
+                    raise ValueError("Não foi possível extrair")
+
+                title = video_data.get("title") or entry.get("title", "Unknown")
+                self.logger.info(f"✅ {idx}/{len(entries)}: {title}")
+
+                return Song(
+                    {
+                        **video_data,
+                        "url": video_url,
+                        "title": title,
+                        "stream_url": video_data["stream_url"] or video_url,
+                    },
+                    requester,
+                )
+
+            return PlaylistStream(
+                entries,
+                resolve_entry,
+                concurrency,
+                playlist_title=playlist_title,
+                total=total_in_playlist,
+                should_cancel=lambda: bool(
+                    player and player.cancel_playlist_processing
+                ),
+            )
+
+        except ValueError as e:
+            # Erros de validação já têm mensagem clara
+            self.logger.error(f"Erro de validação: {e}")
+            raise
+        except Exception as e:
+            # Outros erros mais técnicos
+            self.logger.error(f"Erro ao extrair playlist: {e}", exc_info=True)
+            self.logger.error(f"URL problemática: {url}")
+            self.logger.error(f"Tipo de erro: {type(e).__name__}")
+            raise ValueError(f"Erro ao processar playlist: {str(e)[:100]}")
+
+    async def extract_playlist(
+        self,
+        url: str,
+        requester: discord.Member,
+        player: "MusicPlayer" = None,
+    ) -> Dict[str, Any]:
+        """
+        Extrai informações de uma playlist do YouTube
+
+        Consome o PlaylistStream de open_playlist até o fim. Progresso em
+        tempo real fica com quem consome o stream (ProgressReporter).
+
+        Args:
+            url: URL da playlist
+            requester: Membro que solicitou
+            player: Player para verificar cancelamento
+
+        Returns:
+            Dicionário com estatísticas e lista de músicas
+        """
+        stream = await self.open_playlist(url, requester, player)
+
+        songs = [song async for song in stream]
+
+        # Resetar flag de cancelamento
+        if player:
+            player.cancel_playlist_processing = False
+
+        return {**stream.summary(), "songs": songs}
+
+    def schedule_preload(self, player: MusicPlayer):
+        """
+        Inicia o pré-carregamento das próximas músicas (se ainda não estiver rodando)
+
+        Chamar depois de adicionar músicas ou reordenar a fila.
+
+        Args:
+            player: Player do servidor
+        """
+        if config.PRELOAD_LOOKAHEAD <= 0 or not player.queue:
+            return
+
+        # 🛡️ PROTEÇÃO: a task em andamento já relê a janela a cada música
+        if player.preload_task and not player.preload_task.done():
+            return
+
+        player.preload_task = asyncio.create_task(self._preload_upcoming(player))
+        self.logger.debug("🚀 Pré-carregamento das próximas músicas iniciado")
+
+    async def _preload_upcoming(self, player: MusicPlayer):
+        """
+        Mantém as próximas PRELOAD_LOOKAHEAD músicas da fila com stream válida
+
+        A janela é relida após cada extração (músicas adicionadas durante o
+        pré-carregamento entram nela). Reordenar a fila cancela esta task.
+
+        Args:
+            player: Player do servidor
+        """
+        version = player.queue_version
+        attempted = set()  # id(song) já tentadas nesta rodada (evita loop em falhas)
+
+        try:
+            while player.queue_version == version:
+                window = list(player.queue)[: config.PRELOAD_LOOKAHEAD]
+                song = next(
+                    (
+                        s
+                        for s in window
+                        if not s.is_ready and id(s) not in attempted
+                    ),
+                    None,
+                )
+                if song is None:
+                    return
+
+                attempted.add(id(song))
+                self.logger.info(f"🚀 Pré-carregando música: {song.title}")
+
+                # Cache (LRU + disco) ou extração com prioridade PRELOAD
+                try:
+                    record = await self._resolve(
+                        song.url,
+                        ExtractionPriority.PRELOAD,
+                        guild_id=player.guild_id,
+                    )
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.logger.warning(
+                        f"⚠️ Erro ao pré-carregar {song.title}: {e} (carregará sob demanda)"
+                    )
+                    continue
+
+                # Atualizar stream_url (e metadados, se era preguiçosa)
+                if record and record.get("stream_url"):
+                    song.apply_record(record)
+                    self.logger.info(f"✅ Música pré-carregada com sucesso: {song.title}")
+
+        except asyncio.CancelledError:
+            self.logger.debug("🚫 Pré-carregamento cancelado")
+            # Esperado quando a fila é reordenada, limpa ou o bot desconecta
+
+    async def _refresh_stream(
+        self, song: Song, guild_id: Optional[int]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Re-extrai uma música da fila antes da stream expirar (StreamRefresher)
+
+        Args:
+            song: Música a renovar
+            guild_id: Servidor da fila
+
+        Returns:
+            Registro com a stream_url nova ou None
+        """
+        # Cache só serve se a URL dele também estiver fora da margem
+        return await self._resolve(
+            song.url,
+            ExtractionPriority.STREAM_REFRESH,
+            guild_id=guild_id,
+            min_ttl=self.stream_refresher.margin,
+        )
+
+    async def _ensure_valid_stream_url(self, song: Song):
+        """
+        Garante que a URL do stream é válida e não expirou
+
+        Args:
+            song: Música a validar
+        """
+        import time
+
+        # Verificar se a URL expirou (ou se a música ainda é preguiçosa)
+        if time.time() > song.stream_url_expires:
+            if song.is_resolved:
+                self.logger.info(f"🔄 Stream URL expirada, re-extraindo: {song.title}")
+            else:
+                self.logger.info(f"🔎 Resolvendo música sob demanda: {song.title}")
+
+            try:
+                # Re-extrair (ou reaproveitar URL recente de outro pedido do mesmo vídeo)
+                # PLAY_NOW: a reprodução está esperando (STREAM_REFRESH é só
+                # para a renovação em background)
+                record = await self._resolve(
+                    song.url,
+                    ExtractionPriority.PLAY_NOW,
+                    guild_id=self._guild_id_of(song.requester),
+                )
+
+                if record and record["stream_url"]:
+                    # Atualizar stream URL e renovar TTL
+                    song.apply_record(record)
+                    self.logger.info(f"✅ Stream URL renovada: {song.title}")
+
+            except Exception as e:
+                self.logger.error(f"❌ Erro ao renovar stream URL: {e}")
+                # Manter URL antiga e tentar tocar mesmo assim
+
+    def _create_audio_source(
+        self, player: MusicPlayer, song: Song, cached_audio=None
+    ) -> discord.AudioSource:
+        """
+        Cria a fonte de áudio conforme PLAYBACK_MODE
+
+        - "pcm": ffmpeg -> PCM -> GainTransformer -> Opus (discord.py); com
+          crossfade, retorna o PCM puro (volume e fades ficam no CrossfadeMixer)
+        - "opus": ffmpeg entrega Opus; com stream já em Opus, volume 1.0 e sem
+          crossfade, só copia (passthrough); senão volume e fades (afade) são
+          aplicados no ffmpeg
+
+        Args:
+            player: Player do servidor
+            song: Música a tocar
+            cached_audio: Arquivo Opus do cache local (None = stream remota)
+
+        Returns:
+            Fonte de áudio
+        """
+        if cached_audio is not None:
+            source, codec = str(cached_audio), "opus"
+            ffmpeg_options = {"options": "-vn"}
+        else:
+            source, codec = song.stream_url, song.acodec
+            ffmpeg_options = config.FFMPEG_OPTIONS
+
+        if config.PLAYBACK_MODE != "opus":
+            pcm_source = discord.FFmpegPCMAudio(source, **ffmpeg_options)
+            if player.crossfade_enabled:
+                return pcm_source
+            return GainTransformer(pcm_source, volume=player.volume)
+
+        # 🎚️ Crossfade no modo opus: fade in/out sequenciais via afade do ffmpeg
+        fade = player.crossfade_duration if player.crossfade_enabled else 0
+        fade_out_at = song.duration - fade if fade and song.duration > fade * 2 else None
+
+        passthrough = codec == "opus" and abs(player.volume - 1.0) < 0.001 and not fade
+        self.logger.debug(
+            f"🎚️ Fonte Opus ({'passthrough' if passthrough else 'volume no ffmpeg'}): {song.title}"
+        )
+        return ControlledOpusAudio(
+            source,
+            volume=player.volume,
+            passthrough=passthrough,
+            fade_in=fade,
+            fade_out_at=fade_out_at,
+            fade_duration=fade,
+            **ffmpeg_options,
+        )
+
+    async def _prepare_audio_source(
+        self, player: MusicPlayer, song: Song
+    ) -> Optional[discord.AudioSource]:
+        """
+        Garante a stream (ou o áudio em cache local) e cria a fonte de áudio
+
+        Args:
+            player: Player do servidor
+            song: Música a tocar
 
-            for batch_start in range(0, len(entries), BATCH_SIZE):
-                batch_end = min(batch_start + BATCH_SIZE, len(entries))
-                batch = entries[batch_start:batch_end]
+        Returns:
+            Fonte de áudio ou None se a música estiver indisponível
+        """
+        # 💽 Áudio já em cache local: não precisa de stream_url
+        video_id = self._extract_video_id(song.url)
+        cached_audio = (
+            self.audio_cache.get(video_id) if self.audio_cache and video_id else None
+        )
 
-                # Verificar cancelamento antes de cada batch
-                if player and player.cancel_playlist_processing:
-                    self.logger.info(
-                        f"🛑 Processamento cancelado após {total_processed}/{len(entries)} itens"
-                    )
-                    break
+        if cached_audio is None:
+            # 🔄 Validar e renovar stream URL se necessário
+            await self._ensure_valid_stream_url(song)
 
-                # Processar batch em paralelo
-                batch_tasks = []
-                for idx_in_batch, entry in enumerate(batch):
-                    idx = batch_start + idx_in_batch + 1
+            # Música preguiçosa que não pôde ser resolvida (indisponível)
+            if not song.is_resolved:
+                self.logger.warning(f"⏭️ Música indisponível, pulando: {song.title}")
+                return None
 
-                    async def process_entry(entry=entry, idx=idx):
-                        if entry is None:
-                            return {"error": f"Item {idx}: Vídeo indisponível"}
+        if cached_audio is not None:
+            self.logger.info(f"💽 Tocando do cache de áudio local: {song.title}")
 
-                        try:
-                            # Pegar URL do vídeo
-                            video_url = entry.get("url") or entry.get("webpage_url")
-                            if not video_url:
-                                video_id = entry.get("id")
-                                if video_id:
-                                    video_url = f"https://www.youtube.com/watch?v={video_id}"
-                                else:
-                                    return {"error": f"Item {idx}: URL não encontrada"}
-
-                            # Extrair detalhes (em paralelo)
-                            video_data = await loop.run_in_executor(
-                                None,
-                                lambda: ytdl_detail.extract_info(video_url, download=False),
-                            )
-
-                            if not video_data:
-                                return {"error": f"Item {idx}: Não foi possível extrair"}
-
-                            title = video_data.get("title", entry.get("title", "Unknown"))
-
-                            return {
-                                "idx": idx,
-                                "song_data": {
-                                    "url": video_url,
-                                    "title": title,
-                                    "duration": video_data.get("duration", 0) or 0,
-                                    "thumbnail": video_data.get("thumbnail", ""),
-                                    "uploader": video_data.get("uploader", "Unknown"),
-                                    "stream_url": video_data.get("url", video_url),
-                                },
-                                "title": title
-                            }
-                        except Exception as e:
-                            error_msg = str(e)
-                            if "copyright" in error_msg.lower() or "blocked" in error_msg.lower():
-                                return {"error": f"Item {idx}: Bloqueado por direitos autorais"}
-                            elif "unavailable" in error_msg.lower():
-                                return {"error": f"Item {idx}: Vídeo indisponível"}
-                            else:
-                                return {"error": f"Item {idx}: {error_msg[:50]}"}
-
-                    batch_tasks.append(process_entry())
-
-                # Aguardar batch completo
-                batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-
-                # Processar resultados do batch
-                for result in batch_results:
-                    if isinstance(result, Exception):
-                        errors.append(f"Erro: {str(result)[:50]}")
-                        continue
-
-                    if "error" in result:
-                        errors.append(result["error"])
-                        self.logger.warning(f"❌ {result['error']}")
-                        continue
-
-                    # Sucesso - criar música
-                    song = Song(result["song_data"], requester)
-                    songs.append(song)
-                    total_processed += 1
-                    self.logger.info(f"✅ {result['idx']}/{len(entries)}: {result['title']}")
-
-                    # Callback para adicionar em tempo real
-                    if progress_callback:
-                        await progress_callback(
-                            current=result['idx'],
-                            total=len(entries),
-                            processed=len(songs),
-                            failed=len(errors),
-                            current_title=result['title'],
-                            song=song,
-                        )
+        return self._create_audio_source(player, song, cached_audio)
 
+    def _cache_played_audio(self, song: Song):
+        """
+        Salva em Opus (em background) uma música que acabou de tocar da stream
 
+        Roda depois da reprodução: o download do cache não disputa banda com
+        a música tocando. O AudioCache ignora músicas já em cache ou tocadas
+        menos de AUDIO_CACHE_MIN_PLAYS vezes. Chamar no event loop.
 
-            # Calcular itens não processados
-            fetched_items = len(entries)
-            not_fetched = max(0, total_in_playlist - fetched_items)
+        Args:
+            song: Música que terminou
+        """
+        video_id = self._extract_video_id(song.url)
+        if self.audio_cache and video_id and song.stream_url:
+            self.audio_cache.schedule_fill(video_id, song.stream_url, song.duration)
 
-            # Verificar se foi cancelado
-            was_cancelled = player and player.cancel_playlist_processing
+    def _record_finished(self, player: MusicPlayer, song: Song):
+        """
+        Registra uma música que terminou no histórico do autoplay
 
-            # Resetar flag de cancelamento
-            if player:
-                player.cancel_playlist_processing = False
+        Args:
+            player: Player do servidor
+            song: Música que acabou de tocar
+        """
+        video_id = self._extract_video_id(song.url)
+        if video_id:
+            # 🎯 Música pedida por usuário vira nova referência: candidatos
+            # da referência anterior podem ser de outro gênero
+            if (
+                not song.from_autoplay
+                and player.autoplay_pool
+                and video_id != player.autoplay_pool_source
+            ):
+                player.clear_autoplay_pool()
 
-            return {
-                "is_playlist": True,
-                "playlist_title": playlist_title,
-                "songs": songs,
-                "total": total_in_playlist,
-                "processed": fetched_items,
-                "not_processed": not_fetched,
-                "added": len(songs),
-                "failed": len(errors),
-                "errors": errors[:10],  # Limitar a 10 erros para não flodar
-                "cancelled": was_cancelled,
-            }
+            player.last_video_id = video_id
+            player.last_video_title = song.title
+            player.last_video_channel = song.uploader
+            player.last_video_from_autoplay = song.from_autoplay
+            player.autoplay_history.append(video_id)
+            self.logger.debug(
+                f"📝 Música adicionada ao histórico: {song.title} | Histórico: {len(player.autoplay_history)} vídeos"
+            )
 
-        except ValueError as e:
-            # Erros de validação já têm mensagem clara
-            self.logger.error(f"Erro de validação: {e}")
-            raise
-        except Exception as e:
-            # Outros erros mais técnicos
-            self.logger.error(f"Erro ao extrair playlist: {e}", exc_info=True)
-            self.logger.error(f"URL problemática: {url}")
-            self.logger.error(f"Tipo de erro: {type(e).__name__}")
-            raise ValueError(f"Erro ao processar playlist: {str(e)[:100]}")
+        # Salvar último requester válido
+        if song.requester:
+            player.last_requester = song.requester
 
-    async def _preload_next_song(self, player: MusicPlayer):
+    def _song_started(
+        self, player: MusicPlayer, voice_client: discord.VoiceClient, song: Song
+    ):
         """
-        Pré-carrega a próxima música da fila para reduzir latência
+        Tarefas de quando uma música começa a tocar (pré-carregamento, autoplay)
 
         Args:
             player: Player do servidor
+            voice_client: Cliente de voz do Discord
+            song: Música que começou
         """
-        try:
-            # 🛡️ PROTEÇÃO: Prevenir múltiplos pré-carregamentos simultâneos
-            if player.preload_task and not player.preload_task.done():
-                # Já existe um pré-carregamento em andamento
-                return
-
-            # Se não tem próxima música na fila, não pré-carregar
-            if not player.queue or len(player.queue) == 0:
-                return
+        self.logger.info(f"Reproduzindo: {song.title}")
 
-            # Pegar próxima música sem remover da fila
-            next_song = player.queue[0]
+        # 🚀 PRÉ-CARREGAMENTO: Manter as próximas músicas da fila prontas
+        try:
+            self.schedule_preload(player)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Erro ao iniciar pré-carregamento: {e}")
 
-            # Se já foi pré-carregada, não fazer novamente
-            if player.preloaded_song and player.preloaded_song.url == next_song.url:
-                self.logger.debug(f"🚀 Música já pré-carregada: {next_song.title}")
-                return
+        # 🆕 AUTOPLAY PROATIVO: Se fila VAZIA e autoplay ativo, buscar mais músicas
+        # IMPORTANTE: Só busca quando fila está REALMENTE vazia (0 músicas)
+        if (
+            player.autoplay_enabled
+            and len(player.queue) == 0  # ← CORRIGIDO: Apenas quando fila VAZIA
+            and not player.is_fetching_autoplay
+        ):
+            # Extrair info da música ATUAL (que está tocando agora)
+            current_video_id = self._extract_video_id(song.url)
+            if current_video_id:
+                self.logger.info(
+                    f"🎵 Autoplay proativo: Fila vazia, buscando músicas baseadas em '{song.title}'"
+                )
+                asyncio.run_coroutine_threadsafe(
+                    self._fetch_autoplay_songs(
+                        player,
+                        voice_client,
+                        proactive=True,
+                        reference_video_id=current_video_id,
+                        reference_title=song.title,
+                        reference_channel=song.uploader,
+                        reference_from_autoplay=song.from_autoplay,
+                    ),
+                    voice_client.client.loop,
+                )
 
-            self.logger.info(f"🚀 Pré-carregando próxima música: {next_song.title}")
+    def _create_mixer(
+        self,
+        player: MusicPlayer,
+        voice_client: discord.VoiceClient,
+        song: Song,
+        source: discord.AudioSource,
+    ) -> CrossfadeMixer:
+        """
+        Envolve a fonte PCM em um CrossfadeMixer ligado a este player
 
-            # Extrair video_id
-            video_id = self._extract_video_id(next_song.url)
+        Os callbacks do mixer rodam na thread de áudio: só agendam corrotinas
+        no event loop do bot.
+        """
+        loop = voice_client.client.loop
 
-            # Verificar cache primeiro (LRU)
-            if video_id and video_id in self._video_info_cache:
-                # Move para o final (marca como recentemente usado)
-                info = self._video_info_cache.pop(video_id)
-                self._video_info_cache[video_id] = info
-                self._cache_hits += 1
-                self.logger.debug(f"✅ Cache hit no pré-carregamento: {video_id}")
-            else:
-                self._cache_misses += 1
-                # Extrair informações do vídeo com timeout de 10s
-                loop = asyncio.get_event_loop()
-                try:
-                    info = await asyncio.wait_for(
-                        loop.run_in_executor(
-                            None,
-                            lambda: self.ytdl.extract_info(
-                                next_song.url, download=False
-                            ),
-                        ),
-                        timeout=10.0,  # 10 segundos de timeout (reduzido de 30s)
-                    )
-                except asyncio.TimeoutError:
-                    self.logger.warning(
-                        f"⏱️ Timeout ao pré-carregar música: {next_song.title} (carregará sob demanda)"
-                    )
-                    return
+        def on_need_next(_current: Song):
+            asyncio.run_coroutine_threadsafe(
+                self._queue_crossfade_next(player, voice_client, mixer), loop
+            )
 
-                # Adicionar ao cache (LRU - remove mais antigo se cheio)
-                if video_id and info:
-                    if len(self._video_info_cache) >= self._cache_max_size:
-                        # Remove primeiro item (mais antigo)
-                        self._video_info_cache.popitem(last=False)
-                    self._video_info_cache[video_id] = info
-
-            # Atualizar stream_url da próxima música
-            if info:
-                next_song.stream_url = info.get("url", next_song.stream_url)
-                player.preloaded_song = next_song
-                self.logger.info(
-                    f"✅ Música pré-carregada com sucesso: {next_song.title}"
-                )
+        def on_handoff(previous: Song, following: Song):
+            asyncio.run_coroutine_threadsafe(
+                self._crossfade_handoff(player, voice_client, mixer, previous, following),
+                loop,
+            )
 
-        except asyncio.CancelledError:
-            self.logger.debug("🚫 Pré-carregamento cancelado")
-            # Esperado quando fila é limpa ou skip
-        except Exception as e:
-            self.logger.warning(f"⚠️ Erro ao pré-carregar música: {e}")
-            # Não é crítico, apenas log
+        mixer = CrossfadeMixer(
+            source,
+            song,
+            song.duration,
+            crossfade=player.crossfade_duration,
+            volume=player.volume,
+            on_need_next=on_need_next,
+            on_handoff=on_handoff,
+        )
+        player.mixer = mixer
+        return mixer
 
-    async def _ensure_valid_stream_url(self, song: Song):
+    async def _queue_crossfade_next(
+        self,
+        player: MusicPlayer,
+        voice_client: discord.VoiceClient,
+        mixer: CrossfadeMixer,
+    ):
         """
-        Garante que a URL do stream é válida e não expirou
+        Entrega a próxima música da fila ao mixer antes da janela de crossfade
 
         Args:
-            song: Música a validar
+            player: Player do servidor
+            voice_client: Cliente de voz do Discord
+            mixer: Mixer que pediu a próxima música
         """
-        import time
+        while (
+            player.mixer is mixer
+            and player.crossfade_enabled
+            and not player.stopped_manually
+            and player.queue
+        ):
+            song = player.next_from_queue()
+            source = await self._prepare_audio_source(player, song)
+            if source is None:
+                continue  # Indisponível: tentar a seguinte
 
-        # Verificar se a URL expirou
-        if time.time() > song.stream_url_expires:
-            self.logger.info(f"🔄 Stream URL expirada, re-extraindo: {song.title}")
+            if player.mixer is mixer and mixer.queue_next(source, song, song.duration):
+                self.logger.debug(f"🎚️ Crossfade preparado: {song.title}")
+                return
 
-            try:
-                # Re-extrair informações do vídeo
-                loop = asyncio.get_event_loop()
-                data = await loop.run_in_executor(
-                    None, lambda: self.ytdl.extract_info(song.url, download=False)
-                )
+            # Mixer já terminou (música atual acabou antes da próxima ficar pronta)
+            source.cleanup()
+            player.queue.appendleft(song)
+            if not player.is_playing and not player.stopped_manually:
+                await self.play_song(player, voice_client, player.next_from_queue())
+            return
 
-                if data:
-                    # Atualizar stream URL
-                    song.stream_url = data.get("url", song.stream_url)
-                    # Renovar TTL
-                    song.stream_url_expires = time.time() + (5 * 3600)
-                    self.logger.info(f"✅ Stream URL renovada: {song.title}")
+    async def _crossfade_handoff(
+        self,
+        player: MusicPlayer,
+        voice_client: discord.VoiceClient,
+        mixer: CrossfadeMixer,
+        previous: Song,
+        song: Song,
+    ):
+        """
+        A próxima música começou dentro do mixer (sem novo voice_client.play)
 
-            except Exception as e:
-                self.logger.error(f"❌ Erro ao renovar stream URL: {e}")
-                # Manter URL antiga e tentar tocar mesmo assim
+        Args:
+            player: Player do servidor
+            voice_client: Cliente de voz do Discord
+            mixer: Mixer que fez a transição
+            previous: Música que está saindo
+            song: Música que está entrando
+        """
+        if player.mixer is not mixer:
+            return
+
+        self._record_finished(player, previous)
+        self._cache_played_audio(previous)
+        player.current_song = song
+        player.song_start_time = time.time()
+
+        await self.update_control_panel(player)
+        self._song_started(player, voice_client, song)
 
     async def play_song(
         self, player: MusicPlayer, voice_client: discord.VoiceClient, song: Song
@@ -926,53 +1466,51 @@ class MusicService:
         player.stopped_manually = False  # Resetar flag ao começar a tocar
 
         # 🎛️ Definir timestamp do início da música para tracking de progresso
-        import time
-
         player.song_start_time = time.time()
 
-        # 🎛️ Iniciar/atualizar painel de controle
+        # 🎛️ Atualizar painel de controle (agendado pelo PanelScheduler)
         await self.update_control_panel(player)
-        await self.start_panel_updates(player)
 
-        # 🔄 Validar e renovar stream URL se necessário
-        await self._ensure_valid_stream_url(song)
-
-        # Criar fonte de áudio
-        audio_source = discord.FFmpegPCMAudio(song.stream_url, **config.FFMPEG_OPTIONS)
+        audio_source = await self._prepare_audio_source(player, song)
+        if audio_source is None:
+            player.current_song = None
+            player.is_playing = False
+            if player.queue:
+                await self.play_song(player, voice_client, player.next_from_queue())
+            return
 
-        # Aplicar volume
-        audio_source = discord.PCMVolumeTransformer(audio_source, volume=player.volume)
+        # 🎚️ CROSSFADE (modo pcm): mixer sobrepõe o fim desta música ao início da próxima
+        if config.PLAYBACK_MODE != "opus" and player.crossfade_enabled:
+            audio_source = self._create_mixer(player, voice_client, song, audio_source)
+        else:
+            player.mixer = None
 
         def after_playing(error):
             """Callback após terminar de tocar"""
             if error:
                 self.logger.error(f"Erro na reprodução: {error}")
 
-            # 🛡️ PROTEÇÃO: Cancelar fade task se ainda estiver rodando
-            if player.fade_task and not player.fade_task.done():
-                player.fade_task.cancel()
-                player.fade_task = None
-
             player.is_playing = False
 
+            # 🎚️ Próxima música já entregue ao mixer mas ainda não iniciada: volta à fila
+            if player.mixer:
+                pending = player.mixer.drop_queued()
+                if pending is not None and not player.stopped_manually:
+                    player.queue.appendleft(pending)
+                player.mixer = None
+
             # Salvar ID e informações do vídeo que acabou de tocar
             if player.current_song:
-                video_id = self._extract_video_id(player.current_song.url)
-                if video_id:
-                    player.last_video_id = video_id
-                    player.last_video_title = player.current_song.title
-                    player.last_video_channel = player.current_song.uploader
-                    player.autoplay_history.append(video_id)
-                    self.logger.debug(
-                        f"📝 Música adicionada ao histórico: {player.current_song.title} | Histórico: {len(player.autoplay_history)} vídeos"
-                    )
-
-                # Salvar último requester válido
-                if player.current_song.requester:
-                    player.last_requester = player.current_song.requester
+                self._record_finished(player, player.current_song)
+                voice_client.client.loop.call_soon_threadsafe(
+                    self._cache_played_audio, player.current_song
+                )
 
             player.current_song = None
 
+            # 🎛️ Painel reflete o fim da música (callback roda na thread de áudio)
+            voice_client.client.loop.call_soon_threadsafe(player.notify_state_changed)
+
             # Verificar se foi parado manualmente
             if player.stopped_manually:
                 self.logger.info("⏹️ Reprodução parada manualmente pelo usuário")
@@ -993,19 +1531,12 @@ class MusicService:
 
             # Tocar próxima música da fila
             if player.queue:
-                next_song = player.queue.popleft()
-
-                # 🚀 Usar stream pré-carregado se disponível
-                if (
-                    player.preloaded_song
-                    and player.preloaded_song.url == next_song.url
-                    and player.preloaded_song.stream_url
-                ):
+                # 🚀 Stream já vem pronta se a música estava na janela de pré-carregamento
+                next_song = player.next_from_queue()
+                if next_song.is_ready:
                     self.logger.info(
                         f"⚡ Usando stream pré-carregado para: {next_song.title}"
                     )
-                    next_song.stream_url = player.preloaded_song.stream_url
-                    player.preloaded_song = None  # Limpar cache
 
                 asyncio.run_coroutine_threadsafe(
                     self.play_song(player, voice_client, next_song),
@@ -1026,139 +1557,61 @@ class MusicService:
                 )
 
         voice_client.play(audio_source, after=after_playing)
-        self.logger.info(f"Reproduzindo: {song.title}")
-
-        # � CROSSFADE: Fade in no início da música
-        if player.crossfade_enabled:
-            self.logger.debug(f"🔊 Iniciando fade in ({player.crossfade_duration}s)")
-            asyncio.run_coroutine_threadsafe(
-                player.fade_in(player.crossfade_duration),
-                voice_client.client.loop,
-            )
-
-            # 🔉 Agendar fade out para os últimos X segundos
-            if (
-                song.duration > player.crossfade_duration * 2
-            ):  # Só faz fade se música for longa o suficiente
-                fade_out_delay = song.duration - player.crossfade_duration
-                self.logger.debug(f"🔉 Fade out agendado para {fade_out_delay}s")
-
-                async def schedule_fade_out():
-                    await asyncio.sleep(fade_out_delay)
-                    if player.is_playing and voice_client.is_playing():
-                        self.logger.debug(
-                            f"🔉 Iniciando fade out ({player.crossfade_duration}s)"
-                        )
-                        await player.fade_out(player.crossfade_duration)
-
-                player.fade_task = asyncio.run_coroutine_threadsafe(
-                    schedule_fade_out(),
-                    voice_client.client.loop,
-                )
-
-        # 🚀 PRÉ-CARREGAMENTO: Iniciar pré-carregamento da próxima música
-        if player.queue and len(player.queue) > 0:
-            # Iniciar novo pré-carregamento em background (proteção está dentro do método)
-            try:
-                player.preload_task = asyncio.create_task(
-                    self._preload_next_song(player)
-                )
-                self.logger.debug("🚀 Pré-carregamento da próxima música iniciado")
-            except Exception as e:
-                self.logger.warning(f"⚠️ Erro ao iniciar pré-carregamento: {e}")
-
-        # 🆕 AUTOPLAY PROATIVO: Se fila VAZIA e autoplay ativo, buscar mais músicas
-        # IMPORTANTE: Só busca quando fila está REALMENTE vazia (0 músicas)
-        if (
-            player.autoplay_enabled
-            and len(player.queue) == 0  # ← CORRIGIDO: Apenas quando fila VAZIA
-            and not player.is_fetching_autoplay
-        ):
-            # Extrair info da música ATUAL (que está tocando agora)
-            current_video_id = self._extract_video_id(song.url)
-            if current_video_id:
-                self.logger.info(
-                    f"🎵 Autoplay proativo: Fila vazia, buscando músicas baseadas em '{song.title}'"
-                )
-                asyncio.run_coroutine_threadsafe(
-                    self._fetch_autoplay_songs(
-                        player,
-                        voice_client,
-                        proactive=True,
-                        reference_video_id=current_video_id,
-                        reference_title=song.title,
-                        reference_channel=song.uploader,
-                    ),
-                    voice_client.client.loop,
-                )
+        self._song_started(player, voice_client, song)
 
     async def _send_autoplay_notification(
-        self, channel: discord.TextChannel, song: Song, position: int
+        self, channel: discord.TextChannel, added: List[Tuple[Song, int]]
     ):
         """
-        Envia notificação de música adicionada pelo autoplay (em background)
+        Envia UMA notificação com todas as músicas de uma sessão do autoplay
 
         Args:
             channel: Canal de texto para enviar
-            song: Música adicionada
-            position: Posição na fila
+            added: Lista de (música, posição na fila)
         """
         try:
-            # Formatar duração
-            duration_str = (
-                f"{song.duration // 60}:{song.duration % 60:02d}"
-                if song.duration
-                else "N/A"
-            )
+            lines = []
+            for song, position in added[:10]:
+                duration_str = (
+                    f"{song.duration // 60}:{song.duration % 60:02d}"
+                    if song.duration
+                    else "N/A"
+                )
+                lines.append(
+                    f"`#{position}` **[{song.title}]({song.url})** "
+                    f"- {song.uploader or 'Desconhecido'} [{duration_str}]"
+                )
+            if len(added) > 10:
+                lines.append(f"*...e mais {len(added) - 10} música(s)*")
 
             embed = discord.Embed(
-                title="🎵 Autoplay adicionou",
-                description=f"**[{song.title}]({song.url})**",
+                title=f"🎵 Autoplay adicionou {len(added)} música(s)",
+                description="\n".join(lines),
                 color=discord.Color.blue(),
             )
-            embed.add_field(
-                name="Canal",
-                value=song.uploader or "Desconhecido",
-                inline=True,
-            )
-            embed.add_field(
-                name="Duração",
-                value=duration_str,
-                inline=True,
-            )
-            embed.add_field(
-                name="Posição na fila",
-                value=f"#{position}",
-                inline=True,
-            )
-            if song.thumbnail:
-                embed.set_thumbnail(url=song.thumbnail)
+            first_song = added[0][0]
+            if first_song.thumbnail:
+                embed.set_thumbnail(url=first_song.thumbnail)
             embed.set_footer(
-                text=f"💡 Use {config.COMMAND_PREFIX}remove {position} para remover"
+                text=f"💡 Use {config.COMMAND_PREFIX}remove <posição> para remover"
+            )
+            await message_scheduler.send(
+                channel, embed=embed, priority=MessagePriority.NOTIFICATION
             )
-            await channel.send(embed=embed)
         except Exception as e:
             self.logger.debug(f"Erro ao enviar notificação de autoplay: {e}")
 
     async def update_control_panel(self, player: MusicPlayer, debounce: bool = True):
         """
-        Atualiza ou cria o painel de controle com debounce opcional
+        Atualiza ou cria o painel de controle
 
         Args:
             player: Player do servidor
-            debounce: Se True, aguarda 2s antes de atualizar (evita spam)
+            debounce: Se True, só agenda no PanelScheduler (agrupa mudanças
+                próximas e respeita os limites de edição do Discord)
         """
         if debounce:
-            # Cancelar debounce anterior se existir
-            if player.panel_debounce_task and not player.panel_debounce_task.done():
-                player.panel_debounce_task.cancel()
-
-            # Criar nova task de debounce
-            async def debounced_update():
-                await asyncio.sleep(2.0)  # Aguardar 2 segundos
-                await self.update_control_panel(player, debounce=False)
-
-            player.panel_debounce_task = asyncio.create_task(debounced_update())
+            self.panel_scheduler.mark_dirty(player.guild_id)
             return
 
         try:
@@ -1167,10 +1620,21 @@ class MusicService:
 
             embed = await player.create_control_panel_embed()
 
-            # Se já existe painel, atualizar
+            # Conteúdo idêntico ao último enviado (o horário não conta): não editar
+            payload = self._panel_payload(embed)
+            if player.control_panel_message and payload == player.panel_payload:
+                self.panel_edits_skipped += 1
+                return
+
+            # Se já existe painel, atualizar (edição cosmética: menor prioridade)
             if player.control_panel_message:
                 try:
-                    await player.control_panel_message.edit(embed=embed)
+                    if await message_scheduler.edit(
+                        player.control_panel_message,
+                        embed=embed,
+                        priority=MessagePriority.PANEL,
+                    ):
+                        player.panel_payload = payload
                 except discord.NotFound:
                     # Mensagem foi deletada, criar nova
                     player.control_panel_message = None
@@ -1180,59 +1644,38 @@ class MusicService:
 
             # Se não existe, criar novo painel
             if not player.control_panel_message:
-                player.control_panel_message = await player.text_channel.send(
-                    embed=embed
+                player.control_panel_message = await message_scheduler.send(
+                    player.text_channel,
+                    embed=embed,
+                    priority=MessagePriority.NOTIFICATION,
                 )
+                player.panel_payload = payload
 
                 # Adicionar reações de controle
                 control_reactions = ["⏯️", "⏭️", "⏹️", "🔊", "🔉", "🔁", "🎲"]
                 for emoji in control_reactions:
                     try:
-                        await player.control_panel_message.add_reaction(emoji)
+                        await message_scheduler.add_reaction(
+                            player.control_panel_message, emoji
+                        )
                     except discord.HTTPException:
                         pass
 
-        except asyncio.CancelledError:
-            # Esperado quando debounce é cancelado
-            pass
         except Exception as e:
             self.logger.error(f"Erro ao atualizar painel de controle: {e}")
 
-    async def start_panel_updates(self, player: MusicPlayer):
-        """
-        Inicia atualização automática do painel a cada 5 segundos
-
-        Args:
-            player: Player do servidor
-        """
-
-        async def update_loop():
-            try:
-                while player.is_playing or player.is_paused or len(player.queue) > 0:
-                    try:
-                        await self.update_control_panel(player)
-                    except Exception as e:
-                        self.logger.error(f"Erro ao atualizar painel no loop: {e}")
-
-                    await asyncio.sleep(5)  # Atualizar a cada 5 segundos
-
-                # Atualização final quando parar
-                try:
-                    await self.update_control_panel(player)
-                except Exception as e:
-                    self.logger.error(f"Erro na atualização final do painel: {e}")
-
-            except asyncio.CancelledError:
-                self.logger.debug("Loop de atualização do painel cancelado")
-            except Exception as e:
-                self.logger.error(f"Erro crítico no loop do painel: {e}")
-
-        # Cancelar task anterior se existir
-        if player.panel_update_task and not player.panel_update_task.done():
-            player.panel_update_task.cancel()
+    @staticmethod
+    def _panel_payload(embed: discord.Embed) -> bytes:
+        """Serializa o embed do painel para comparação (sem o timestamp)"""
+        data = embed.to_dict()
+        data.pop("timestamp", None)
+        return json.dumps(data, sort_keys=True, ensure_ascii=False).encode()
 
-        # Iniciar nova task
-        player.panel_update_task = asyncio.create_task(update_loop())
+    async def _render_panel(self, guild_id: int):
+        """Renderiza o painel de um servidor (chamado pelo PanelScheduler)"""
+        player = self.players.get(guild_id)
+        if player:
+            await self.update_control_panel(player, debounce=False)
 
     async def handle_panel_reaction(
         self,
@@ -1272,8 +1715,8 @@ class MusicService:
 
             # ⏹️ Stop
             elif emoji == "⏹️":
-                player.stopped_manually = True
-                player.queue.clear()
+                # Cancela pré-carregamento, playlist e a faixa já entregue ao mixer
+                player.clear_queue()
                 if voice_client and voice_client.is_playing():
                     voice_client.stop()
                 await self.update_control_panel(player)
@@ -1317,7 +1760,7 @@ class MusicService:
             # 🧹 SEMPRE tentar remover a reação do usuário (independente de sucesso/erro)
             if action_processed:
                 try:
-                    await reaction.remove(user)
+                    await message_scheduler.remove_reaction(reaction, user)
                     self.logger.debug(
                         f"🧹 Reação {emoji} removida do usuário {user.name}"
                     )
@@ -1333,24 +1776,34 @@ class MusicService:
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """
-        Retorna estatísticas do cache LRU
+        Retorna estatísticas do cache de vídeos
 
         Returns:
-            Dicionário com estatísticas do cache
+            Dicionário com estatísticas do cache (hits, misses, coalescidas, disco)
+            do pool de extração ("scheduler"), da renovação de streams ("stream_refresh")
+            e do cache de áudio local ("audio_cache", None se desativado)
         """
-        total_requests = self._cache_hits + self._cache_misses
-        hit_rate = (
-            (self._cache_hits / total_requests * 100) if total_requests > 0 else 0
-        )
-
-        return {
-            "size": len(self._video_info_cache),
-            "max_size": self._cache_max_size,
-            "hits": self._cache_hits,
-            "misses": self._cache_misses,
-            "total_requests": total_requests,
-            "hit_rate": hit_rate,
-        }
+        stats = self.metadata_resolver.get_stats()
+        stats["scheduler"] = extraction_scheduler.get_stats()
+        stats["stream_refresh"] = self.stream_refresher.get_stats()
+        stats["panels"] = self.panel_scheduler.get_stats()
+        stats["panels"]["skipped"] = self.panel_edits_skipped
+        stats["audio_cache"] = self.audio_cache.get_stats() if self.audio_cache else None
+        return stats
+
+    def close_cache(self):
+        """Para as tasks de fundo e fecha os caches persistentes (chamar no shutdown do bot)"""
+        self.stream_refresher.stop()
+        self.panel_scheduler.stop()
+        self.metadata_resolver.close()
+        if self.audio_cache:
+            self.audio_cache.close()
+
+    @staticmethod
+    def _guild_id_of(member: Optional[discord.Member]) -> Optional[int]:
+        """Retorna o ID do servidor de um membro (None se indisponível)"""
+        guild = getattr(member, "guild", None)
+        return guild.id if guild else None
 
     def _extract_video_id(self, url: str) -> Optional[str]:
         """
@@ -1362,20 +1815,74 @@ class MusicService:
         Returns:
             ID do vídeo ou None
         """
-        import re
+        return extract_video_id(url)
+
+    @staticmethod
+    def _hedge_width() -> int:
+        """Estratégias simultâneas que cabem no teto de quota de um hedge"""
+        from utils.quota_tracker import QuotaTracker
+
+        search_cost = QuotaTracker.OPERATION_COSTS["search"]
+        return max(1, min(4, config.AUTOPLAY_HEDGE_QUOTA // search_cost))
+
+    async def _hedged_related_videos(
+        self, youtube_service, first_strategy: int, **kwargs
+    ) -> Tuple[Optional[int], List[Dict[str, Any]]]:
+        """
+        Busca relacionados com várias estratégias (hedge da query da IA)
+
+        Só a geração da query pela IA (sem quota) das estratégias seguintes
+        começa em paralelo com a estratégia atual. As buscas rodam em série:
+        a próxima estratégia só busca (já com a query pronta) se a anterior
+        não trouxe candidatos aprovados, até o teto AUTOPLAY_HEDGE_QUOTA.
+
+        Args:
+            youtube_service: YouTubeService
+            first_strategy: Estratégia atual do player (prioridade)
+            **kwargs: Demais argumentos de get_related_videos
+
+        Returns:
+            (estratégia vencedora, vídeos) ou (None, []) se nenhuma trouxe vídeos
+        """
+        from services.ai_service import ai_service
 
-        # Padrões comuns de URLs do YouTube
-        patterns = [
-            r"(?:youtube\.com\/watch\?v=|youtu\.be\/)([^&\n?#]+)",
-            r"youtube\.com\/embed\/([^&\n?#]+)",
+        strategies = [
+            (first_strategy + offset) % 4 for offset in range(self._hedge_width())
         ]
+        queries = {
+            strategy: asyncio.create_task(
+                ai_service.generate_autoplay_query(
+                    current_title=kwargs.get("video_title") or "",
+                    current_channel=kwargs.get("video_channel") or "",
+                    history=kwargs.get("history_titles") or [],
+                    strategy=strategy,
+                )
+            )
+            for strategy in strategies[1:]
+        }
+        self.logger.info(f"🏁 Autoplay em hedge: estratégias {strategies} (queries em paralelo)")
 
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
+        try:
+            for strategy in strategies:
+                analysis = None
+                if strategy in queries:
+                    try:
+                        analysis = await queries[strategy]
+                    except Exception as e:
+                        # get_related_videos gera a query de novo
+                        self.logger.debug(f"Hedge: query da estratégia {strategy} falhou: {e}")
 
-        return None
+                videos = await youtube_service.get_related_videos(
+                    search_strategy=strategy, analysis=analysis, **kwargs
+                )
+                if videos:
+                    self.logger.info(f"🏁 Hedge: estratégia {strategy} trouxe vídeos")
+                    return strategy, videos
+                self.logger.info(f"🏁 Hedge: estratégia {strategy} sem vídeos")
+            return None, []
+        finally:
+            for task in queries.values():
+                task.cancel()
 
     async def _fetch_autoplay_songs(
         self,
@@ -1385,6 +1892,7 @@ class MusicService:
         reference_video_id: str = None,
         reference_title: str = None,
         reference_channel: str = None,
+        reference_from_autoplay: Optional[bool] = None,
     ):
         """
         Busca e adiciona músicas relacionadas automaticamente
@@ -1396,6 +1904,8 @@ class MusicService:
             reference_video_id: ID do vídeo de referência (override last_video_id)
             reference_title: Título de referência (override last_video_title)
             reference_channel: Canal de referência (override last_video_channel)
+            reference_from_autoplay: Se a referência veio do autoplay
+                (override last_video_from_autoplay)
         """
         # Verificar lock ANTES de tentar adquirir (não bloqueia)
         if player.autoplay_lock.locked():
@@ -1427,6 +1937,11 @@ class MusicService:
             video_id = reference_video_id or player.last_video_id
             video_title = reference_title or player.last_video_title
             video_channel = reference_channel or player.last_video_channel
+            from_autoplay = (
+                player.last_video_from_autoplay
+                if reference_from_autoplay is None
+                else reference_from_autoplay
+            )
 
             if not video_id:
                 self.logger.warning("⚠️ Autoplay: Nenhum vídeo de referência disponível")
@@ -1457,16 +1972,60 @@ class MusicService:
             # Não podemos extrair títulos, apenas passar IDs
             history_titles = []  # Deixar vazio por enquanto
 
-            # Buscar vídeos relacionados excluindo histórico
-            related_videos = await youtube_service.get_related_videos(
-                video_id=video_id,
-                max_results=config.AUTOPLAY_QUEUE_SIZE,
-                exclude_ids=list(player.autoplay_history),
-                video_title=video_title,
-                video_channel=video_channel,
-                search_strategy=player.current_search_strategy,
-                history_titles=history_titles,  # Passar histórico para IA
+            # 🎯 Candidatos já aprovados de uma busca anterior: sem quota nem IA
+            # (referência nova pedida por usuário descarta o pool)
+            related_videos = player.take_autoplay_candidates(
+                config.AUTOPLAY_QUEUE_SIZE, video_id, from_autoplay
             )
+            if related_videos:
+                player.autoplay_pool_hits += 1
+                self.logger.info(
+                    f"🎯 Autoplay: {len(related_videos)} candidato(s) do pool "
+                    f"({len(player.autoplay_pool)} restante(s)), sem nova busca"
+                )
+            else:
+                # Buscar vídeos relacionados excluindo histórico
+                player.autoplay_searches += 1
+                related_kwargs: Dict[str, Any] = dict(
+                    video_id=video_id,
+                    max_results=config.AUTOPLAY_QUEUE_SIZE,
+                    exclude_ids=list(player.autoplay_history),
+                    video_title=video_title,
+                    video_channel=video_channel,
+                    history_titles=history_titles,  # Passar histórico para IA
+                    pool_size=config.AUTOPLAY_POOL_SIZE,
+                )
+                if config.AUTOPLAY_HEDGE_ENABLED:
+                    # 🏁 Queries das estratégias seguintes já começam em paralelo
+                    hedge_width = self._hedge_width()
+                    strategy, related_videos = await self._hedged_related_videos(
+                        youtube_service, player.current_search_strategy, **related_kwargs
+                    )
+                    if strategy is not None:
+                        player.current_search_strategy = strategy
+                    elif hedge_width < 4:
+                        # Fallback em série: primeira estratégia fora do hedge
+                        player.current_search_strategy = (
+                            player.current_search_strategy + hedge_width
+                        ) % 4
+                        self.logger.info(
+                            f"🔄 Hedge sem resultados, tentando estratégia {player.current_search_strategy}"
+                        )
+                        related_videos = await youtube_service.get_related_videos(
+                            search_strategy=player.current_search_strategy,
+                            **related_kwargs,
+                        )
+                else:
+                    related_videos = await youtube_service.get_related_videos(
+                        search_strategy=player.current_search_strategy,
+                        **related_kwargs,
+                    )
+
+                # Aprovados além do necessário ficam para as próximas sessões
+                player.store_autoplay_candidates(
+                    related_videos[config.AUTOPLAY_QUEUE_SIZE :], video_id
+                )
+                related_videos = related_videos[: config.AUTOPLAY_QUEUE_SIZE]
 
             if not related_videos:
                 # DETECÇÃO DE LOOP: Incrementar falhas e mudar estratégia
@@ -1501,6 +2060,7 @@ class MusicService:
                         reference_video_id,
                         reference_title,
                         reference_channel,
+                        reference_from_autoplay,
                     )
                     return
 
@@ -1531,47 +2091,28 @@ class MusicService:
             added_songs = []
 
             # 🚀 OTIMIZAÇÃO: Processar vídeos em paralelo
-            ytdl_options = config.get_ytdl_options()  # Cache options
+            ytdl_options = config.get_ytdl_stream_options()  # Cache options
             ydl = yt_dlp.YoutubeDL(ytdl_options)  # Reutilizar instância
 
             async def process_video(video):
                 """Processa um vídeo do autoplay"""
                 try:
-                    # Capturar URL no escopo correto
-                    video_url = video["url"]
-                    video_id = self._extract_video_id(video_url)
-
-                    # 🚀 Verificar cache primeiro (LRU)
-                    if video_id and video_id in self._video_info_cache:
-                        # Move para o final (marca como recentemente usado)
-                        info = self._video_info_cache.pop(video_id)
-                        self._video_info_cache[video_id] = info
-                        self._cache_hits += 1
-                        self.logger.debug(f"✅ Cache hit para: {video_id}")
-                    else:
-                        self._cache_misses += 1
-                        info = await asyncio.get_event_loop().run_in_executor(
-                            None,
-                            lambda url=video_url: ydl.extract_info(url, download=False),
-                        )
-
-                        # Adicionar ao cache (LRU - remove mais antigo)
-                        if video_id and info:
-                            if len(self._video_info_cache) >= self._cache_max_size:
-                                # Remove primeiro item (mais antigo)
-                                self._video_info_cache.popitem(last=False)
-                            self._video_info_cache[video_id] = info
-                            self.logger.debug(f"💾 Cached: {video_id}")
+                    # 🚀 Cache (LRU + disco) ou extração
+                    record = await self._resolve(
+                        video["url"],
+                        ExtractionPriority.AUTOPLAY,
+                        guild_id=player.guild_id,
+                        ytdl=ydl,
+                    )
 
-                    if info:
+                    if record:
                         song = Song(
                             {
+                                **record,
                                 "url": video["url"],
-                                "title": info.get("title", video["title"]),
-                                "duration": info.get("duration", 0),
-                                "thumbnail": info.get("thumbnail", video["thumbnail"]),
-                                "uploader": info.get("uploader", video["channel"]),
-                                "stream_url": info.get("url", ""),
+                                "title": record.get("title") or video["title"],
+                                "thumbnail": record.get("thumbnail") or video["thumbnail"],
+                                "uploader": record.get("uploader") or video["channel"],
                             },
                             requester,
                         )
@@ -1604,8 +2145,10 @@ class MusicService:
             results = await asyncio.gather(*tasks, return_exceptions=True)
 
             # Adicionar músicas processadas à fila
+            notifications = []
             for song in results:
                 if song and isinstance(song, Song):
+                    song.from_autoplay = True
                     player.add_song(song)
                     added_songs.append(song)
                     self.logger.debug(
@@ -1618,14 +2161,19 @@ class MusicService:
                         queue_position=len(player.queue)
                     )
 
-                    # � OTIMIZAÇÃO: Enviar mensagem em background (não bloqueia)
-                    if not proactive and player.text_channel:
-                        position = len(player.queue)
-                        asyncio.create_task(
-                            self._send_autoplay_notification(
-                                player.text_channel, song, position
-                            )
-                        )
+                    notifications.append((song, len(player.queue)))
+
+            # 📨 Uma notificação por sessão: com painel, a fila do painel (já
+            # marcada para re-renderizar pelo add_song) mostra as adições
+            if (
+                notifications
+                and not proactive
+                and player.text_channel
+                and not player.control_panel_message
+            ):
+                asyncio.create_task(
+                    self._send_autoplay_notification(player.text_channel, notifications)
+                )
 
             if added_songs:
                 mode_text = "proativo" if proactive else "reativo"
@@ -1646,7 +2194,7 @@ class MusicService:
                     self.logger.info(
                         f"▶️ Autoplay reativo: Iniciando primeira música da fila (Total: {len(player.queue)})"
                     )
-                    next_song = player.queue.popleft()
+                    next_song = player.next_from_queue()
                     await self.play_song(player, voice_client, next_song)
                 elif proactive:
                     self.logger.debug(
@@ -1711,6 +2259,7 @@ class MusicService:
                             self.logger.debug(f"Erro ao desconectar voice client: {e}")
 
                     del self.players[guild_id]
+                    self.panel_scheduler.forget(guild_id)
                     self.logger.info(
                         f"🧹 Player removido por inatividade: guild_id={guild_id}"
                     )
@@ -0,0 +1,194 @@
+"""
+Panel Scheduler - Atualização central dos painéis de controle
+Uma única task para todos os servidores: o painel só é re-renderizado
+quando o estado muda (música, pausa, volume, fila) e, enquanto toca, em um
+tick de progresso grosso. Edições respeitam os limites de taxa do Discord
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from core.logger import LoggerFactory
+from services.message_scheduler import TokenBucket
+
+logger = LoggerFactory.create_logger(__name__)
+
+
+class PanelScheduler:
+    """
+    Agenda a renderização dos painéis de controle de todos os servidores
+
+    - mark_dirty(guild_id) a cada mudança de estado; várias mudanças dentro
+      de `debounce` segundos viram uma única edição
+    - Tick de progresso a cada `progress_interval` segundos, só para os
+      servidores tocando (barra de progresso)
+    - Bucket por servidor (o painel fica em um canal: edições de mensagem
+      no Discord são limitadas por canal, 5 a cada 5s) e bucket global de
+      `edits_per_second`; quem não tem token fica para a próxima rodada
+    """
+
+    # Limite de edição de mensagens do Discord por canal
+    CHANNEL_BURST = 5
+    CHANNEL_WINDOW = 5.0
+
+    def __init__(
+        self,
+        render: Callable[[int], Awaitable[Any]],
+        get_active: Callable[[], Iterable[int]],
+        debounce: float,
+        progress_interval: float,
+        edits_per_second: float,
+    ):
+        """
+        Args:
+            render: Corrotina (guild_id) que edita/cria o painel do servidor
+            get_active: Retorna os servidores tocando (recebem o tick de progresso)
+            debounce: Janela para agrupar mudanças em uma edição (s)
+            progress_interval: Intervalo do tick de progresso (s, 0 = desativado)
+            edits_per_second: Limite global de edições de painel por segundo
+        """
+        self._render = render
+        self._get_active = get_active
+        self.debounce = debounce
+        self.progress_interval = progress_interval
+        self._global = TokenBucket(max(1.0, edits_per_second), max(0.1, edits_per_second))
+        self._channels: Dict[int, TokenBucket] = {}
+
+        self._dirty: Dict[int, float] = {}  # guild_id -> instante para renderizar
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        # 📊 Métricas
+        self.requested = 0
+        self.coalesced = 0  # Mudanças agrupadas em uma edição já pendente
+        self.renders = 0
+        self.ticks = 0
+        self.throttled = 0
+        self.failed = 0
+
+    def start(self):
+        """Inicia a task do agendador (idempotente)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        """Para o agendador (chamar no shutdown do bot)"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def mark_dirty(self, guild_id: int, delay: Optional[float] = None):
+        """
+        Marca o painel de um servidor para re-renderizar
+
+        Chamadas repetidas antes da renderização não adiam o prazo (a edição
+        sai no máximo `debounce` segundos depois da primeira mudança).
+
+        Args:
+            guild_id: ID do servidor
+            delay: Espera antes de renderizar (None = debounce)
+        """
+        self.requested += 1
+        due = time.monotonic() + (self.debounce if delay is None else delay)
+        if guild_id in self._dirty:
+            self.coalesced += 1
+            if self._dirty[guild_id] <= due:
+                return
+
+        self._dirty[guild_id] = due
+        self._wakeup.set()
+
+    def forget(self, guild_id: int):
+        """Descarta estado de um servidor removido"""
+        self._dirty.pop(guild_id, None)
+        self._channels.pop(guild_id, None)
+
+    async def _run(self):
+        """Loop do agendador"""
+        next_tick = time.monotonic() + self.progress_interval
+        while True:
+            now = time.monotonic()
+
+            # ⏱️ Tick de progresso: só servidores tocando, sem adiar mudanças pendentes
+            if self.progress_interval and now >= next_tick:
+                self.ticks += 1
+                for guild_id in self._get_active():
+                    self._dirty.setdefault(guild_id, now)
+                next_tick = now + self.progress_interval
+
+            try:
+                await self._render_due(now)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Erro no agendador de painéis: {e}")
+
+            # Dormir até o próximo prazo, o próximo tick ou uma nova mudança
+            deadlines = list(self._dirty.values())
+            if self.progress_interval:
+                deadlines.append(next_tick)
+            timeout = max(0.05, min(deadlines) - time.monotonic()) if deadlines else None
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _render_due(self, now: float):
+        """Renderiza os painéis vencidos que têm token (por canal e global)"""
+        batch = []
+        for guild_id, due in sorted(self._dirty.items(), key=lambda item: item[1]):
+            if due > now:
+                break
+
+            channel = self._channels.setdefault(
+                guild_id,
+                TokenBucket(self.CHANNEL_BURST, self.CHANNEL_BURST / self.CHANNEL_WINDOW),
+            )
+            wait = channel.delay(now)
+            if wait > 0:
+                # Canal no limite: adiar só este servidor
+                self.throttled += 1
+                self._dirty[guild_id] = now + wait
+                continue
+
+            if not self._global.take(now):
+                # Limite global: o restante espera a próxima rodada
+                self.throttled += 1
+                break
+
+            channel.take(now)
+            del self._dirty[guild_id]
+            batch.append(guild_id)
+
+        if not batch:
+            return
+
+        results = await asyncio.gather(
+            *(self._render(guild_id) for guild_id in batch), return_exceptions=True
+        )
+        for guild_id, result in zip(batch, results):
+            if isinstance(result, Exception):
+                self.failed += 1
+                logger.debug(f"Erro ao renderizar painel de {guild_id}: {result}")
+            else:
+                self.renders += 1
+
+        # Buckets cheios não guardam informação
+        for guild_id in [g for g, b in self._channels.items() if b.full and g not in self._dirty]:
+            del self._channels[guild_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas do agendador"""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "pending": len(self._dirty),
+            "requested": self.requested,
+            "renders": self.renders,
+            "coalesced": self.coalesced,
+            "ticks": self.ticks,
+            "throttled": self.throttled,
+            "failed": self.failed,
+        }
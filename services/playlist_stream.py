@@ -0,0 +1,230 @@
+"""
+Playlist Stream - Ingestão de playlists em pipeline
+Resolve os itens com uma janela deslizante de concorrência adaptativa e
+entrega as músicas em ordem, à medida que ficam prontas
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from core.logger import LoggerFactory
+
+logger = LoggerFactory.create_logger(__name__)
+
+# Erros de conteúdo (vídeo bloqueado/indisponível): não indicam sobrecarga
+CONTENT_ERROR_MARKERS = ("copyright", "blocked", "unavailable", "private", "age")
+
+
+class AdaptiveConcurrency:
+    """
+    Limite de concorrência AIMD (aumento aditivo, redução multiplicativa)
+
+    - Sucesso com latência normal: limite += 1/limite (~+1 a cada janela)
+    - Falha de rede ou latência > 2x a média: limite pela metade
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 8):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self._latency_ewma: Optional[float] = None
+
+        # 📊 Métricas
+        self.increases = 0
+        self.decreases = 0
+        self.peak = self.window
+
+    @property
+    def window(self) -> int:
+        """Número de itens que podem ser resolvidos ao mesmo tempo"""
+        return max(self.minimum, int(self.limit))
+
+    def record(self, latency: float, success: bool):
+        """
+        Ajusta o limite com base em uma extração concluída
+
+        Args:
+            latency: Tempo da extração em segundos
+            success: False se falhou por rede/timeout (erro de conteúdo conta como sucesso)
+        """
+        if self._latency_ewma is None:
+            self._latency_ewma = latency
+
+        congested = not success or latency > self._latency_ewma * 2
+        self._latency_ewma = 0.8 * self._latency_ewma + 0.2 * latency
+
+        if congested:
+            self.limit = max(float(self.minimum), self.limit / 2)
+            self.decreases += 1
+        else:
+            self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+            self.increases += 1
+
+        self.peak = max(self.peak, self.window)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna o estado atual do limitador"""
+        return {
+            "window": self.window,
+            "peak": self.peak,
+            "avg_latency_s": self._latency_ewma or 0.0,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+class PlaylistStream:
+    """
+    Playlist sendo resolvida em pipeline
+
+    Uso:
+        stream = await music_service.open_playlist(url, requester, player)
+        async for song in stream:
+            ...  # Músicas chegam na ordem da playlist
+
+    Enquanto um item lento é resolvido, os seguintes continuam sendo
+    extraídos (janela deslizante); só a entrega respeita a ordem.
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[Optional[Dict[str, Any]]],
+        resolve_entry: Callable[[int, Dict[str, Any]], Awaitable[Any]],
+        concurrency: AdaptiveConcurrency,
+        playlist_title: str = "Playlist",
+        total: Optional[int] = None,
+        is_playlist: bool = True,
+        should_cancel: Optional[Callable[[], bool]] = None,
+    ):
+        self.entries = entries
+        self.playlist_title = playlist_title
+        self.total = total if total is not None else len(entries)
+        self.is_playlist = is_playlist
+        self.concurrency = concurrency
+
+        self._resolve_entry = resolve_entry
+        self._should_cancel = should_cancel or (lambda: False)
+
+        # Progresso (atualizado durante a iteração)
+        self.position = 0  # Itens já entregues ou descartados (em ordem)
+        self.added = 0
+        self.errors: List[str] = []
+        self.cancelled = False
+
+    @staticmethod
+    def _describe_error(idx: int, error: BaseException) -> str:
+        """Mensagem curta de erro de um item da playlist"""
+        error_msg = str(error)
+        lowered = error_msg.lower()
+        if "copyright" in lowered or "blocked" in lowered:
+            return f"Item {idx}: Bloqueado por direitos autorais"
+        if "unavailable" in lowered:
+            return f"Item {idx}: Vídeo indisponível"
+        return f"Item {idx}: {error_msg[:50]}"
+
+    async def _run_entry(self, idx: int, entry: Optional[Dict[str, Any]]):
+        """Resolve um item, medindo latência para o controle de concorrência"""
+        if entry is None:
+            raise ValueError("Vídeo indisponível")
+
+        start = time.perf_counter()
+        try:
+            result = await self._resolve_entry(idx, entry)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            content_error = any(m in str(e).lower() for m in CONTENT_ERROR_MARKERS)
+            self.concurrency.record(time.perf_counter() - start, success=content_error)
+            raise
+
+        self.concurrency.record(time.perf_counter() - start, success=True)
+        return result
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        """Janela deslizante: mantém até `window` itens em extração"""
+        total = len(self.entries)
+        in_progress: Dict[int, asyncio.Task] = {}
+        finished: Dict[int, asyncio.Task] = {}
+        next_to_start = 0
+
+        try:
+            while self.position < total:
+                if self._should_cancel():
+                    self.cancelled = True
+                    logger.info(
+                        f"🛑 Processamento cancelado após {self.position}/{total} itens"
+                    )
+                    return
+
+                # Completar a janela (limitando o quanto se adianta da entrega)
+                max_ahead = self.concurrency.maximum * 2
+                while (
+                    next_to_start < total
+                    and len(in_progress) < self.concurrency.window
+                    and next_to_start - self.position < max_ahead
+                ):
+                    idx = next_to_start
+                    in_progress[idx] = asyncio.create_task(
+                        self._run_entry(idx + 1, self.entries[idx])
+                    )
+                    next_to_start += 1
+
+                # Próximo item na ordem ainda não terminou: esperar qualquer um
+                if self.position not in finished:
+                    done, _ = await asyncio.wait(
+                        in_progress.values(), return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for idx, task in list(in_progress.items()):
+                        if task in done:
+                            finished[idx] = in_progress.pop(idx)
+                    continue
+
+                task = finished.pop(self.position)
+                self.position += 1
+
+                if task.cancelled():
+                    self.errors.append(f"Item {self.position}: Extração cancelada")
+                    continue
+
+                exception = task.exception()
+                if exception is not None:
+                    error = self._describe_error(self.position, exception)
+                    self.errors.append(error)
+                    logger.warning(f"❌ {error}")
+                    continue
+
+                self.added += 1
+                yield task.result()
+
+        finally:
+            # Consumidor parou (ou cancelou): não deixar extrações órfãs
+            for task in in_progress.values():
+                task.cancel()
+            for task in finished.values():
+                if not task.cancelled():
+                    task.exception()
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Resumo no formato retornado por MusicService.extract_playlist
+
+        Returns:
+            Dicionário com totais, falhas, erros e cancelamento
+        """
+        fetched_items = len(self.entries)
+        return {
+            "is_playlist": self.is_playlist,
+            "playlist_title": self.playlist_title,
+            "total": self.total,
+            "processed": fetched_items,
+            "not_processed": max(0, self.total - fetched_items),
+            "added": self.added,
+            "failed": len(self.errors),
+            "errors": self.errors[:10],  # Limitar a 10 erros para não flodar
+            "cancelled": self.cancelled,
+            "concurrency": self.concurrency.get_stats(),
+        }
@@ -0,0 +1,160 @@
+"""
+Stream Refresher - Renovação antecipada de stream URLs
+Acompanha a expiração das músicas na fila de todos os servidores e renova
+as URLs em lotes, em background, antes que expirem (evita re-extração no
+caminho crítico do play_song)
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.logger import LoggerFactory
+from services.metadata_resolver import cache_key
+
+logger = LoggerFactory.create_logger(__name__)
+
+# Renova a stream_url de uma música (retorna o registro novo ou None)
+Refresher = Callable[[Any, Optional[int]], Awaitable[Optional[Dict[str, Any]]]]
+
+# Músicas de um mesmo vídeo na fila: [(song, guild_id), ...]
+SongGroup = List[Tuple[Any, Optional[int]]]
+
+
+class StreamRefresher:
+    """
+    Renova em background as stream URLs das músicas na fila
+
+    - A cada `interval` segundos, procura músicas resolvidas cuja URL expira
+      em menos de `margin` segundos (expiração real, lida do expire= da URL)
+    - O mesmo vídeo em vários servidores é renovado uma única vez
+    - Renovações em lotes de `batch_size` (as mais próximas de expirar primeiro),
+      com prioridade STREAM_REFRESH no ExtractionScheduler
+    """
+
+    def __init__(
+        self,
+        get_players: Callable[[], Iterable[Any]],
+        refresh: Refresher,
+        interval: float,
+        margin: float,
+        batch_size: int,
+    ):
+        """
+        Args:
+            get_players: Retorna os players ativos (com .queue e .guild_id)
+            refresh: Corrotina (song, guild_id) que re-extrai a música
+            interval: Intervalo entre varreduras (s)
+            margin: Antecedência mínima para renovar antes de expirar (s)
+            batch_size: Renovações simultâneas por lote
+        """
+        self._get_players = get_players
+        self._refresh = refresh
+        self.interval = interval
+        self.margin = margin
+        self.batch_size = max(1, batch_size)
+        self._task: Optional[asyncio.Task] = None
+
+        # 📊 Métricas
+        self.scans = 0
+        self.refreshed = 0
+        self.failed = 0
+        self.last_due = 0
+
+    def start(self):
+        """Inicia a varredura periódica (idempotente)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        """Para a varredura (chamar no shutdown do bot)"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    async def _run(self):
+        """Loop de varredura"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Erro na renovação de streams: {e}")
+
+    def _collect_due(self) -> List[SongGroup]:
+        """
+        Agrupa por vídeo as músicas na fila que expiram dentro da margem
+
+        Returns:
+            Grupos ordenados pela expiração mais próxima
+        """
+        deadline = time.time() + self.margin
+        groups: Dict[str, SongGroup] = {}
+
+        for player in list(self._get_players()):
+            for song in list(player.queue):
+                # Preguiçosas ainda não têm URL (pré-carregamento/play resolvem)
+                if not song.is_resolved or song.stream_url_expires > deadline:
+                    continue
+                groups.setdefault(cache_key(song.url), []).append(
+                    (song, player.guild_id)
+                )
+
+        return sorted(
+            groups.values(),
+            key=lambda group: min(song.stream_url_expires for song, _ in group),
+        )
+
+    async def _refresh_group(self, group: SongGroup):
+        """Renova um vídeo e aplica a URL nova em todas as músicas dele"""
+        song, guild_id = group[0]
+        try:
+            record = await self._refresh(song, guild_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"⚠️ Falha ao renovar stream de {song.title}: {e}")
+            return
+
+        if not record or not record.get("stream_url"):
+            self.failed += 1
+            return
+
+        for queued, _ in group:
+            queued.apply_record(record)
+        self.refreshed += 1
+
+    async def refresh_due(self) -> int:
+        """
+        Renova agora todas as músicas que expiram dentro da margem
+
+        Returns:
+            Número de vídeos cuja renovação foi tentada
+        """
+        self.scans += 1
+        groups = self._collect_due()
+        self.last_due = len(groups)
+        if not groups:
+            return 0
+
+        logger.info(f"🔄 Renovando {len(groups)} stream URL(s) prestes a expirar")
+        for start in range(0, len(groups), self.batch_size):
+            batch = groups[start : start + self.batch_size]
+            await asyncio.gather(*(self._refresh_group(group) for group in batch))
+
+        return len(groups)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas de renovação"""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_s": self.interval,
+            "margin_s": self.margin,
+            "scans": self.scans,
+            "last_due": self.last_due,
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+        }
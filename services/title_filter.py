@@ -0,0 +1,253 @@
+"""
+Title Filter - Filtros de títulos/canais compilados uma única vez
+As listas de palavras do autoplay viram uma regex por regra (palavras
+fatoradas em trie), testadas na ordem do autoplay; o filtro informa qual
+regra e qual trecho bateram
+"""
+
+import re
+from typing import Collection, Dict, FrozenSet, Iterable, Optional, Pattern, Set, Tuple
+
+# Palavras que indicam que NÃO é uma música (conteúdo indesejado)
+EXCLUDED_KEYWORDS = (
+    # Entrevistas e talks
+    "podcast", "interview", "entrevista", "bate-papo", "conversa", "papo",
+    # Reações e análises
+    "react", "reação", "reagindo", "reagiu", "reaction", "análise", "analisa",
+    "analisando", "review",
+    # Gaming
+    "gameplay", "jogando", "playing",
+    # Tutoriais e explicações
+    "tutorial", "como fazer", "aprenda", "aula", "explicação", "explicando",
+    "explica", "ensina", "dica", "dicas",
+    # Documentários e histórias
+    "história", "historia", "story", "história de", "origem", "de onde vem",
+    "quem é", "conhecendo", "conhece", "documentário", "documentary",
+    # Bastidores e making of
+    "making of", "bastidores", "behind the scenes", "gravação", "gravando",
+    "estúdio", "studio",
+    # Vlogs e daily content
+    "vlog", "diary", "dia a dia", "rotina",
+    # Desafios
+    "challenge", "desafio",
+    # Descobertas
+    "first time", "primeira vez", "descobriu", "descobrindo", "descobri",
+    "conheci", "meets",
+    # Playlists e compilações
+    "playlist", "compilation", "compilação", "os melhores", "as melhores",
+    "best of", "top 10", "top 20", "top 50", "coletânea", "mix", "mashup",
+    "medley", "1 hora", "2 horas", "3 horas", "hour", "hours",
+    # Shorts e redes sociais
+    "shorts", "tiktok", "melhores momentos",
+    # Transmissões
+    "lives", "ao vivo", "full stream", "stream", "transmissão",
+)
+
+# Palavras que indicam versões alternativas (evitadas para diversidade)
+# Nota: "acústico" não está aqui pois pode ser o estilo original da música
+ALTERNATIVE_VERSION_KEYWORDS = (
+    "cover", "remix", "versão", "version", "letra", "lyrics", "lyric video",
+    "instrumental", "karaoke", "piano version", "guitar version",
+    "violão version", "live", "ao vivo", "unplugged", "slowed", "reverb",
+    "sped up", "nightcore", "8d audio",
+)
+
+# Padrões de títulos que indicam conteúdo explicativo
+EXPLANATORY_PATTERNS = (
+    r"^(?:de onde|donde|where does|where is|who is|what is|quem é|o que é|qual é)",
+    r"^(?:como |how to |how )",
+    r"^(?:por que|porque|why )",
+    r"^(?:conheça|conhece|meet |discover )",
+    r"\?$",  # Títulos que terminam com ?
+)
+
+# Palavras suspeitas em nomes de canais (canais de conteúdo não-musical)
+SUSPICIOUS_CHANNEL_KEYWORDS = (
+    "documentary", "documentário", "docs", "história", "historia", "explica",
+    "explains", "educação", "education", "tutorial", "aprenda", "learn",
+    "podcast", "cast",
+)
+
+# Palavras muito comuns que não ajudam a comparar títulos
+STOPWORDS: FrozenSet[str] = frozenset(
+    {
+        "música", "music", "official", "video", "audio", "clipe", "com", "the",
+        "de", "da", "do", "em", "para",
+    }
+)
+
+# Regex que nunca casa (regra sem palavras)
+NEVER_MATCH = "(?!)"
+
+CHANNEL_RULE = "channel"
+
+# Regras de conteúdo não-musical (sem "alternative": covers/lives pedidos
+# pelo usuário são válidos)
+NON_MUSIC_RULES: FrozenSet[str] = frozenset({"explanatory", "excluded", CHANNEL_RULE})
+
+
+def keyword_pattern(keywords: Iterable[str]) -> str:
+    """
+    Monta uma regex de "contém alguma das palavras" fatorada em trie
+
+    Prefixos comuns são compartilhados ("reag" -> "reagindo|reagiu"), então
+    o motor de regex não testa cada palavra separadamente em cada posição.
+    Palavras que contêm outra como prefixo são absorvidas por ela ("hour"
+    já cobre "hours"): a semântica é de substring, como `kw in title`.
+
+    Args:
+        keywords: Palavras/trechos (comparação literal)
+
+    Returns:
+        Regex (sem grupos de captura)
+    """
+    keywords = list(keywords)
+    if not keywords:
+        return NEVER_MATCH
+
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}  # Fim de palavra
+
+    def build(node: Dict[str, dict]) -> str:
+        if "" in node:
+            return ""  # Prefixo já é uma palavra completa: basta ele
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items())]
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return build(trie)
+
+
+class TitleFilter:
+    """
+    Filtro de títulos/canais compilado
+
+    `check()` retorna a primeira regra que bateu (regra, trecho) ou None.
+    """
+
+    def __init__(
+        self,
+        explanatory: Iterable[str] = EXPLANATORY_PATTERNS,
+        excluded: Iterable[str] = EXCLUDED_KEYWORDS,
+        alternative: Iterable[str] = ALTERNATIVE_VERSION_KEYWORDS,
+        channel: Iterable[str] = SUSPICIOUS_CHANNEL_KEYWORDS,
+        stopwords: FrozenSet[str] = STOPWORDS,
+    ):
+        """
+        Args:
+            explanatory: Regex de títulos explicativos
+            excluded: Palavras de conteúdo não-musical
+            alternative: Palavras de versões alternativas
+            channel: Palavras suspeitas em nomes de canais
+            stopwords: Palavras ignoradas na comparação de títulos
+        """
+        # Padrões explicativos: os ancorados no início viram uma regex só
+        # (falha já na 1ª posição); os demais ficam separados, pois em uma
+        # alternação o motor tentaria o "^" em cada posição do título
+        explanatory = list(explanatory)
+        anchored = [pattern for pattern in explanatory if pattern.startswith("^")]
+        self._explanatory = tuple(
+            re.compile(pattern)
+            for pattern in (
+                ["|".join(f"(?:{pattern})" for pattern in anchored)] if anchored else []
+            )
+            + [pattern for pattern in explanatory if not pattern.startswith("^")]
+        )
+
+        # Uma trie por regra, testadas em ordem: uma trie única devolveria a
+        # palavra mais à esquerda ("live stream" viraria "alternative") e
+        # absorveria palavras de outra regra ("live" cobriria "lives")
+        self._keyword_patterns: Tuple[Tuple[str, Pattern[str]], ...] = (
+            ("excluded", re.compile(keyword_pattern(excluded))),
+            ("alternative", re.compile(keyword_pattern(alternative))),
+        )
+        self._channel_pattern = re.compile(keyword_pattern(channel))
+        self.stopwords = stopwords
+
+    def check_title(
+        self, title_lower: str, rules: Optional[Collection[str]] = None
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Verifica um título (já em minúsculas)
+
+        Args:
+            title_lower: Título em minúsculas
+            rules: Regras a verificar (None = todas)
+
+        Returns:
+            (regra, trecho) da primeira regra que bateu, ou None se passou
+        """
+        if rules is None or "explanatory" in rules:
+            for pattern in self._explanatory:
+                match = pattern.search(title_lower)
+                if match:
+                    return "explanatory", match.group() or pattern.pattern
+
+        for rule, keyword_regex in self._keyword_patterns:
+            if rules is not None and rule not in rules:
+                continue
+            match = keyword_regex.search(title_lower)
+            if match:
+                return rule, match.group()
+        return None
+
+    def check_channel(self, channel_lower: str) -> Optional[str]:
+        """
+        Verifica um nome de canal (já em minúsculas)
+
+        Returns:
+            Palavra suspeita encontrada, ou None
+        """
+        match = self._channel_pattern.search(channel_lower)
+        return match.group() if match else None
+
+    def check(
+        self,
+        title: str,
+        channel: str = "",
+        rules: Optional[Collection[str]] = None,
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Verifica título e canal, na ordem do autoplay (explicativo, canal,
+        não-música, versão alternativa)
+
+        Args:
+            title: Título do vídeo
+            channel: Nome do canal
+            rules: Regras a verificar (None = todas)
+
+        Returns:
+            (regra, trecho) ou None se o vídeo passou em todos os filtros
+        """
+        title_lower = title.lower()
+        if rules is None or "explanatory" in rules:
+            match = self.check_title(title_lower, ("explanatory",))
+            if match:
+                return match
+
+        if channel and (rules is None or CHANNEL_RULE in rules):
+            channel_match = self.check_channel(channel.lower())
+            if channel_match:
+                return CHANNEL_RULE, channel_match
+
+        keyword_rules = [rule for rule, _ in self._keyword_patterns]
+        if rules is not None:
+            keyword_rules = [rule for rule in keyword_rules if rule in rules]
+        return self.check_title(title_lower, keyword_rules) if keyword_rules else None
+
+    def significant_words(self, text_lower: str) -> Set[str]:
+        """Palavras com mais de 3 letras que não são stopwords"""
+        return {
+            word
+            for word in text_lower.split()
+            if len(word) > 3 and word not in self.stopwords
+        }
+
+
+# Instância global (compilada uma vez no import)
+title_filter = TitleFilter()
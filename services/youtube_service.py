@@ -4,10 +4,11 @@ Gerencia autenticação e busca de vídeos do YouTube
 """
 
 import asyncio
+import functools
 import os
 import re
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Collection, Tuple
 from abc import ABC, abstractmethod
 
 from google.oauth2.credentials import Credentials
@@ -19,6 +20,9 @@ from googleapiclient.errors import HttpError
 from core.logger import LoggerFactory, autoplay_logger
 from config import config
 from utils.quota_tracker import quota_tracker
+from utils.api_executor import api_executor
+from utils.search_cache import SearchCache
+from services.title_filter import title_filter
 
 # 🚀 Regex pré-compilados para melhor performance (+20x)
 CLEAN_TITLE_PATTERN = re.compile(
@@ -32,6 +36,15 @@ PLAYLIST_ID_PATTERN = re.compile(r"(?:youtube\.com/playlist\?list=)([a-zA-Z0-9_-
 DURATION_HOURS_PATTERN = re.compile(r"(\d+)H")
 DURATION_MINUTES_PATTERN = re.compile(r"(\d+)M")
 ISO8601_DURATION_PATTERN = re.compile(r"PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?")
+ARTIST_SPLIT_PATTERN = re.compile(r"[-–(|]")
+
+# Motivo exibido no log para cada regra do filtro de títulos
+FILTER_REASONS = {
+    "explanatory": "título explicativo",
+    "channel": "canal suspeito",
+    "excluded": "não é música",
+    "alternative": "versão alternativa",
+}
 
 # Import circular protection - will be imported later
 # from services.ai_service import ai_service
@@ -80,7 +93,10 @@ class YouTubeOAuth2Strategy(YouTubeAuthStrategy):
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
                 try:
-                    creds.refresh(Request())
+                    await api_executor.run(
+                        functools.partial(creds.refresh, Request()),
+                        label="oauth_refresh",
+                    )
                     self.logger.info("Token OAuth2 renovado")
                 except Exception as e:
                     self.logger.error(f"Erro ao renovar token: {e}")
@@ -188,7 +204,9 @@ class YouTubeOAuth2Strategy(YouTubeAuthStrategy):
             self.logger.info("Token OAuth2 salvo")
 
         self.credentials = creds
-        return build("youtube", "v3", credentials=creds)
+        return await api_executor.run(
+            lambda: build("youtube", "v3", credentials=creds), label="build"
+        )
 
 
 class YouTubeAPIKeyStrategy(YouTubeAuthStrategy):
@@ -208,7 +226,10 @@ class YouTubeAPIKeyStrategy(YouTubeAuthStrategy):
             raise ValueError("YOUTUBE_API_KEY não configurada")
 
         self.logger.info("Usando autenticação via API Key")
-        return build("youtube", "v3", developerKey=config.YOUTUBE_API_KEY)
+        return await api_executor.run(
+            lambda: build("youtube", "v3", developerKey=config.YOUTUBE_API_KEY),
+            label="build",
+        )
 
 
 class YouTubeService:
@@ -234,6 +255,17 @@ class YouTubeService:
         self.youtube = None
         self._auth_strategy: Optional[YouTubeAuthStrategy] = None
 
+        # 💾 Cache persistente de buscas (cada search().list custa 100 unidades)
+        self.search_cache: Optional[SearchCache] = (
+            SearchCache(
+                config.CACHE_DIR / "search.db",
+                config.SEARCH_CACHE_TTL,
+                config.SEARCH_CACHE_MAX_ENTRIES,
+            )
+            if config.CACHE_ENABLED and config.SEARCH_CACHE_TTL > 0
+            else None
+        )
+
     def set_auth_strategy(self, strategy: YouTubeAuthStrategy):
         """Define a estratégia de autenticação"""
         self._auth_strategy = strategy
@@ -254,8 +286,106 @@ class YouTubeService:
         self.youtube = await self._auth_strategy.authenticate()
         self.logger.info("YouTube Service inicializado")
 
+    async def _cached_search(
+        self, query: str, **params
+    ) -> Tuple[Optional[str], Optional[List[Dict[str, Any]]]]:
+        """
+        Consulta o cache de buscas (SQLite fora do event loop)
+
+        Args:
+            query: Termo de busca
+            **params: Demais parâmetros do search().list (maxResults, ...)
+
+        Returns:
+            (chave da busca ou None sem cache, itens em cache ou None)
+        """
+        if not self.search_cache:
+            return None, None
+
+        key = SearchCache.make_key(query, **params)
+        try:
+            items = await api_executor.run(
+                functools.partial(self.search_cache.get, key), label="search_cache"
+            )
+        except asyncio.TimeoutError:
+            return key, None
+
+        if items is not None:
+            self.logger.info(f"💾 Busca em cache (0 unidades): {query[:50]}")
+        return key, items
+
+    async def _api_search(
+        self, query: str, details: str, key: Optional[str], **params
+    ) -> List[Dict[str, Any]]:
+        """
+        Executa search().list na API e guarda o resultado no cache de buscas
+
+        A quota deve ter sido verificada antes (can_make_request("search")).
+
+        Args:
+            query: Termo de busca
+            details: Detalhes para o registro de quota
+            key: Chave de _cached_search (None = não salvar em cache)
+            **params: Demais parâmetros do search().list (maxResults, ...)
+
+        Returns:
+            Itens da resposta
+        """
+        # Registra uso antes da requisição
+        quota_tracker.track_operation("search", details)
+
+        request = self.youtube.search().list(
+            part="snippet", q=query, type="video", **params
+        )
+        # Executar fora do event loop (pool dedicado da API)
+        response = await api_executor.run(request.execute, label="search")
+
+        items: List[Dict[str, Any]] = response.get("items", [])
+        if key is not None and self.search_cache:
+            try:
+                await api_executor.run(
+                    functools.partial(self.search_cache.put, key, items),
+                    label="search_cache",
+                )
+            except asyncio.TimeoutError:
+                pass  # Só deixa de salvar em cache (já logado pelo executor)
+        return items
+
+    async def _search(
+        self, query: str, details: str, **params
+    ) -> Tuple[Optional[List[Dict[str, Any]]], bool]:
+        """
+        Executa search().list passando pelo cache de buscas
+
+        A quota só é consultada/contada quando a busca não está em cache.
+
+        Args:
+            query: Termo de busca
+            details: Detalhes para o registro de quota
+            **params: Demais parâmetros do search().list (maxResults, ...)
+
+        Returns:
+            (itens da resposta ou None se não há quota, veio do cache)
+        """
+        key, items = await self._cached_search(query, **params)
+        if items is not None:
+            return items, True
+
+        if not quota_tracker.can_make_request("search"):
+            return None, False
+
+        return await self._api_search(query, details, key, **params), False
+
+    def close_cache(self):
+        """Fecha o cache de buscas (chamar no shutdown do bot)"""
+        if self.search_cache:
+            self.search_cache.close()
+
     async def search_video(
-        self, query: str, max_results: int = 5
+        self,
+        query: str,
+        max_results: int = 5,
+        exclude_rules: Optional[Collection[str]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Busca vídeos no YouTube
@@ -263,6 +393,8 @@ class YouTubeService:
         Args:
             query: Termo de busca
             max_results: Número máximo de resultados
+            exclude_rules: Regras do title_filter que descartam um resultado
+                (ex: NON_MUSIC_RULES); None = sem filtro
 
         Returns:
             Lista de vídeos encontrados
@@ -270,27 +402,32 @@ class YouTubeService:
         if not self.youtube:
             await self.initialize()
 
-        # Verifica se pode fazer a requisição
-        if not quota_tracker.can_make_request("search"):
-            self.logger.error("❌ Quota insuficiente para buscar vídeos")
-            return []
-
         try:
-            # Registra uso antes da requisição
-            quota_tracker.track_operation("search", f"query: {query[:50]}")
-
-            request = self.youtube.search().list(
-                part="snippet",
-                q=query,
-                type="video",
+            items, _ = await self._search(
+                query,
+                f"query: {query[:50]}",
                 maxResults=max_results,
                 videoCategoryId="10",  # Categoria Música
             )
-
-            response = request.execute()
+            if items is None:
+                self.logger.error("❌ Quota insuficiente para buscar vídeos")
+                return []
 
             videos = []
-            for item in response.get("items", []):
+            for item in items:
+                if exclude_rules:
+                    rejected = title_filter.check(
+                        item["snippet"]["title"],
+                        item["snippet"]["channelTitle"],
+                        rules=exclude_rules,
+                    )
+                    if rejected:
+                        self.logger.debug(
+                            f"⏭️ Resultado filtrado ({FILTER_REASONS[rejected[0]]}): "
+                            f"{item['snippet']['title']}"
+                        )
+                        continue
+
                 video = {
                     "id": item["id"]["videoId"],
                     "title": item["snippet"]["title"],
@@ -306,6 +443,9 @@ class YouTubeService:
         except HttpError as e:
             self.logger.error(f"Erro na API do YouTube: {e}")
             return []
+        except asyncio.TimeoutError:
+            self.logger.error(f"⏱️ Timeout ao buscar vídeos para: {query}")
+            return []
 
     async def get_video_info(self, video_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -333,11 +473,7 @@ class YouTubeService:
                 part="snippet,contentDetails,statistics", id=video_id
             )
 
-            # Executar com retry (3 tentativas com backoff exponencial)
-            import asyncio
-
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, request.execute)
+            response = await api_executor.run(request.execute, label="videos_list")
 
             if not response.get("items"):
                 return None
@@ -359,6 +495,9 @@ class YouTubeService:
         except HttpError as e:
             self.logger.error(f"Erro ao obter informações do vídeo: {e}")
             return None
+        except asyncio.TimeoutError:
+            self.logger.error(f"⏱️ Timeout ao obter informações do vídeo: {video_id}")
+            return None
 
     async def get_videos_duration_batch(self, video_ids: List[str]) -> Dict[str, int]:
         """
@@ -395,8 +534,9 @@ class YouTubeService:
                     id=ids_str,  # Múltiplos IDs separados por vírgula
                 )
 
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(None, request.execute)
+                response = await api_executor.run(
+                    request.execute, label="videos_list_batch"
+                )
 
                 # DEBUG: Verificar resposta da API
                 items = response.get("items", [])
@@ -456,6 +596,8 @@ class YouTubeService:
         video_channel: str = None,
         search_strategy: int = 0,
         history_titles: List[str] = None,
+        pool_size: int = 0,
+        analysis: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Busca vídeos relacionados usando IA para gerar queries inteligentes
@@ -468,36 +610,40 @@ class YouTubeService:
             video_channel: Canal do vídeo
             search_strategy: Estratégia de busca (0-3)
             history_titles: Títulos já tocados (para IA evitar)
+            pool_size: Candidatos extras a aprovar na mesma busca/validação
+                (retornados após os `max_results` primeiros)
+            analysis: Query já gerada por ai_service.generate_autoplay_query
+                para esta estratégia (None = gerar aqui)
 
         Returns:
-            Lista de vídeos relacionados
+            Lista de vídeos relacionados (até max_results + pool_size)
         """
         if not self.youtube:
             await self.initialize()
 
-        # Verifica se pode fazer a requisição
-        if not quota_tracker.can_make_request("search"):
+        # Verifica se pode fazer a requisição; sem quota, só uma busca já em
+        # cache pode ser servida (a query da IA só é conhecida depois)
+        if not quota_tracker.can_make_request("search") and not self.search_cache:
             self.logger.error("❌ Quota insuficiente para buscar relacionados")
             return []
 
         exclude_ids = exclude_ids or []
         history_titles = history_titles or []
+        # A busca custa 100 unidades independente do tamanho: aprovar de uma
+        # vez os candidatos do pool do autoplay
+        max_results_total = max_results + pool_size
 
         try:
-            # Registra uso antes da requisição
-            quota_tracker.track_operation(
-                "search", f"autoplay (estratégia {search_strategy})"
-            )
-
             # 🤖 USAR IA PARA GERAR QUERY INTELIGENTE
-            from services.ai_service import ai_service
+            if analysis is None:
+                from services.ai_service import ai_service
 
-            analysis = await ai_service.generate_autoplay_query(
-                current_title=video_title or "",
-                current_channel=video_channel or "",
-                history=history_titles,
-                strategy=search_strategy,
-            )
+                analysis = await ai_service.generate_autoplay_query(
+                    current_title=video_title or "",
+                    current_channel=video_channel or "",
+                    history=history_titles,
+                    strategy=search_strategy,
+                )
 
             search_query = analysis.get("query", "música brasileira")
             query_type = analysis.get("tipo", "unknown")
@@ -529,179 +675,43 @@ class YouTubeService:
             )
 
             # Executar busca no YouTube com a query gerada pela IA
-            request = self.youtube.search().list(
-                part="snippet",
-                q=search_query,
-                type="video",
-                maxResults=max_results * 3,
+            search_params: Dict[str, Any] = dict(
+                maxResults=min(max_results_total * 3, 50),
                 videoCategoryId="10",  # Importante: Apenas categoria Música
             )
-            response = request.execute()
+            key, items = await self._cached_search(search_query, **search_params)
+            cached = items is not None
+            if items is None:
+                # Fora do cache: a quota é verificada de novo (pode ter
+                # acabado durante a geração da query)
+                if not quota_tracker.can_make_request("search"):
+                    self.logger.error("❌ Quota insuficiente para buscar relacionados")
+                    return []
+                items = await self._api_search(
+                    search_query,
+                    f"autoplay (estratégia {search_strategy})",
+                    key,
+                    **search_params,
+                )
 
             # LOG: Quantos resultados a API retornou
-            total_results = len(response.get("items", []))
+            total_results = len(items)
             self.logger.info(f"📊 API retornou {total_results} resultados da busca")
 
             # 📊 LOG AUTOPLAY: Resultado da API search
-            autoplay_logger.log_api_search(total_results, quota_used=100)
+            autoplay_logger.log_api_search(
+                total_results,
+                quota_used=0 if cached else quota_tracker.OPERATION_COSTS["search"],
+            )
 
             videos = []
 
-            # Palavras que indicam que NÃO é uma música (conteúdo indesejado)
-            excluded_keywords = [
-                # Entrevistas e talks
-                "podcast",
-                "interview",
-                "entrevista",
-                "bate-papo",
-                "conversa",
-                "papo",
-                # Reações e análises
-                "react",
-                "reação",
-                "reagindo",
-                "reagiu",
-                "reaction",
-                "análise",
-                "analisa",
-                "analisando",
-                "review",
-                # Gaming
-                "gameplay",
-                "jogando",
-                "playing",
-                # Tutoriais e explicações
-                "tutorial",
-                "como fazer",
-                "aprenda",
-                "aula",
-                "explicação",
-                "explicando",
-                "explica",
-                "ensina",
-                "dica",
-                "dicas",
-                # Documentários e histórias
-                "história",
-                "historia",
-                "story",
-                "história de",
-                "origem",
-                "de onde vem",
-                "quem é",
-                "conhecendo",
-                "conhece",
-                "documentário",
-                "documentary",
-                # Bastidores e making of
-                "making of",
-                "bastidores",
-                "behind the scenes",
-                "gravação",
-                "gravando",
-                "estúdio",
-                "studio",
-                # Vlogs e daily content
-                "vlog",
-                "diary",
-                "dia a dia",
-                "rotina",
-                # Desafios
-                "challenge",
-                "desafio",
-                # Descobertas
-                "first time",
-                "primeira vez",
-                "descobriu",
-                "descobrindo",
-                "descobri",
-                "conheci",
-                "meets",
-                # Playlists e compilações
-                "playlist",
-                "compilation",
-                "compilação",
-                "os melhores",
-                "as melhores",
-                "best of",
-                "top 10",
-                "top 20",
-                "top 50",
-                "coletânea",
-                "mix",
-                "mashup",
-                "medley",
-                "1 hora",
-                "2 horas",
-                "3 horas",
-                "hour",
-                "hours",
-                # Shorts e redes sociais
-                "shorts",
-                "tiktok",
-                "melhores momentos",
-                # Transmissões
-                "lives",
-                "ao vivo",
-                "full stream",
-                "stream",
-                "transmissão",
-            ]
-
-            # Palavras que indicam versões alternativas (devem ser evitadas para diversidade)
-            # Nota: "acústico" não está aqui pois pode ser o estilo original da música
-            alternative_version_keywords = [
-                "cover",
-                "remix",
-                "versão",
-                "version",
-                "letra",
-                "lyrics",
-                "lyric video",
-                "instrumental",
-                "karaoke",
-                "piano version",
-                "guitar version",
-                "violão version",
-                "live",
-                "ao vivo",
-                "unplugged",
-                "slowed",
-                "reverb",
-                "sped up",
-                "nightcore",
-                "8d audio",
-            ]
-
             # Extrair palavras-chave principais do título de referência para evitar repetição
             reference_keywords = set()
             if video_title:
                 # Remover parênteses, colchetes, feat, part, etc (usando regex pré-compilado)
                 clean_ref = CLEAN_TITLE_PATTERN.sub("", video_title.lower())
-
-                # Remover palavras muito comuns que não ajudam na comparação
-                stopwords = {
-                    "música",
-                    "music",
-                    "official",
-                    "video",
-                    "audio",
-                    "clipe",
-                    "com",
-                    "the",
-                    "de",
-                    "da",
-                    "do",
-                    "em",
-                    "para",
-                }
-
-                # Pegar palavras principais (mais de 3 letras) exceto stopwords
-                reference_keywords = set(
-                    word
-                    for word in clean_ref.split()
-                    if len(word) > 3 and word not in stopwords
-                )
+                reference_keywords = title_filter.significant_words(clean_ref)
 
             # LOG: Palavras-chave extraídas da referência
             if reference_keywords:
@@ -709,42 +719,20 @@ class YouTubeService:
                     f"🔑 Palavras-chave de referência: {reference_keywords}"
                 )
 
-            # Padrões de títulos que indicam conteúdo explicativo (regex pré-compilados)
-            explanatory_patterns = [
-                r"^(de onde|donde|where does|where is|who is|what is|quem é|o que é|qual é)",
-                r"^(como |how to |how )",
-                r"^(por que|porque|why )",
-                r"^(conheça|conhece|meet |discover )",
-                r"\?$",  # Títulos que terminam com ?
-            ]
-
-            # Palavras suspeitas em nomes de canais (indicam canais de conteúdo não-musical)
-            suspicious_channel_keywords = [
-                "documentary",
-                "documentário",
-                "docs",
-                "história",
-                "historia",
-                "explica",
-                "explains",
-                "educação",
-                "education",
-                "tutorial",
-                "aprenda",
-                "learn",
-                "podcast",
-                "cast",
-            ]
+            artist_reference = (
+                ARTIST_SPLIT_PATTERN.split(video_title)[0].strip().lower()
+                if video_title
+                else ""
+            )
 
             # 🆕 OTIMIZAÇÃO #1: Coletar candidatos para processamento em batch
             video_candidates = []
 
-            for item in response.get("items", []):
+            for item in items:
                 vid_id = item["id"]["videoId"]
                 title = item["snippet"]["title"]
                 title_lower = title.lower()
                 channel_name = item["snippet"]["channelTitle"]
-                channel_lower = channel_name.lower()
 
                 # LOG: Analisando cada vídeo
                 self.logger.debug(f"🔍 Analisando: {title} [{channel_name}]")
@@ -754,77 +742,23 @@ class YouTubeService:
                     self.logger.debug(f"   ⏭️ Pulado (já na fila ou é o vídeo atual)")
                     continue
 
-                # Filtro 0: Detectar títulos explicativos por padrão (regex)
-                is_explanatory = False
-                for pattern in explanatory_patterns:
-                    if re.search(pattern, title_lower):
-                        is_explanatory = True
-                        self.logger.debug(
-                            f"   ⏭️ Excluído (título explicativo - padrão: {pattern})"
-                        )
-                        break
-                if is_explanatory:
-                    continue
-
-                # Filtro 1: Verificar se o canal é suspeito (não-musical)
-                matched_suspicious_channel = [
-                    kw for kw in suspicious_channel_keywords if kw in channel_lower
-                ]
-                if matched_suspicious_channel:
+                # Filtros 0-3 em uma passada (services/title_filter.py): título
+                # explicativo, canal suspeito, não-música, versão alternativa
+                rejected = title_filter.check(title, channel_name)
+                if rejected:
+                    rule, matched = rejected
                     self.logger.debug(
-                        f"   ⏭️ Excluído (canal suspeito - contém: {matched_suspicious_channel[0]})"
-                    )
-                    continue
-
-                # Filtro 2: Excluir vídeos com palavras-chave indesejadas
-                matched_excluded = [kw for kw in excluded_keywords if kw in title_lower]
-                if matched_excluded:
-                    self.logger.debug(
-                        f"   ⏭️ Excluído (não é música - contém: {matched_excluded[0]})"
-                    )
-                    continue
-
-                # Filtro 3: Excluir versões alternativas (cover, remix, etc)
-                matched_alternative = [
-                    kw for kw in alternative_version_keywords if kw in title_lower
-                ]
-                if matched_alternative:
-                    self.logger.debug(
-                        f"   ⏭️ Excluído (versão alternativa - contém: {matched_alternative[0]})"
+                        f"   ⏭️ Excluído ({FILTER_REASONS[rule]} - contém: {matched})"
                     )
                     continue
 
                 # Filtro 4: Evitar músicas muito similares (mesmo título base)
-                if reference_keywords and len(reference_keywords) > 0:
-                    # Remover stopwords do título candidato também
-                    stopwords = {
-                        "música",
-                        "music",
-                        "official",
-                        "video",
-                        "audio",
-                        "clipe",
-                        "com",
-                        "the",
-                        "de",
-                        "da",
-                        "do",
-                        "em",
-                        "para",
-                    }
-                    title_words = set(
-                        word
-                        for word in title_lower.split()
-                        if len(word) > 3 and word not in stopwords
-                    )
+                if reference_keywords:
+                    title_words = title_filter.significant_words(title_lower)
                     common_words = reference_keywords & title_words
 
                     # LOG: Mostrar análise de similaridade
-                    similarity_percent = (
-                        (len(common_words) / len(reference_keywords) * 100)
-                        if len(reference_keywords) > 0
-                        else 0
-                    )
+                    similarity_percent = len(common_words) / len(reference_keywords) * 100
                     self.logger.debug(
                         f"   📊 Similaridade: {len(common_words)}/{len(reference_keywords)} palavras ({similarity_percent:.0f}%) - Comuns: {common_words}"
                     )
@@ -841,33 +775,9 @@ class YouTubeService:
                         )
                         continue
 
-                # Filtro: Preferir vídeos com indicadores de música
-                music_indicators = [
-                    "official",
-                    "video",
-                    "audio",
-                    "música",
-                    "music",
-                    "clipe",
-                    "lyric",
-                ]
-                has_music_indicator = any(
-                    indicator in title for indicator in music_indicators
-                )
-
-                # Se não tem indicador de música E tem menos de 3 minutos, pode ser suspeito
-                # (vamos adicionar com menor prioridade)
-
                 # Filtro: Evitar muito do mesmo artista consecutivamente
                 # Extrair nome do artista do título
-                artist_candidate = (
-                    re.split(r"[-–(|]", item["snippet"]["title"])[0].strip().lower()
-                )
-                artist_reference = (
-                    re.split(r"[-–(|]", video_title)[0].strip().lower()
-                    if video_title
-                    else ""
-                )
+                artist_candidate = ARTIST_SPLIT_PATTERN.split(title)[0].strip().lower()
 
                 # LOG: Comparação de artistas
                 self.logger.debug(
@@ -988,8 +898,8 @@ class YouTubeService:
                 videos.append(video)
 
                 # Para quando atingir o número desejado
-                if len(videos) >= max_results:
-                    self.logger.info(f"🎯 Limite de {max_results} vídeos atingido")
+                if len(videos) >= max_results_total:
+                    self.logger.info(f"🎯 Limite de {max_results_total} vídeos atingido")
                     break
 
             self.logger.info(
@@ -1050,6 +960,9 @@ class YouTubeService:
         except HttpError as e:
             self.logger.error(f"Erro ao buscar vídeos relacionados: {e}")
             return []
+        except asyncio.TimeoutError:
+            self.logger.error("⏱️ Timeout ao buscar vídeos relacionados")
+            return []
 
     def _parse_duration(self, duration: str) -> int:
         """
@@ -0,0 +1,73 @@
+"""
+Testes do AIService
+Sessão HTTP persistente: conexões reaproveitadas entre chamadas
+"""
+
+import asyncio
+import threading
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.ai_service import AIService
+
+
+@pytest.mark.asyncio
+async def test_session_reuses_connections():
+    """Chamadas seguidas usam a mesma sessão e a conexão do pool (keep-alive)"""
+
+    async def handler(request):
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    server = TestServer(app)
+    await server.start_server()
+
+    service = AIService.get_instance()
+    before = service.get_stats()
+    try:
+        session = service._get_session()
+        for _ in range(3):
+            async with service._get_session().get(server.make_url("/")) as response:
+                assert response.status == 200
+                await response.read()
+        assert service._get_session() is session
+
+        stats = service.get_stats()
+        assert stats["requests"] - before["requests"] == 3
+        assert stats["connections_created"] - before["connections_created"] == 1
+        assert stats["connections_reused"] - before["connections_reused"] == 2
+    finally:
+        await service.close()
+        await server.close()
+
+    assert not service.get_stats()["open"]
+
+
+@pytest.mark.asyncio
+async def test_session_from_previous_loop_is_closed():
+    """Trocar de event loop fecha a sessão antiga em vez de abandoná-la aberta"""
+    old_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=old_loop.run_forever, daemon=True)
+    thread.start()
+
+    async def create_session():
+        return service._get_session()
+
+    service = AIService.get_instance()
+    try:
+        old = asyncio.run_coroutine_threadsafe(create_session(), old_loop).result(5)
+
+        assert service._get_session() is not old
+        for _ in range(50):
+            if old.closed:
+                break
+            await asyncio.sleep(0.01)
+        assert old.closed
+    finally:
+        await service.close()
+        old_loop.call_soon_threadsafe(old_loop.stop)
+        thread.join(5)
+        old_loop.close()
@@ -0,0 +1,94 @@
+"""
+Testes do AudioCache
+Índice persistente e remoção LFU/LRU (sem ffmpeg: arquivos criados à mão)
+"""
+
+import asyncio
+
+import pytest
+
+from utils.audio_cache import AudioCache
+
+
+def write_audio(cache_dir, video_id: str, size: int):
+    (cache_dir / f"{video_id}{AudioCache.SUFFIX}").write_bytes(b"\0" * size)
+
+
+def make_fake_ffmpeg(tmp_path):
+    """ffmpeg falso: grava 500 bytes no arquivo de saída (último argumento)"""
+    fake_ffmpeg = tmp_path / "ffmpeg"
+    fake_ffmpeg.write_text('#!/bin/sh\nfor arg; do out="$arg"; done\nhead -c 500 /dev/zero > "$out"\n')
+    fake_ffmpeg.chmod(0o755)
+    return fake_ffmpeg
+
+
+def test_least_played_tracks_are_evicted_first(tmp_path):
+    """Acima do limite, sai a menos tocada (empate: a tocada há mais tempo)"""
+    for video_id in ("aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"):
+        write_audio(tmp_path, video_id, 400)
+
+    cache = AudioCache(tmp_path, max_size_mb=2000 / 1024 / 1024, max_duration=900)
+    assert cache.get("aaaaaaaaaaa") is not None
+    assert cache.get("aaaaaaaaaaa") is not None
+    assert cache.get("ccccccccccc") is not None
+    assert cache.get("zzzzzzzzzzz") is None
+    cache.close()
+
+    # Reinício: contadores vêm do index.json; novo arquivo estoura o limite
+    write_audio(tmp_path, "ddddddddddd", 900)
+    cache = AudioCache(tmp_path, max_size_mb=2000 / 1024 / 1024, max_duration=900)
+
+    # b e d nunca tocaram; b é a mais antiga (desempate LRU)
+    assert cache.get("bbbbbbbbbbb") is None
+    assert cache.get("ddddddddddd") is not None
+    assert cache.get("aaaaaaaaaaa") is not None
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["size_mb"] * 1024 * 1024 <= 2000
+
+
+@pytest.mark.asyncio
+async def test_new_fill_survives_a_cache_full_of_played_tracks(tmp_path):
+    """Preenchimento novo não é o primeiro a sair; ffmpeg ausente só conta erro"""
+    cache_dir = tmp_path / "audio"
+    cache_dir.mkdir()
+    for video_id in ("aaaaaaaaaaa", "bbbbbbbbbbb"):
+        write_audio(cache_dir, video_id, 400)
+
+    fake_ffmpeg = make_fake_ffmpeg(tmp_path)
+
+    cache = AudioCache(cache_dir, max_size_mb=1000 / 1024 / 1024, max_duration=900)
+    cache.ffmpeg = str(fake_ffmpeg)
+    assert cache.get("aaaaaaaaaaa") and cache.get("bbbbbbbbbbb")
+
+    assert cache.get("ccccccccccc") is None  # Tocada da stream
+    cache.schedule_fill("ccccccccccc", "https://googlevideo/c", 200)
+    await asyncio.gather(*cache._fills.values())
+
+    assert cache.get("ccccccccccc") is not None
+    assert cache.get("aaaaaaaaaaa") is None  # Tocada há mais tempo
+    assert cache.get_stats()["evictions"] == 1
+
+    cache.ffmpeg = str(tmp_path / "removido")
+    assert cache.get("ddddddddddd") is None
+    cache.schedule_fill("ddddddddddd", "https://googlevideo/d", 200)
+    await asyncio.gather(*cache._fills.values())
+    assert cache.get_stats()["fill_errors"] == 1
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_fill_waits_for_min_plays(tmp_path):
+    """Música tocada uma vez só não é baixada de novo para o cache"""
+    cache = AudioCache(tmp_path, max_size_mb=1, max_duration=900, min_plays=2)
+    cache.ffmpeg = str(make_fake_ffmpeg(tmp_path))
+
+    assert cache.get("aaaaaaaaaaa") is None
+    cache.schedule_fill("aaaaaaaaaaa", "https://googlevideo/a", 200)
+    assert not cache._fills
+
+    assert cache.get("aaaaaaaaaaa") is None  # Segunda reprodução
+    cache.schedule_fill("aaaaaaaaaaa", "https://googlevideo/a", 200)
+    await asyncio.gather(*cache._fills.values())
+    assert cache.get("aaaaaaaaaaa") is not None
+    cache.close()
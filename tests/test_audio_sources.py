@@ -0,0 +1,143 @@
+"""
+Testes das fontes PCM (GainTransformer, CrossfadeMixer) com fontes falsas (sem ffmpeg)
+"""
+
+import array
+from typing import List
+
+import discord
+import pytest
+
+from services import audio_sources
+from services.audio_sources import (
+    FRAME_SIZE,
+    FRAMES_PER_SECOND,
+    CrossfadeMixer,
+    GainProcessor,
+    GainTransformer,
+)
+
+AMPLITUDE = 10000
+
+
+class FakePCM(discord.AudioSource):
+    """Fonte PCM constante com `frames` frames de 20ms"""
+
+    def __init__(self, frames: int, amplitude: int = AMPLITUDE):
+        self.remaining = frames
+        self.frame = array.array("h", [amplitude] * (FRAME_SIZE // 2)).tobytes()
+        self.cleaned = False
+
+    def read(self) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        self.remaining -= 1
+        return self.frame
+
+    def cleanup(self):
+        self.cleaned = True
+
+
+def first_sample(frame: bytes) -> int:
+    return array.array("h", frame[:2])[0]
+
+
+def samples(frame: bytes) -> array.array:
+    return array.array("h", frame)
+
+
+def test_volume_change_ramps_inside_next_frame():
+    """Mudança de volume vira rampa no frame seguinte (sem degrau) e buffers são reutilizados"""
+    source = GainTransformer(FakePCM(3), volume=1.0, processor=GainProcessor(use_numpy=False))
+    assert first_sample(source.read()) == AMPLITUDE
+
+    source.volume = 0.5
+    ramp = samples(source.read())
+    assert ramp[0] > AMPLITUDE * 0.95  # Começa perto do volume anterior
+    assert ramp[-1] == AMPLITUDE // 2  # Termina no volume novo
+    assert all(a >= b for a, b in zip(ramp, ramp[1:]))
+
+    assert first_sample(source.read()) == AMPLITUDE // 2
+
+
+def test_numpy_matches_array_fallback():
+    """Rampas e mixagem com numpy dão o mesmo resultado do fallback"""
+    pytest.importorskip("numpy")
+    frame = FakePCM(1, amplitude=30000).read()
+    fast, fallback = GainProcessor(use_numpy=True), GainProcessor(use_numpy=False)
+
+    for start, end in [(1.0, 0.5), (0.0, 1.0), (0.3, 0.3)]:
+        expected, result = samples(fallback.apply(frame, start, end)), samples(fast.apply(frame, start, end))
+        assert max(abs(a - b) for a, b in zip(expected, result)) <= 30000 / fallback.RAMP_BLOCKS + 1
+
+    assert fast.mix(frame, frame) == fallback.mix(frame, frame)
+
+
+def test_pure_array_fallback_matches_audioop(monkeypatch):
+    """Sem audioop (Python 3.13+), ganho e mixagem dão o mesmo resultado"""
+    if audio_sources.audioop is None:
+        pytest.skip("audioop indisponível")
+    frame = FakePCM(1, amplitude=30000).read()
+    processor = GainProcessor(use_numpy=False)
+    expected = [processor.apply(frame, 0.37), processor.apply(frame, 1.0, 0.2), processor.mix(frame, frame)]
+
+    monkeypatch.setattr(audio_sources, "audioop", None)
+    assert [processor.apply(frame, 0.37), processor.apply(frame, 1.0, 0.2), processor.mix(frame, frame)] == expected
+
+
+def make_mixer(events, seconds=10, crossfade=2):
+    return CrossfadeMixer(
+        FakePCM(seconds * FRAMES_PER_SECOND),
+        "a",
+        seconds,
+        crossfade=crossfade,
+        volume=1.0,
+        on_need_next=lambda tag: events.append(("need_next", tag)),
+        on_handoff=lambda old, new: events.append(("handoff", old, new)),
+        lead_time=1,
+    )
+
+
+def test_crossfade_overlaps_tail_with_next_head():
+    """A próxima entra no fade out da atual; o handoff acontece uma única vez"""
+    events: List[tuple] = []
+    mixer = make_mixer(events)
+    frames = [mixer.read() for _ in range(int(7.5 * FRAMES_PER_SECOND))]
+
+    # Fade in no início, volume cheio no meio, pedido da próxima 1s antes do fade
+    assert first_sample(frames[0]) < AMPLITUDE // 10
+    assert first_sample(frames[5 * FRAMES_PER_SECOND]) == AMPLITUDE
+    assert events == [("need_next", "a")]
+
+    next_source = FakePCM(10 * FRAMES_PER_SECOND)
+    assert mixer.queue_next(next_source, "b", 10)
+
+    # Janela de crossfade (8s-10s): soma das duas com potência constante
+    frames = [mixer.read() for _ in range(int(2.5 * FRAMES_PER_SECOND))]
+    assert events[-1] == ("handoff", "a", "b")
+    middle = first_sample(frames[int(1.5 * FRAMES_PER_SECOND)])
+    assert AMPLITUDE < middle <= int(AMPLITUDE * 1.42)
+
+    # Depois do crossfade só a próxima toca, em volume cheio
+    frames = [mixer.read() for _ in range(FRAMES_PER_SECOND)]
+    assert first_sample(frames[-1]) == AMPLITUDE
+    assert next_source.remaining > 0
+    assert len([e for e in events if e[0] == "handoff"]) == 1
+
+
+def test_cancel_crossfade_returns_pending_song():
+    """Desativar o crossfade devolve a próxima ainda não iniciada e termina sem fade"""
+    events: List[tuple] = []
+    mixer = make_mixer(events)
+    for _ in range(7 * FRAMES_PER_SECOND):
+        mixer.read()
+
+    pending = FakePCM(FRAMES_PER_SECOND)
+    mixer.queue_next(pending, "b", 1)
+    assert mixer.cancel_crossfade() == "b"
+    assert pending.cleaned
+
+    frames = [mixer.read() for _ in range(3 * FRAMES_PER_SECOND + 1)]
+    assert first_sample(frames[3 * FRAMES_PER_SECOND - 1]) == AMPLITUDE
+    assert frames[-1] == b""
+    assert not any(e[0] == "handoff" for e in events)
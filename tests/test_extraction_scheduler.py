@@ -0,0 +1,57 @@
+"""
+Testes do ExtractionScheduler
+Garante a ordem por prioridade e o round-robin entre servidores
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from services.extraction_scheduler import ExtractionPriority, extraction_scheduler
+
+
+@pytest.mark.asyncio
+async def test_priority_and_guild_fairness(monkeypatch):
+    """Play-now passa na frente do backfill; playlists alternam entre servidores"""
+    monkeypatch.setattr(extraction_scheduler, "max_workers", 1)
+
+    order = []
+    gate = threading.Event()
+
+    def job(name):
+        def run():
+            if name == "blocker":
+                gate.wait(timeout=5)
+            order.append(name)
+            return name
+
+        return run
+
+    # Ocupa o único worker enquanto a fila é montada
+    blocker = asyncio.create_task(
+        extraction_scheduler.run(job("blocker"), ExtractionPriority.PLAYLIST, guild_id=1)
+    )
+    await asyncio.sleep(0.01)
+
+    tasks = [
+        asyncio.create_task(
+            extraction_scheduler.run(job(name), ExtractionPriority.PLAYLIST, guild_id=guild)
+        )
+        for name, guild in [("a1", 1), ("a2", 1), ("a3", 1), ("b1", 2)]
+    ]
+    tasks.append(
+        asyncio.create_task(
+            extraction_scheduler.run(job("now"), ExtractionPriority.PLAY_NOW, guild_id=2)
+        )
+    )
+    await asyncio.sleep(0.01)
+    assert extraction_scheduler.queue_depth() == 5
+
+    gate.set()
+    await asyncio.gather(blocker, *tasks)
+
+    assert order == ["blocker", "now", "a1", "b1", "a2", "a3"]
+    stats = extraction_scheduler.get_stats()
+    assert stats["queue_depth"] == 0
+    assert stats["by_priority"]["PLAY_NOW"]["completed"] >= 1
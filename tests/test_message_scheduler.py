@@ -0,0 +1,111 @@
+"""
+Testes do MessageScheduler com mensagens/canais falsos (sem Discord)
+"""
+
+import asyncio
+from typing import Any, List
+
+import pytest
+
+from services.message_scheduler import (
+    MessagePriority,
+    ProgressReporter,
+    ROUTE_LIMITS,
+    message_scheduler,
+)
+
+
+class FakeChannel:
+    def __init__(self, channel_id, log):
+        self.id = channel_id
+        self.log = log
+
+    async def send(self, content=None, **kwargs):
+        self.log.append(("send", content))
+        return FakeMessage(len(self.log), self, self.log)
+
+
+class FakeMessage:
+    def __init__(self, message_id, channel, log):
+        self.id = message_id
+        self.channel = channel
+        self.log = log
+
+    async def edit(self, **kwargs):
+        self.log.append(("edit", kwargs))
+
+
+def fake_message(message_id, channel, log) -> Any:
+    """FakeMessage tipada como Any (o scheduler espera discord.Message)"""
+    return FakeMessage(message_id, channel, log)
+
+
+@pytest.mark.asyncio
+async def test_superseded_edit_is_dropped_and_merged():
+    """Edições pendentes da mesma mensagem viram uma só, com os campos mesclados"""
+    log: List[tuple] = []
+    channel = FakeChannel(1001, log)
+    message = fake_message(1, channel, log)
+
+    # Esgotar o orçamento do canal para as edições ficarem na fila
+    burst, _ = ROUTE_LIMITS["edit"]
+    await asyncio.gather(
+        *(message_scheduler.edit(fake_message(100 + i, channel, log)) for i in range(burst))
+    )
+    log.clear()
+
+    first = asyncio.create_task(message_scheduler.edit(message, content="1/10", embed="a"))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(message_scheduler.edit(message, content="2/10"))
+
+    assert await first is False
+    assert await second is True
+    assert log == [("edit", {"content": "2/10", "embed": "a"})]
+    assert message_scheduler.get_stats()["by_route"]["edit"]["superseded"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_reply_goes_before_panel_edit():
+    """Com a rota no limite, respostas passam na frente de edições de painel"""
+    log: List[tuple] = []
+    channel = FakeChannel(1002, log)
+    panel = fake_message(1, channel, log)
+    reply = fake_message(2, channel, log)
+
+    burst, _ = ROUTE_LIMITS["edit"]
+    await asyncio.gather(
+        *(message_scheduler.edit(fake_message(200 + i, channel, log)) for i in range(burst))
+    )
+    log.clear()
+
+    panel_task = asyncio.create_task(
+        message_scheduler.edit(panel, content="painel", priority=MessagePriority.PANEL)
+    )
+    await asyncio.sleep(0)
+    reply_task = asyncio.create_task(
+        message_scheduler.edit(reply, content="resposta", priority=MessagePriority.REPLY)
+    )
+    await asyncio.gather(panel_task, reply_task)
+
+    assert [entry[1]["content"] for entry in log] == ["resposta", "painel"]
+
+
+@pytest.mark.asyncio
+async def test_progress_reporter_edits_at_most_once_per_interval():
+    """Muitos itens processados viram poucas edições (uma por intervalo)"""
+    log: List[tuple] = []
+    message = fake_message(3, FakeChannel(1003, log), log)
+    state = {"done": 0}
+
+    reporter = ProgressReporter(message, lambda: f"{state['done']}/100", interval=0.5)
+    reporter.start()
+    try:
+        for _ in range(100):
+            state["done"] += 1
+            await asyncio.sleep(0.006)
+        await asyncio.sleep(0.1)
+    finally:
+        reporter.finish()
+
+    assert 1 <= len(log) <= 2
+    assert reporter.edits == len(log)
@@ -0,0 +1,241 @@
+"""
+Testes do cache de metadados (MetadataStore + MetadataResolver)
+Garante persistência entre instâncias, TTL da stream_url, limite de tamanho
+e coalescência de extrações simultâneas
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from services.metadata_resolver import (
+    MetadataResolver,
+    extract_video_id,
+    slim_info,
+    stream_url_expiry,
+)
+from utils.metadata_store import MetadataStore
+
+
+def make_record(video_id: str, stream_expires: float) -> dict:
+    """Cria um registro compacto no formato usado pelo MusicService"""
+    return {
+        "url": f"https://www.youtube.com/watch?v={video_id}",
+        "title": f"Música {video_id}",
+        "duration": 215,
+        "thumbnail": "",
+        "uploader": "Canal",
+        "stream_url": f"https://googlevideo/{video_id}",
+        "stream_url_expires": stream_expires,
+    }
+
+
+def test_records_survive_restart_and_stream_url_expires(tmp_path):
+    """Campos estáticos persistem; stream_url expirada não é retornada"""
+    db_path = tmp_path / "metadata.db"
+    store = MetadataStore(db_path, max_size_mb=10)
+    store.put("fresh", make_record("fresh", time.time() + 3600))
+    store.put("stale", make_record("stale", time.time() - 1))
+    store.close()
+
+    # Nova instância (simula reinício do bot)
+    store = MetadataStore(db_path, max_size_mb=10)
+
+    fresh = store.get("fresh")
+    stale = store.get("stale")
+    assert fresh is not None and stale is not None
+    assert fresh["title"] == "Música fresh"
+    assert fresh["stream_url"] == "https://googlevideo/fresh"
+    assert stale["duration"] == 215
+    assert stale["stream_url"] == ""
+
+    # min_ttl descarta URLs prestes a expirar
+    assert store.get("fresh", min_ttl=7200) == {**fresh, "stream_url": "", "stream_url_expires": 0}
+
+    recent = store.load_recent(limit=10)
+    assert [video_id for video_id, _ in recent] == ["stale", "fresh"]
+    store.close()
+
+
+def test_writes_are_batched_until_flush(tmp_path):
+    """Consultas e escritas não vão ao disco uma a uma: gravadas em lote"""
+    db_path = tmp_path / "metadata.db"
+    store = MetadataStore(db_path, max_size_mb=10)
+    other = MetadataStore(db_path, max_size_mb=10)  # Outro processo/conexão
+
+    store.put("vid", make_record("vid", time.time() + 3600))
+    assert store.get("vid") is not None  # Visível para a própria instância
+    assert other.get("vid") is None
+
+    store.flush()
+    assert other.get("vid") is not None
+    store.close()
+    other.close()
+
+
+def test_expired_stream_keeps_static_fields_in_resolver(tmp_path):
+    """Stream expirada: metadados reaproveitados, só a stream é extraída de novo"""
+    store = MetadataStore(tmp_path / "metadata.db", max_size_mb=10)
+    store.put("dQw4w9WgXcQ", make_record("dQw4w9WgXcQ", time.time() - 1))
+    resolver = MetadataResolver(cache_size=10, store=store)
+    url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+    assert resolver.get_cached(url) is None
+    metadata = resolver.get_metadata(url)
+    assert metadata is not None
+    assert (metadata["duration"], metadata["stream_url"]) == (215, "")
+    resolver.close()
+
+
+def test_size_limit_evicts_least_recently_accessed(tmp_path):
+    """Ao passar de max_size_mb, os vídeos menos acessados são removidos"""
+    store = MetadataStore(tmp_path / "metadata.db", max_size_mb=0)
+    store.SIZE_CHECK_INTERVAL = 1
+    store.FLUSH_BATCH = 1
+
+    store.put("old", make_record("old", 0))
+    store.put("new", make_record("new", 0))
+
+    assert store.get("old") is None
+    assert store.get_stats()["entries"] <= 1
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_resolver_coalesces_concurrent_requests():
+    """Pedidos simultâneos do mesmo vídeo compartilham uma única extração"""
+    calls = []
+
+    async def fake_extract(url):
+        calls.append(url)
+        await asyncio.sleep(0.05)
+        return {
+            "id": "dQw4w9WgXcQ",
+            "title": "Música",
+            "duration": 212,
+            "url": "https://googlevideo/dQw4w9WgXcQ",
+        }
+
+    resolver = MetadataResolver(cache_size=10)
+    url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+    records = await asyncio.gather(
+        *(resolver.resolve(url, fake_extract) for _ in range(3))
+    )
+    cached = await resolver.resolve(url, fake_extract)
+
+    assert len(calls) == 1
+    assert all(r and r["stream_url"] == "https://googlevideo/dQw4w9WgXcQ" for r in records)
+    assert cached is not None and cached["title"] == "Música"
+
+    stats = resolver.get_stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 2, 1)
+
+
+def test_equivalent_urls_share_the_same_video_id():
+    """URLs diferentes do mesmo vídeo devem gerar a mesma chave"""
+    urls = [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtube.com/watch?list=PL123&v=dQw4w9WgXcQ&t=42",
+        "https://m.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://music.youtube.com/watch?v=dQw4w9WgXcQ&feature=share",
+        "https://youtu.be/dQw4w9WgXcQ?si=abc",
+        "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+        "https://www.youtube.com/embed/dQw4w9WgXcQ",
+    ]
+
+    assert {extract_video_id(url) for url in urls} == {"dQw4w9WgXcQ"}
+    assert extract_video_id("never gonna give you up") is None
+
+
+def test_slim_info_keeps_only_playback_fields():
+    """slim_info descarta formatos e mantém a URL de áudio selecionada"""
+    info = {
+        "id": "dQw4w9WgXcQ",
+        "title": "Música",
+        "duration": 212,
+        "webpage_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "formats": [
+            {"acodec": "none", "url": "https://googlevideo/video"},
+            {"acodec": "opus", "url": "https://googlevideo/audio"},
+        ],
+        "subtitles": {"en": [{"url": "https://subs"}]},
+    }
+
+    slim = slim_info(info)
+    playlist = slim_info({"entries": [info]})
+
+    assert slim is not None and playlist is not None
+    assert slim["url"] == "https://googlevideo/audio"
+    assert slim["acodec"] == "opus"
+    assert "formats" not in slim and "subtitles" not in slim
+    assert playlist["entries"][0]["title"] == "Música"
+
+
+@pytest.mark.asyncio
+async def test_resolver_cancels_extraction_when_last_waiter_gives_up():
+    """Extração sem nenhum chamador aguardando é cancelada (ex: fila reordenada)"""
+    started = asyncio.Event()
+    cancelled = []
+
+    async def slow_extract(url):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+
+    resolver = MetadataResolver(cache_size=10)
+    url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+    first = asyncio.create_task(resolver.resolve(url, slow_extract))
+    second = asyncio.create_task(resolver.resolve(url, slow_extract))
+    await started.wait()
+
+    # Um chamador desiste: a extração continua para o outro
+    first.cancel()
+    await asyncio.sleep(0)
+    assert not cancelled
+
+    second.cancel()
+    await asyncio.sleep(0.01)
+    assert cancelled == [url]
+    assert resolver.get_stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_new_request_after_last_waiter_cancels_starts_fresh():
+    """Quem chega logo após o cancelamento não herda a extração cancelada"""
+    calls = []
+
+    async def extract(url):
+        calls.append(url)
+        if len(calls) == 1:
+            await asyncio.sleep(10)
+        return {"id": "dQw4w9WgXcQ", "title": "Música", "url": url}
+
+    resolver = MetadataResolver(cache_size=10)
+    url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+    # Pré-carregamento cancelado (fila embaralhada) e o play pede o mesmo vídeo
+    preload = asyncio.create_task(resolver.resolve(url, extract))
+    await asyncio.sleep(0)
+    preload.cancel()
+    await asyncio.sleep(0)
+    record = await resolver.resolve(url, extract)
+
+    assert record is not None and record["title"] == "Música"
+    assert len(calls) == 2
+
+
+def test_stream_url_expiry_reads_expire_parameter():
+    """Expiração vem do expire= da URL do googlevideo (fallback: TTL fixo)"""
+    query_url = "https://rr1---sn.googlevideo.com/videoplayback?expire=1760000000&ei=x"
+    manifest_url = "https://manifest.googlevideo.com/api/manifest/hls/expire/1760000123/ei/x"
+
+    assert stream_url_expiry(query_url) == 1760000000
+    assert stream_url_expiry(manifest_url) == 1760000123
+    assert stream_url_expiry("") == 0
+    assert stream_url_expiry("https://example.com/audio") > time.time()
@@ -0,0 +1,321 @@
+"""
+Testes do MusicService
+Playlists preguiçosas: enfileirar sem extrair e resolver sob demanda
+"""
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+import pytest_asyncio
+
+from config import config
+from services.extraction_scheduler import extraction_scheduler
+from services.message_scheduler import message_scheduler
+from services.music_service import MusicService, Song
+
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PL123"
+VIDEO_URL = "https://www.youtube.com/watch?v=aaaaaaaaaaa"
+
+# Músicas de teste sem usuário (Song espera um discord.Member)
+NO_REQUESTER: Any = None
+
+
+@pytest_asyncio.fixture
+async def music_service(monkeypatch):
+    """MusicService sem cache em disco (criado dentro do event loop)"""
+    monkeypatch.setattr(config, "CACHE_ENABLED", False)
+    return MusicService.get_instance()
+
+
+@pytest.mark.asyncio
+async def test_lazy_playlist_resolves_only_on_demand(music_service, monkeypatch):
+    """Itens da playlist entram na fila sem extração; a stream vem na hora de tocar"""
+    flat = {
+        "title": "Mix",
+        "entries": [
+            {"id": "aaaaaaaaaaa", "url": VIDEO_URL, "title": "Um", "duration": 200},
+            {"id": "bbbbbbbbbbb", "title": "[Deleted video]"},
+        ],
+    }
+    resolved = []
+
+    async def fake_run(func, priority=None, guild_id=None, key=None):
+        return flat
+
+    async def fake_resolve(url, priority, guild_id=None, ytdl=None, max_retries=1):
+        resolved.append(url)
+        return {
+            "url": url,
+            "title": "Um",
+            "duration": 201,
+            "thumbnail": "",
+            "uploader": "Canal",
+            "stream_url": "https://googlevideo/aaaaaaaaaaa",
+            "stream_url_expires": time.time() + 3600,
+        }
+
+    monkeypatch.setattr(config, "PLAYLIST_LAZY_RESOLVE", True)
+    monkeypatch.setattr(extraction_scheduler, "run", fake_run)
+    monkeypatch.setattr(music_service, "_resolve", fake_resolve)
+
+    stream = await music_service.open_playlist(PLAYLIST_URL, None)
+    songs = [song async for song in stream]
+
+    assert [song.title for song in songs] == ["Um"]
+    assert not songs[0].is_resolved
+    assert songs[0].duration == 200
+    assert resolved == []
+    assert stream.summary()["failed"] == 1
+
+    await music_service._ensure_valid_stream_url(songs[0])
+
+    assert songs[0].is_resolved
+    assert songs[0].uploader == "Canal"
+    assert resolved == [VIDEO_URL]
+
+
+@pytest.mark.asyncio
+async def test_preload_keeps_lookahead_window_ready(music_service, monkeypatch):
+    """Pré-carregamento resolve só as próximas N músicas e conta o hit rate"""
+    from services.music_service import MusicPlayer, Song
+
+    resolved = []
+
+    async def fake_resolve(url, priority, guild_id=None, ytdl=None, max_retries=1):
+        resolved.append(url)
+        return {
+            "url": url,
+            "stream_url": f"https://googlevideo/{url}",
+            "stream_url_expires": time.time() + 3600,
+        }
+
+    monkeypatch.setattr(config, "PRELOAD_LOOKAHEAD", 3)
+    monkeypatch.setattr(music_service, "_resolve", fake_resolve)
+
+    player = MusicPlayer(guild_id=1)
+    for i in range(5):
+        player.add_song(Song({"url": f"v{i}", "title": f"Música {i}"}, NO_REQUESTER))
+
+    music_service.schedule_preload(player)
+    assert player.preload_task is not None
+    await player.preload_task
+
+    assert resolved == ["v0", "v1", "v2"]
+    assert player.get_preload_stats()["ready"] == 3
+
+    # Reordenar a fila invalida o pré-carregamento em andamento
+    version = player.queue_version
+    player.remove_song(0)
+    assert player.queue_version == version + 1
+    assert player.preload_task is None
+
+    player.next_from_queue()  # v1: pronta
+    player.queue.clear()
+    player.add_song(Song({"url": "v9", "title": "Nova"}, NO_REQUESTER))
+    player.next_from_queue()  # v9: precisa de extração na hora
+
+    stats = player.get_preload_stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 50.0)
+
+
+@pytest.mark.asyncio
+async def test_panel_skips_identical_edits(music_service):
+    """Painel sem mudança visível não gera nova edição; partes estáticas são reutilizadas"""
+
+    class FakeMessage:
+        def __init__(self):
+            self.id = 1
+            self.channel = player.text_channel
+            self.edits = 0
+
+        async def edit(self, embed):
+            self.edits += 1
+
+    player = music_service.get_player(987654321)
+    player.text_channel = type("FakeChannel", (), {"id": 1})()
+    player.control_panel_message = message = FakeMessage()
+    skipped_before = music_service.panel_edits_skipped
+
+    await music_service.update_control_panel(player, debounce=False)
+    static = player._panel_static
+    await music_service.update_control_panel(player, debounce=False)
+
+    assert message.edits == 1
+    assert music_service.panel_edits_skipped == skipped_before + 1
+    assert player._panel_static is static
+
+    player.set_volume(0.3)
+    await music_service.update_control_panel(player, debounce=False)
+    assert message.edits == 2
+    assert player._panel_static is not static
+
+
+@pytest.mark.asyncio
+async def test_autoplay_session_sends_one_notification(music_service, monkeypatch):
+    """Todas as músicas de uma sessão do autoplay vão em um único embed"""
+    from services.youtube_service import YouTubeService
+
+    sent = []
+
+    class FakeChannel:
+        id = 2
+
+        async def send(self, embed):
+            sent.append(embed)
+
+    class FakeYouTube:
+        async def get_related_videos(self, **kwargs):
+            return [
+                {
+                    "id": f"vid{i}",
+                    "title": f"Música {i}",
+                    "url": f"{VIDEO_URL}{i}",
+                    "thumbnail": None,
+                    "channel": "Canal",
+                }
+                for i in range(3)
+            ]
+
+    async def fake_resolve(url, priority, **kwargs):
+        return {"title": f"Música {url[-1]}", "duration": 90}
+
+    monkeypatch.setattr(config, "AUTOPLAY_HEDGE_ENABLED", False)
+    monkeypatch.setattr(config, "AUTOPLAY_QUEUE_SIZE", 3)
+    monkeypatch.setattr(YouTubeService, "get_instance", staticmethod(FakeYouTube))
+    monkeypatch.setattr(music_service, "_resolve", fake_resolve)
+
+    player = music_service.get_player(557)
+    player.text_channel = FakeChannel()
+    player.last_video_id = "ref"
+    player.is_playing = True  # Sessão reativa sem iniciar a reprodução
+
+    await music_service._fetch_autoplay_songs(player, NO_REQUESTER)
+    for _ in range(50):  # Envio passa pelo MessageScheduler em background
+        if sent:
+            break
+        await asyncio.sleep(0.01)
+    message_scheduler.shutdown()
+
+    assert len(player.queue) == 3
+    assert len(sent) == 1
+    assert sent[0].title == "🎵 Autoplay adicionou 3 música(s)"
+    assert all(song.title in sent[0].description for song in player.queue)
+
+
+@pytest.mark.asyncio
+async def test_autoplay_pool_serves_later_sessions(music_service):
+    """Aprovados que sobraram são usados depois, sem expirados nem já tocados"""
+    player = music_service.get_player(555)
+    videos = [
+        {"id": f"vid{i}", "title": f"Música {i}", "url": f"{VIDEO_URL}{i}"}
+        for i in range(4)
+    ]
+    player.store_autoplay_candidates(videos, "ref")
+    player.autoplay_history.append("vid0")
+    player.autoplay_pool[1] = (videos[1], time.time() - 1)  # Expirado
+
+    assert player.take_autoplay_candidates(2) == videos[2:]
+    assert not player.autoplay_pool
+
+
+@pytest.mark.asyncio
+async def test_autoplay_pool_dropped_for_new_user_reference(music_service):
+    """Música pedida por usuário como referência descarta o pool da anterior"""
+    player = music_service.get_player(556)
+    videos = [
+        {"id": f"vid{i}", "title": f"Música {i}", "url": f"{VIDEO_URL}{i}"}
+        for i in range(3)
+    ]
+    player.store_autoplay_candidates(videos, "ref")
+
+    # Faixa do próprio autoplay como referência: o pool continua válido
+    assert player.take_autoplay_candidates(1, "vid0", reference_from_autoplay=True) == [
+        videos[0]
+    ]
+    # Mesma referência que gerou o pool: continua válido
+    assert player.take_autoplay_candidates(1, "ref", reference_from_autoplay=False) == [
+        videos[1]
+    ]
+    # Nova música do usuário (autoplay proativo com ela tocando): busca de novo
+    assert player.take_autoplay_candidates(1, "nova", reference_from_autoplay=False) == []
+    assert not player.autoplay_pool
+    assert player.autoplay_pool_source is None
+
+
+@pytest.mark.asyncio
+async def test_hedged_autoplay_searches_serially_with_ready_queries(
+    music_service, monkeypatch
+):
+    """Hedge: só as queries da IA rodam em paralelo; a busca seguinte só se a anterior veio vazia"""
+    from services.ai_service import ai_service
+
+    monkeypatch.setattr(config, "AUTOPLAY_HEDGE_QUOTA", 300)
+    generated = []
+    searches = []
+
+    async def fake_query(strategy, **kwargs):
+        generated.append(strategy)
+        return {"query": f"query {strategy}"}
+
+    class FakeYouTube:
+        async def get_related_videos(self, search_strategy, analysis=None, **kwargs):
+            searches.append((search_strategy, analysis))
+            return [{"id": "vid2"}] if search_strategy == 2 else []
+
+    monkeypatch.setattr(ai_service, "generate_autoplay_query", fake_query)
+
+    strategy, videos = await music_service._hedged_related_videos(
+        FakeYouTube(), 1, video_id="ref"
+    )
+
+    assert (strategy, videos) == (2, [{"id": "vid2"}])
+    # Estratégia atual gera a própria query; as seguintes já vêm prontas
+    assert sorted(generated) == [2, 3]
+    assert searches == [(1, None), (2, {"query": "query 2"})]
+
+
+@pytest.mark.asyncio
+async def test_hedged_autoplay_falls_back_to_next_strategy(music_service, monkeypatch):
+    """Hedge sem resultados: a primeira estratégia fora do hedge é tentada em série"""
+    from services.ai_service import ai_service
+    from services.youtube_service import YouTubeService
+
+    searches = []
+
+    async def fake_query(strategy, **kwargs):
+        return {"query": f"query {strategy}"}
+
+    class FakeYouTube:
+        async def get_related_videos(self, search_strategy, **kwargs):
+            searches.append(search_strategy)
+            if search_strategy != 2:
+                return []
+            return [
+                {
+                    "id": "vid2",
+                    "title": "Música 2",
+                    "url": f"{VIDEO_URL}2",
+                    "thumbnail": None,
+                    "channel": "Canal",
+                }
+            ]
+
+    async def fake_resolve(url, priority, **kwargs):
+        return {"title": "Música 2", "duration": 90}
+
+    monkeypatch.setattr(config, "AUTOPLAY_HEDGE_ENABLED", True)
+    monkeypatch.setattr(config, "AUTOPLAY_HEDGE_QUOTA", 200)
+    monkeypatch.setattr(ai_service, "generate_autoplay_query", fake_query)
+    monkeypatch.setattr(YouTubeService, "get_instance", staticmethod(FakeYouTube))
+    monkeypatch.setattr(music_service, "_resolve", fake_resolve)
+
+    player = music_service.get_player(558)
+    player.last_video_id = "ref"
+    player.is_playing = True
+
+    await music_service._fetch_autoplay_songs(player, NO_REQUESTER, proactive=True)
+
+    assert searches == [0, 1, 2]
+    assert [song.title for song in player.queue] == ["Música 2"]
@@ -0,0 +1,69 @@
+"""
+Testes do PanelScheduler com renderização falsa (sem Discord)
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from services.panel_scheduler import PanelScheduler
+
+
+def make_scheduler(rendered, active=(), **kwargs):
+    async def render(guild_id):
+        rendered.append(guild_id)
+
+    options = {"debounce": 0.05, "progress_interval": 0, "edits_per_second": 100}
+    options.update(kwargs)
+    return PanelScheduler(render=render, get_active=lambda: list(active), **options)
+
+
+@pytest.mark.asyncio
+async def test_changes_within_debounce_become_one_edit():
+    """Várias mudanças do mesmo servidor viram uma edição; servidores diferentes não se misturam"""
+    rendered: List[int] = []
+    scheduler = make_scheduler(rendered)
+    scheduler.start()
+    try:
+        for _ in range(10):
+            scheduler.mark_dirty(1)
+        scheduler.mark_dirty(2)
+        await asyncio.sleep(0.2)
+    finally:
+        scheduler.stop()
+
+    assert sorted(rendered) == [1, 2]
+    assert scheduler.get_stats()["coalesced"] == 9
+
+
+@pytest.mark.asyncio
+async def test_channel_bucket_limits_edits():
+    """Mais de 5 edições seguidas no mesmo canal esperam o bucket do Discord"""
+    rendered: List[int] = []
+    scheduler = make_scheduler(rendered, debounce=0)
+    scheduler.start()
+    try:
+        for _ in range(8):
+            scheduler.mark_dirty(1)
+            await asyncio.sleep(0.02)
+    finally:
+        scheduler.stop()
+
+    assert len(rendered) == PanelScheduler.CHANNEL_BURST
+    assert scheduler.get_stats()["throttled"] > 0
+
+
+@pytest.mark.asyncio
+async def test_progress_tick_only_for_active_guilds():
+    """O tick de progresso só re-renderiza quem está tocando"""
+    rendered: List[int] = []
+    scheduler = make_scheduler(rendered, active=[7], progress_interval=0.05)
+    scheduler.start()
+    try:
+        await asyncio.sleep(0.18)
+    finally:
+        scheduler.stop()
+
+    assert rendered and set(rendered) == {7}
+    assert scheduler.get_stats()["ticks"] >= 2
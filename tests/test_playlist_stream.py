@@ -0,0 +1,61 @@
+"""
+Testes do PlaylistStream
+Garante entrega em ordem sem bloqueio da janela e ajuste da concorrência
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from services.playlist_stream import AdaptiveConcurrency, PlaylistStream
+
+
+@pytest.mark.asyncio
+async def test_slow_item_does_not_stall_window_and_order_is_kept():
+    """Um item lento não trava os demais; a entrega segue a ordem da playlist"""
+    delays = {1: 0.3, 2: 0.01, 3: 0.01, 4: 0.01, 5: 0.01, 6: 0.01, 7: 0.01}
+    started = []
+
+    async def resolve_entry(idx, entry):
+        started.append(idx)
+        await asyncio.sleep(delays[idx])
+        if entry.get("blocked"):
+            raise ValueError("Video unavailable")
+        return entry["title"]
+
+    entries: List[Dict[str, Any]] = [{"title": f"m{i}"} for i in range(1, 8)]
+    entries[3]["blocked"] = True
+
+    stream = PlaylistStream(
+        entries, resolve_entry, AdaptiveConcurrency(initial=3, maximum=4)
+    )
+
+    first_at: Optional[float] = None
+    start = time.perf_counter()
+    titles = []
+    async for title in stream:
+        first_at = first_at or time.perf_counter() - start
+        titles.append(title)
+
+    assert titles == ["m1", "m2", "m3", "m5", "m6", "m7"]
+    # Enquanto m1 demorava, os itens seguintes foram iniciados
+    assert set(started[:5]) >= {1, 2, 3, 4}
+    assert first_at is not None and first_at < 0.5
+    assert stream.summary()["failed"] == 1
+
+
+def test_adaptive_concurrency_aimd():
+    """Cresce com latência estável e cai pela metade com lentidão/erro"""
+    concurrency = AdaptiveConcurrency(initial=4, minimum=1, maximum=8)
+
+    for _ in range(40):
+        concurrency.record(1.0, success=True)
+    assert concurrency.window == 8
+
+    concurrency.record(1.0, success=False)
+    assert concurrency.window == 4
+
+    concurrency.record(10.0, success=True)  # Latência muito acima da média
+    assert concurrency.window == 2
@@ -0,0 +1,80 @@
+"""
+Testes do SearchCache (cache persistente de buscas do YouTube)
+"""
+
+import sqlite3
+import time
+from datetime import date
+
+from utils.quota_tracker import QuotaTracker
+from utils.search_cache import SearchCache
+
+ITEMS = [{"id": {"videoId": "aaaaaaaaaaa"}, "snippet": {"title": "Música"}}]
+
+
+def test_entries_survive_restart_and_expire(tmp_path):
+    """Buscas sobrevivem a uma nova instância e expiram após o TTL"""
+    key = SearchCache.make_key("Artista  Música", maxResults=5)
+    cache = SearchCache(tmp_path / "search.db", ttl=60, max_entries=10)
+    cache.put(key, ITEMS)
+    cache.close()
+
+    cache = SearchCache(tmp_path / "search.db", ttl=60, max_entries=10)
+    assert cache.get(SearchCache.make_key("artista música", maxResults=5)) == ITEMS
+    assert cache.get(SearchCache.make_key("artista música", maxResults=10)) is None
+
+    cache.ttl = 0
+    time.sleep(0.01)
+    assert cache.get(key) is None
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    cache.close()
+
+
+def test_limit_removes_least_recently_used(tmp_path):
+    """Acima de max_entries, as buscas acessadas há mais tempo são removidas"""
+    cache = SearchCache(tmp_path / "search.db", ttl=60, max_entries=3)
+    cache.SIZE_CHECK_INTERVAL = 1
+    for i in range(5):
+        cache.put(SearchCache.make_key(f"busca {i}"), ITEMS)
+        time.sleep(0.001)
+
+    assert cache.get_stats()["entries"] == 3
+    assert cache.get(SearchCache.make_key("busca 0")) is None
+    assert cache.get(SearchCache.make_key("busca 4")) == ITEMS
+    cache.close()
+
+
+def test_reads_are_counted_in_memory_until_flush(tmp_path):
+    """Acertos/erros não gravam no banco a cada leitura, só em lote"""
+    cache = SearchCache(tmp_path / "search.db", ttl=60, max_entries=10)
+    cache.STATS_FLUSH_BATCH = 3
+    cache.put(SearchCache.make_key("busca"), ITEMS)
+
+    def stored_counts():
+        with sqlite3.connect(str(tmp_path / "search.db")) as conn:
+            row = conn.execute("SELECT SUM(hits), SUM(misses) FROM search_stats").fetchone()
+        return tuple(value or 0 for value in row)
+
+    cache.get(SearchCache.make_key("busca"))
+    cache.get(SearchCache.make_key("outra"))
+    assert stored_counts() == (0, 0)
+
+    cache.get(SearchCache.make_key("busca"))  # Lote cheio: grava os três
+    assert stored_counts() == (2, 1)
+    cache.close()
+
+
+def test_stats_use_the_quota_day(tmp_path, monkeypatch):
+    """O dia das estatísticas é o dia da quota (QuotaTracker.current_day)"""
+    monkeypatch.setattr(QuotaTracker, "current_day", staticmethod(lambda: date(2024, 1, 1)))
+    cache = SearchCache(tmp_path / "search.db", ttl=60, max_entries=10)
+    cache.get(SearchCache.make_key("busca"))
+
+    # Virada do dia da quota: o erro pendente fica no dia anterior
+    monkeypatch.setattr(QuotaTracker, "current_day", staticmethod(lambda: date(2024, 1, 2)))
+    cache.get(SearchCache.make_key("busca"))
+    cache.get(SearchCache.make_key("busca"))
+    assert cache.get_stats()["misses"] == 2
+    cache.close()
@@ -0,0 +1,101 @@
+"""
+Testes do coordenador do modo sharded (processo local, sem Discord)
+"""
+
+import socket
+
+from core.shard_coordinator import connect_coordinator, split_shards, start_coordinator
+from utils.quota_tracker import QuotaTracker
+
+
+def detach(tracker: QuotaTracker):
+    """Volta o tracker global ao modo local e encerra a thread de sync"""
+    tracker._remote = None
+    tracker._remote_wakeup.set()
+
+
+def test_split_shards_covers_every_shard_once():
+    """Cada shard fica em exatamente um processo; sem processos vazios"""
+    plan = split_shards(5, 2)
+    assert plan == [[0, 2, 4], [1, 3]]
+    assert split_shards(2, 4) == [[0], [1]]
+
+
+def test_workers_share_one_quota():
+    """Operações de um worker contam na quota do coordenador"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        address = sock.getsockname()
+    authkey = b"teste-coordenador"
+
+    manager = start_coordinator(address, authkey)
+    try:
+        remote = connect_coordinator(address, authkey)
+        before = remote.get_stats()["daily_usage"]
+
+        tracker = QuotaTracker()
+        tracker.attach_coordinator(remote)
+        try:
+            tracker.track_operation("videos_list", "teste")
+            assert tracker._sync_remote()
+            assert remote.get_stats()["daily_usage"] == before + 1
+            assert tracker.get_stats()["daily_usage"] == before + 1
+        finally:
+            detach(tracker)
+    finally:
+        manager.shutdown()
+
+
+def test_worker_counts_locally_and_sends_in_batches(monkeypatch):
+    """track_operation não espera pelo coordenador; o lote vai pela thread de sync"""
+    monkeypatch.setattr(QuotaTracker, "REMOTE_SYNC_INTERVAL", 60.0)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        address = sock.getsockname()
+    authkey = b"teste-coordenador"
+
+    manager = start_coordinator(address, authkey)
+    try:
+        remote = connect_coordinator(address, authkey)
+        tracker = QuotaTracker()
+        tracker.attach_coordinator(remote)
+        before = remote.get_stats()["daily_usage"]
+        try:
+            tracker.track_operation("videos_list", "teste")
+            tracker.track_operation("videos_list", "teste")
+
+            # Contado na hora neste worker, ainda não enviado
+            assert tracker.can_make_request("videos_list")
+            assert tracker.get_stats()["daily_usage"] == before + 2
+            assert remote.get_stats()["daily_usage"] == before
+
+            tracker.force_save()  # Acorda a thread de sync e espera o envio
+            assert remote.get_stats()["daily_usage"] == before + 2
+        finally:
+            detach(tracker)
+    finally:
+        manager.shutdown()
+
+
+def test_worker_falls_back_to_local_quota_when_coordinator_dies():
+    """Com o coordenador fora do ar, o worker conta a quota localmente"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        address = sock.getsockname()
+    authkey = b"teste-coordenador"
+
+    manager = start_coordinator(address, authkey)
+    remote = connect_coordinator(address, authkey)
+    manager.shutdown()
+
+    tracker = QuotaTracker()
+    tracker.attach_coordinator(remote)
+    before = tracker.daily_usage
+    try:
+        assert tracker.can_make_request("videos_list") is True
+        assert tracker._remote is None
+
+        tracker.track_operation("videos_list", "teste")
+        assert tracker.daily_usage == before + 1
+    finally:
+        detach(tracker)
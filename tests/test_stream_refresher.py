@@ -0,0 +1,63 @@
+"""
+Testes do StreamRefresher
+Renovação em lote das stream URLs da fila antes de expirarem
+"""
+
+import time
+from typing import Any
+
+import pytest
+
+from services.music_service import MusicPlayer, Song
+from services.stream_refresher import StreamRefresher
+
+# Músicas de teste sem usuário (Song espera um discord.Member)
+NO_REQUESTER: Any = None
+
+
+def make_song(video_id: str, expires_in: float) -> Song:
+    return Song(
+        {
+            "url": f"https://www.youtube.com/watch?v={video_id}",
+            "title": video_id,
+            "stream_url": f"https://googlevideo/{video_id}/old",
+            "stream_url_expires": time.time() + expires_in,
+        },
+        NO_REQUESTER,
+    )
+
+
+@pytest.mark.asyncio
+async def test_refreshes_expiring_songs_once_per_video():
+    """Só músicas perto de expirar são renovadas; mesmo vídeo em 2 servidores = 1 extração"""
+    calls = []
+
+    async def refresh(song, guild_id):
+        calls.append(song.title)
+        return {
+            "stream_url": f"https://googlevideo/{song.title}/new",
+            "stream_url_expires": time.time() + 6 * 3600,
+        }
+
+    first, second = MusicPlayer(guild_id=1), MusicPlayer(guild_id=2)
+    first.add_song(make_song("aaaaaaaaaaa", expires_in=60))
+    first.add_song(make_song("bbbbbbbbbbb", expires_in=4 * 3600))
+    first.add_song(
+        Song({"url": "https://youtu.be/ccccccccccc", "title": "lazy"}, NO_REQUESTER)
+    )
+    second.add_song(make_song("aaaaaaaaaaa", expires_in=300))
+
+    refresher = StreamRefresher(
+        get_players=lambda: [first, second],
+        refresh=refresh,
+        interval=60,
+        margin=900,
+        batch_size=2,
+    )
+
+    assert await refresher.refresh_due() == 1
+    assert calls == ["aaaaaaaaaaa"]
+    assert first.queue[0].stream_url.endswith("/new")
+    assert second.queue[0].stream_url.endswith("/new")
+    assert first.queue[1].stream_url.endswith("/old")
+    assert refresher.get_stats()["refreshed"] == 1
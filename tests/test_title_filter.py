@@ -0,0 +1,96 @@
+"""
+Testes do TitleFilter (filtros de título/canal do autoplay)
+"""
+
+import re
+from typing import Optional
+
+from services.title_filter import (
+    ALTERNATIVE_VERSION_KEYWORDS,
+    EXCLUDED_KEYWORDS,
+    EXPLANATORY_PATTERNS,
+    NON_MUSIC_RULES,
+    SUSPICIOUS_CHANNEL_KEYWORDS,
+    keyword_pattern,
+    title_filter,
+)
+
+TITLES = [
+    ("Anitta - Envolver (Official Music Video)", "Anitta"),
+    ("REAGINDO a Bohemian Rhapsody pela primeira vez", "Canal"),
+    ("Como tocar Wonderwall no violão", "Violão Fácil"),
+    ("De onde vem o funk carioca?", "Canal"),
+    ("Top 50 sertanejo - 3 horas", "Mix"),
+    ("The Weeknd - Blinding Lights (slowed + reverb)", "Slowed"),
+    ("Legião Urbana - Tempo Perdido", "Legião Urbana"),
+    ("Tim Maia - Primavera", "Tim Maia Podcast"),
+    ("Coldplay - Yellow (Live at Glastonbury)", "Coldplay"),
+    ("Djavan - Oceano", "Djavan"),
+    ("Artist - live stream 24/7", "Artist"),
+    ("Remix playlist 2024", "Canal"),
+    ("Banda - Song lives", "Banda"),
+]
+
+
+def legacy_rejects(title: str, channel: str) -> bool:
+    """Decisão dos filtros como eram no get_related_videos"""
+    title_lower, channel_lower = title.lower(), channel.lower()
+    return (
+        any(re.search(pattern, title_lower) for pattern in EXPLANATORY_PATTERNS)
+        or any(kw in channel_lower for kw in SUSPICIOUS_CHANNEL_KEYWORDS)
+        or any(kw in title_lower for kw in EXCLUDED_KEYWORDS)
+        or any(kw in title_lower for kw in ALTERNATIVE_VERSION_KEYWORDS)
+    )
+
+
+def test_same_decisions_as_keyword_lists():
+    """A regex compilada aceita/rejeita exatamente os mesmos títulos"""
+    for title, channel in TITLES:
+        assert (title_filter.check(title, channel) is not None) == legacy_rejects(
+            title, channel
+        ), title
+
+
+def rule_of(title: str, channel: str = "") -> Optional[str]:
+    """Regra que rejeitou o vídeo (None = passou)"""
+    rejected = title_filter.check(title, channel)
+    return rejected[0] if rejected else None
+
+
+def test_reports_matched_rule():
+    """O filtro informa a regra e o trecho que bateram"""
+    assert rule_of("De onde vem o samba?") == "explanatory"
+    assert title_filter.check("Tim Maia - Primavera", "Tim Maia Podcast") == (
+        "channel",
+        "podcast",
+    )
+    assert title_filter.check("Artista - Música (ao vivo)") == ("excluded", "ao vivo")
+    assert title_filter.check("Artista - Música (Karaoke)") == ("alternative", "karaoke")
+    assert title_filter.check("Djavan - Oceano", "Djavan") is None
+
+
+def test_mixed_titles_follow_rule_order():
+    """Palavra de conteúdo não-musical vence a de versão alternativa, mesmo
+    aparecendo depois no título"""
+    assert title_filter.check("Artist - live stream 24/7") == ("excluded", "stream")
+    assert rule_of("Remix playlist 2024") == "excluded"
+    assert title_filter.check("Banda - Song lives") == ("excluded", "lives")
+
+
+def test_rules_restrict_the_check():
+    """Com `rules`, só as regras pedidas descartam (busca do autoplay)"""
+    assert title_filter.check("Artist - live stream 24/7", rules=NON_MUSIC_RULES)
+    assert title_filter.check("Banda - Song lives", rules=NON_MUSIC_RULES)
+    assert title_filter.check("Coldplay - Yellow (Live)", rules=NON_MUSIC_RULES) is None
+    assert title_filter.check("Tim Maia - Primavera", "Podcast", rules=("alternative",)) is None
+
+
+def test_keyword_pattern_is_substring_search():
+    """A trie mantém a semântica de `kw in título` (inclusive dentro de palavras)"""
+    pattern = re.compile(keyword_pattern(["hour", "hours", "mix", "c++"]))
+    match = pattern.search("1 hours of music")
+    assert match is not None and match.group() == "hour"
+    assert pattern.search("remixed")
+    assert pattern.search("c++ tutorial")
+    assert not pattern.search("hora")
+    assert not re.search(keyword_pattern([]), "qualquer coisa")
@@ -0,0 +1,211 @@
+"""
+Testes do YouTubeService
+Garante que nenhuma chamada da API do YouTube roda na thread do event loop
+e que buscas repetidas saem do cache sem gastar quota
+"""
+
+import threading
+import time
+
+import pytest
+
+from services.youtube_service import YouTubeService
+from utils.api_executor import api_executor
+from utils.quota_tracker import quota_tracker
+from utils.search_cache import SearchCache
+
+
+def make_search_item(video_id: str, title: str, channel: str = "Canal") -> dict:
+    """Cria um item no formato retornado por search().list()"""
+    return {
+        "id": {"videoId": video_id},
+        "snippet": {
+            "title": title,
+            "channelTitle": channel,
+            "thumbnails": {"medium": {"url": f"https://img/{video_id}.jpg"}},
+        },
+    }
+
+
+class FakeRequest:
+    """Simula um HttpRequest do googleapiclient"""
+
+    def __init__(self, response: dict, calls: list, delay: float = 0.0):
+        self.response = response
+        self.calls = calls
+        self.delay = delay
+
+    def execute(self):
+        self.calls.append(threading.get_ident())
+        if self.delay:
+            time.sleep(self.delay)
+        return self.response
+
+
+class FakeResource:
+    """Simula um recurso (search/videos) da API"""
+
+    def __init__(self, response_factory, calls: list, delay: float = 0.0):
+        self.response_factory = response_factory
+        self.calls = calls
+        self.delay = delay
+
+    def list(self, **kwargs):
+        return FakeRequest(self.response_factory(kwargs), self.calls, self.delay)
+
+
+class FakeYouTubeClient:
+    """Cliente falso que registra a thread de cada execute()"""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls: list = []
+        self.delay = delay
+
+    def search(self):
+        def response(kwargs):
+            return {
+                "items": [
+                    make_search_item("aaaaaaaaaaa", "Artista - Música Um (Official Video)"),
+                    make_search_item("bbbbbbbbbbb", "Artista - Música Dois (Official Audio)"),
+                ]
+            }
+
+        return FakeResource(response, self.calls, self.delay)
+
+    def videos(self):
+        def response(kwargs):
+            ids = kwargs["id"].split(",")
+            return {
+                "items": [
+                    {
+                        "id": vid,
+                        "snippet": {
+                            "title": f"Vídeo {vid}",
+                            "channelTitle": "Canal",
+                            "description": "",
+                            "thumbnails": {"high": {"url": ""}},
+                        },
+                        "contentDetails": {"duration": "PT3M45S"},
+                        "statistics": {},
+                    }
+                    for vid in ids
+                ]
+            }
+
+        return FakeResource(response, self.calls, self.delay)
+
+
+@pytest.fixture
+def youtube_service(monkeypatch):
+    """YouTubeService com cliente falso e quota sem I/O em disco"""
+    service = YouTubeService.get_instance()
+    monkeypatch.setattr(service, "youtube", FakeYouTubeClient())
+    monkeypatch.setattr(service, "search_cache", None)
+    monkeypatch.setattr(quota_tracker, "track_operation", lambda *a, **k: None)
+    monkeypatch.setattr(quota_tracker, "can_make_request", lambda *a, **k: True)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_api_calls_never_run_on_loop_thread(youtube_service):
+    """Todas as chamadas execute() devem rodar fora da thread do event loop"""
+    loop_thread = threading.get_ident()
+
+    results = await youtube_service.search_video("artista", max_results=2)
+    info = await youtube_service.get_video_info("aaaaaaaaaaa")
+    durations = await youtube_service.get_videos_duration_batch(
+        ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+    )
+    related = await youtube_service.get_related_videos(
+        video_id="ccccccccccc",
+        max_results=2,
+        video_title="Outro Artista - Outra Música",
+        video_channel="Outro Canal",
+    )
+
+    assert len(results) == 2
+    assert info["id"] == "aaaaaaaaaaa"
+    assert durations == {"aaaaaaaaaaa": 4, "bbbbbbbbbbb": 4}
+    assert len(related) == 2
+
+    calls = youtube_service.youtube.calls
+    assert len(calls) == 5
+    assert loop_thread not in calls
+
+
+@pytest.mark.asyncio
+async def test_slow_api_call_times_out_without_blocking_loop(youtube_service, monkeypatch):
+    """Chamada lenta deve estourar o timeout e deixar o loop livre"""
+    monkeypatch.setattr(youtube_service, "youtube", FakeYouTubeClient(delay=0.5))
+    monkeypatch.setattr(api_executor, "default_timeout", 0.05)
+
+    start = time.perf_counter()
+    results = await youtube_service.search_video("artista")
+    elapsed = time.perf_counter() - start
+
+    assert results == []
+    assert elapsed < 0.4
+    assert api_executor.get_stats()["timeouts"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_repeated_search_uses_cache_without_quota(youtube_service, monkeypatch, tmp_path):
+    """A mesma busca (query normalizada) só vai à API e conta quota uma vez"""
+    tracked = []
+    monkeypatch.setattr(quota_tracker, "track_operation", lambda op, *a: tracked.append(op))
+    cache = SearchCache(tmp_path / "search.db", ttl=60, max_entries=10)
+    monkeypatch.setattr(youtube_service, "search_cache", cache)
+
+    first = await youtube_service.search_video("Artista  Música", max_results=2)
+    second = await youtube_service.search_video("artista música", max_results=2)
+    other = await youtube_service.search_video("artista música", max_results=3)
+    stats = cache.get_stats()
+    cache.close()
+
+    assert first == second
+    assert len(other) == 2
+    assert tracked == ["search", "search"]  # Só os dois erros de cache
+    assert len(youtube_service.youtube.calls) == 2
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+
+@pytest.mark.asyncio
+async def test_related_without_quota_only_uses_cached_search(
+    youtube_service, monkeypatch, tmp_path
+):
+    """Sem quota, relacionados só saem de uma busca já em cache (lida fora do loop)"""
+    loop_thread = threading.get_ident()
+    cache = SearchCache(tmp_path / "search.db", ttl=60, max_entries=10)
+    cache_threads = []
+    original_get = cache.get
+
+    def tracking_get(key):
+        cache_threads.append(threading.get_ident())
+        return original_get(key)
+
+    monkeypatch.setattr(cache, "get", tracking_get)
+    monkeypatch.setattr(youtube_service, "search_cache", cache)
+    kwargs = dict(video_id="ccccccccccc", max_results=2, video_channel="Outro Canal")
+
+    # Busca feita com quota fica em cache
+    related = await youtube_service.get_related_videos(
+        video_title="Outro Artista - Outra Música", **kwargs
+    )
+    assert len(related) == 2
+    api_calls = len(youtube_service.youtube.calls)
+
+    monkeypatch.setattr(quota_tracker, "can_make_request", lambda *a, **k: False)
+    cached = await youtube_service.get_related_videos(
+        video_title="Outro Artista - Outra Música", **kwargs
+    )
+    missing = await youtube_service.get_related_videos(
+        video_title="Terceiro Artista - Nova Música", **kwargs
+    )
+    cache.close()
+
+    assert [v["id"] for v in cached] == [v["id"] for v in related]
+    assert missing == []
+    # Só a validação de duração dos vídeos em cache foi à API
+    assert len(youtube_service.youtube.calls) == api_calls + 1
+    assert cache_threads and loop_thread not in cache_threads
@@ -4,5 +4,17 @@ Utilitários diversos para o bot
 """
 
 from .quota_tracker import QuotaTracker, quota_tracker
+from .api_executor import ApiExecutor, api_executor
+from .metadata_store import MetadataStore
+from .audio_cache import AudioCache
+from .search_cache import SearchCache
 
-__all__ = ["QuotaTracker", "quota_tracker"]
+__all__ = [
+    "QuotaTracker",
+    "quota_tracker",
+    "ApiExecutor",
+    "api_executor",
+    "MetadataStore",
+    "AudioCache",
+    "SearchCache",
+]
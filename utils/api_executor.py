@@ -0,0 +1,163 @@
+"""
+API Executor - Execução assíncrona de chamadas bloqueantes
+Isola as chamadas síncronas do googleapiclient em um pool de threads dedicado
+para que nenhuma requisição HTTP rode na thread do event loop
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from core.logger import LoggerFactory
+from config import config
+
+logger = LoggerFactory.create_logger(__name__)
+
+
+class ApiExecutor:
+    """
+    Singleton que executa chamadas bloqueantes da API em threads dedicadas
+
+    - Pool próprio (não compete com o executor padrão usado pelo yt-dlp)
+    - Concorrência limitada por semáforo (chamadas extras aguardam no loop)
+    - Timeout por chamada
+    - Métricas de tempo de execução e de espera por uma thread livre
+    """
+
+    _instance: Optional["ApiExecutor"] = None
+    _initialized: bool
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.max_workers = max(1, config.YOUTUBE_API_WORKERS)
+        self.default_timeout = config.YOUTUBE_API_TIMEOUT
+
+        # Pool criado sob demanda (evita threads ociosas se a API nunca for usada)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+        self._stats_lock = threading.Lock()
+
+        # 📊 Métricas
+        self._calls = 0
+        self._errors = 0
+        self._timeouts = 0
+        self._in_flight = 0
+        self._total_exec_time = 0.0  # Tempo gasto nas threads do pool
+        self._max_exec_time = 0.0
+        self._total_queue_wait = 0.0  # Espera por uma vaga no pool (semáforo)
+        self._max_queue_wait = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Retorna o pool de threads (cria na primeira chamada)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="youtube-api"
+            )
+        return self._executor
+
+    def _record_queue_wait(self, elapsed: float):
+        """Acumula o tempo que uma chamada esperou por uma thread livre"""
+        self._total_queue_wait += elapsed
+        self._max_queue_wait = max(self._max_queue_wait, elapsed)
+
+    async def run(
+        self,
+        func: Callable[[], Any],
+        timeout: Optional[float] = None,
+        label: str = "api",
+    ) -> Any:
+        """
+        Executa uma chamada bloqueante no pool dedicado
+
+        Args:
+            func: Função síncrona sem argumentos (ex: request.execute)
+            timeout: Timeout em segundos (padrão: YOUTUBE_API_TIMEOUT)
+            label: Nome da operação (usado nos logs)
+
+        Returns:
+            Resultado da função
+
+        Raises:
+            asyncio.TimeoutError: Se a chamada exceder o timeout
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+
+        def timed_call():
+            start = time.perf_counter()
+            try:
+                return func()
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._stats_lock:
+                    self._total_exec_time += elapsed
+                    self._max_exec_time = max(self._max_exec_time, elapsed)
+
+        loop = asyncio.get_running_loop()
+        self._calls += 1
+        self._in_flight += 1
+
+        try:
+
+            async def bounded_call():
+                queued_at = time.perf_counter()
+                async with self._semaphore:
+                    # Pool cheio: a chamada espera no loop (sem bloqueá-lo)
+                    self._record_queue_wait(time.perf_counter() - queued_at)
+                    return await loop.run_in_executor(self._get_executor(), timed_call)
+
+            return await asyncio.wait_for(bounded_call(), timeout=timeout)
+
+        except asyncio.TimeoutError:
+            # A thread continua até a requisição terminar, mas o loop não espera por ela
+            self._timeouts += 1
+            logger.warning(f"⏱️ Timeout na chamada da API ({label}) após {timeout}s")
+            raise
+        except Exception:
+            self._errors += 1
+            raise
+        finally:
+            self._in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do executor
+
+        Returns:
+            Dicionário com métricas de chamadas, timeouts e espera por threads
+        """
+        avg_exec = self._total_exec_time / self._calls if self._calls else 0.0
+        avg_wait = self._total_queue_wait / self._calls if self._calls else 0.0
+
+        return {
+            "workers": self.max_workers,
+            "calls": self._calls,
+            "errors": self._errors,
+            "timeouts": self._timeouts,
+            "in_flight": self._in_flight,
+            "avg_exec_ms": avg_exec * 1000,
+            "max_exec_ms": self._max_exec_time * 1000,
+            "avg_queue_wait_ms": avg_wait * 1000,
+            "max_queue_wait_ms": self._max_queue_wait * 1000,
+        }
+
+    def shutdown(self):
+        """Encerra o pool de threads (chamar no shutdown do bot)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.debug("🧹 Pool de threads da API encerrado")
+
+
+# Instância global (Singleton)
+api_executor = ApiExecutor()
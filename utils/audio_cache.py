@@ -0,0 +1,319 @@
+"""
+Audio Cache - Cache local de áudio (Opus) das músicas mais tocadas
+Depois que uma música é tocada `min_plays` vezes (e a reprodução termina) o
+áudio é baixado e codificado em Opus em background; as próximas reproduções
+tocam do disco, sem baixar de novo do googlevideo
+"""
+
+import asyncio
+import functools
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from core.logger import LoggerFactory
+
+logger = LoggerFactory.create_logger(__name__)
+
+
+class AudioCache:
+    """
+    Cache de arquivos Opus em disco (um arquivo por vídeo)
+
+    - Limitado por max_size_mb: remove primeiro os menos tocados (LFU) e,
+      entre eles, os tocados há mais tempo (LRU)
+    - Contadores de reprodução salvos em index.json (sobrevivem a reinícios)
+    - Só cacheia músicas de até max_duration segundos (evita mixes de horas)
+    - Só cacheia músicas tocadas pelo menos min_plays vezes: o preenchimento
+      baixa a stream de novo, então músicas tocadas uma vez só não gastam
+      banda em dobro
+    - Exige ffmpeg no PATH (sem ffmpeg o cache fica desativado)
+    """
+
+    INDEX_FILE = "index.json"
+    SUFFIX = ".opus"
+
+    # Opus 128 kbps: transparente para música, ~1 MB por minuto
+    BITRATE = "128k"
+
+    # Máximo de vídeos fora do cache com reproduções contadas (memória)
+    PLAY_COUNT_LIMIT = 5000
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_size_mb: float,
+        max_duration: int,
+        max_concurrent_fills: int = 2,
+        min_plays: int = 1,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_duration = max_duration
+        self.min_plays = max(1, min_plays)
+
+        self.ffmpeg = shutil.which("ffmpeg")
+        if not self.ffmpeg:
+            logger.warning("⚠️ ffmpeg não encontrado: cache de áudio local desativado")
+
+        # video_id -> {"size", "hits", "last_access"}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._plays: Dict[str, int] = {}  # video_id fora do cache -> reproduções
+        self._fills: Dict[str, asyncio.Task] = {}
+        self._processes: Dict[str, asyncio.subprocess.Process] = {}
+        self._fill_slots = asyncio.Semaphore(max(1, max_concurrent_fills))
+
+        # 📊 Métricas
+        self._hits = 0
+        self._misses = 0
+        self._filled = 0
+        self._fill_errors = 0
+        self._evictions = 0
+
+        self._load_index()
+
+    @property
+    def available(self) -> bool:
+        """True se o cache pode ser preenchido (ffmpeg disponível)"""
+        return self.ffmpeg is not None
+
+    def _path(self, video_id: str) -> Path:
+        return self.cache_dir / f"{video_id}{self.SUFFIX}"
+
+    def _load_index(self):
+        """Reconcilia o index.json com os arquivos presentes no diretório"""
+        saved: Dict[str, Dict[str, Any]] = {}
+        index_path = self.cache_dir / self.INDEX_FILE
+        if index_path.exists():
+            try:
+                saved = json.loads(index_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Índice do cache de áudio inválido, recriando: {e}")
+
+        for path in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            stat = path.stat()
+            entry = saved.get(path.stem, {})
+            self._entries[path.stem] = {
+                "size": stat.st_size,
+                "hits": int(entry.get("hits", 0)),
+                "last_access": float(entry.get("last_access", stat.st_mtime)),
+            }
+
+        # Sobras de preenchimentos interrompidos
+        for partial in self.cache_dir.glob("*.part"):
+            partial.unlink(missing_ok=True)
+
+        if self._entries:
+            logger.info(
+                f"💽 Cache de áudio: {len(self._entries)} música(s), "
+                f"{self._used_bytes() / 1024 / 1024:.1f} MB"
+            )
+        self._enforce_size_limit()
+
+    def _save_index(self):
+        """Salva os contadores de reprodução"""
+        try:
+            (self.cache_dir / self.INDEX_FILE).write_text(
+                json.dumps(self._entries), encoding="utf-8"
+            )
+        except OSError as e:
+            logger.warning(f"⚠️ Erro ao salvar índice do cache de áudio: {e}")
+
+    def _used_bytes(self) -> int:
+        return sum(entry["size"] for entry in self._entries.values())
+
+    def get(self, video_id: str) -> Optional[Path]:
+        """
+        Retorna o arquivo em cache de um vídeo (contando a reprodução)
+
+        Args:
+            video_id: ID do vídeo
+
+        Returns:
+            Caminho do arquivo Opus ou None se não estiver em cache
+        """
+        entry = self._entries.get(video_id)
+        path = self._path(video_id)
+
+        if entry is None or not path.exists():
+            self._entries.pop(video_id, None)
+            self._misses += 1
+            self._count_play(video_id)
+            return None
+
+        entry["hits"] += 1
+        entry["last_access"] = time.time()
+        self._hits += 1
+        return path
+
+    def _count_play(self, video_id: str):
+        """Conta uma reprodução de um vídeo fora do cache"""
+        self._plays[video_id] = self._plays.pop(video_id, 0) + 1
+        if len(self._plays) > self.PLAY_COUNT_LIMIT:
+            # Descarta o contado há mais tempo (ordem de inserção)
+            self._plays.pop(next(iter(self._plays)))
+
+    def schedule_fill(self, video_id: str, stream_url: str, duration: int):
+        """
+        Baixa e codifica a música em background (se ainda não estiver em cache)
+
+        Chamar quando a reprodução terminar (o download não disputa banda com
+        a música tocando); só preenche após `min_plays` reproduções.
+
+        Args:
+            video_id: ID do vídeo
+            stream_url: URL da stream de áudio (googlevideo)
+            duration: Duração em segundos (0 = desconhecida)
+        """
+        if (
+            not self.available
+            or not stream_url
+            or video_id in self._entries
+            or video_id in self._fills
+            or not duration  # Duração desconhecida (ex: live)
+            or duration > self.max_duration
+            or self._plays.get(video_id, 0) < self.min_plays
+        ):
+            return
+
+        self._plays.pop(video_id, None)
+
+        task = asyncio.create_task(self._fill(video_id, stream_url))
+        self._fills[video_id] = task
+        task.add_done_callback(functools.partial(self._on_fill_done, video_id))
+
+    def _on_fill_done(self, video_id: str, task: asyncio.Task):
+        """Libera o vídeo e consome erros inesperados do preenchimento"""
+        self._fills.pop(video_id, None)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self._fill_errors += 1
+            logger.warning(f"⚠️ Erro inesperado ao cachear áudio de {video_id}: {error}")
+
+    async def _fill(self, video_id: str, stream_url: str):
+        """Executa o ffmpeg: stream remota -> arquivo .opus (via .part temporário)"""
+        if self.ffmpeg is None:
+            return
+
+        async with self._fill_slots:
+            final_path = self._path(video_id)
+            partial_path = final_path.with_suffix(".part")
+
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    self.ffmpeg,
+                    "-nostdin",
+                    "-loglevel", "error",
+                    "-reconnect", "1",
+                    "-reconnect_streamed", "1",
+                    "-reconnect_delay_max", "5",
+                    "-i", stream_url,
+                    "-vn",
+                    "-c:a", "libopus",
+                    "-b:a", self.BITRATE,
+                    "-f", "ogg",
+                    "-y", str(partial_path),
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            except OSError as e:
+                # ffmpeg removido/sem permissão depois da inicialização
+                self._fill_errors += 1
+                logger.warning(f"⚠️ Não foi possível iniciar o ffmpeg para {video_id}: {e}")
+                return
+
+            self._processes[video_id] = process
+            try:
+                _, stderr = await process.communicate()
+            except asyncio.CancelledError:
+                if process.returncode is None:
+                    process.kill()
+                partial_path.unlink(missing_ok=True)
+                raise
+            finally:
+                self._processes.pop(video_id, None)
+
+            if process.returncode != 0 or not partial_path.exists():
+                self._fill_errors += 1
+                partial_path.unlink(missing_ok=True)
+                logger.warning(
+                    f"⚠️ Falha ao cachear áudio de {video_id}: "
+                    f"{stderr.decode(errors='ignore').strip()[:100]}"
+                )
+                return
+
+            partial_path.replace(final_path)
+            self._entries[video_id] = {
+                "size": final_path.stat().st_size,
+                "hits": 1,  # A reprodução que disparou o preenchimento
+                "last_access": time.time(),
+            }
+            self._filled += 1
+            logger.debug(f"💽 Áudio cacheado: {video_id}")
+
+            # O arquivo recém-baixado não é candidato: senão, com o cache cheio
+            # de músicas já tocadas, todo preenchimento seria descartado logo após
+            # o download
+            self._enforce_size_limit(keep=video_id)
+            self._save_index()
+
+    def _enforce_size_limit(self, keep: Optional[str] = None):
+        """
+        Remove os menos tocados (e, no empate, os mais antigos) até caber no limite
+
+        Args:
+            keep: Vídeo que não pode ser removido nesta passada (recém-cacheado)
+        """
+        used = self._used_bytes()
+        if used <= self.max_size_bytes:
+            return
+
+        victims = sorted(
+            (vid for vid in self._entries if vid != keep),
+            key=lambda vid: (self._entries[vid]["hits"], self._entries[vid]["last_access"]),
+        )
+        removed = 0
+        for video_id in victims:
+            if used <= self.max_size_bytes:
+                break
+            used -= self._entries.pop(video_id)["size"]
+            self._path(video_id).unlink(missing_ok=True)
+            removed += 1
+
+        self._evictions += removed
+        logger.info(f"🧹 Cache de áudio acima do limite: {removed} música(s) removida(s)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do cache de áudio
+
+        Returns:
+            Dicionário com músicas em cache, tamanho, hits/misses e preenchimentos
+        """
+        total = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "size_mb": self._used_bytes() / 1024 / 1024,
+            "max_size_mb": self.max_size_bytes / 1024 / 1024,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": (self._hits / total * 100) if total else 0.0,
+            "filling": len(self._fills),
+            "filled": self._filled,
+            "fill_errors": self._fill_errors,
+            "evictions": self._evictions,
+        }
+
+    def close(self):
+        """Cancela preenchimentos em andamento e salva o índice (chamar no shutdown)"""
+        for process in list(self._processes.values()):
+            if process.returncode is None:
+                process.kill()
+        for task in list(self._fills.values()):
+            task.cancel()
+        self._save_index()
@@ -0,0 +1,297 @@
+"""
+Metadata Store - Cache persistente de metadados de vídeos
+Armazena em SQLite (em config.CACHE_DIR) os dados já extraídos pelo yt-dlp
+para que sobrevivam a reinícios do bot
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.logger import LoggerFactory
+
+logger = LoggerFactory.create_logger(__name__)
+
+
+class MetadataStore:
+    """
+    Cache persistente de metadados de vídeos (SQLite)
+
+    TTL por campo:
+        - Campos estáticos (título, duração, canal, thumbnail) não expiram
+        - stream_url expira em stream_url_expires (URLs do googlevideo são temporárias)
+
+    O tamanho do banco é limitado por max_size_mb: quando o limite é
+    ultrapassado, os vídeos acessados há mais tempo são removidos.
+
+    Escritas (novos vídeos e horário de último acesso) ficam em memória e
+    são gravadas em lote - a cada FLUSH_BATCH alterações, FLUSH_INTERVAL
+    segundos ou no close() - para não fazer um commit em disco por consulta
+    na thread do event loop.
+    """
+
+    # Campos que não expiram (acodec: codec do formato de áudio escolhido)
+    STATIC_FIELDS = ("url", "title", "duration", "thumbnail", "uploader", "acodec")
+
+    # Verificar tamanho do banco a cada N escritas
+    SIZE_CHECK_INTERVAL = 50
+
+    # Gravar alterações pendentes a cada N alterações ou N segundos
+    FLUSH_BATCH = 50
+    FLUSH_INTERVAL = 30.0
+
+    def __init__(self, db_path: Path, max_size_mb: int):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+
+        self._lock = threading.Lock()
+        self._writes_since_check = 0
+
+        # Alterações ainda não gravadas (com lock)
+        self._pending_writes: Dict[str, Tuple[str, Optional[str], float]] = {}
+        self._pending_access: Dict[str, float] = {}
+        self._last_flush = time.monotonic()
+
+        # check_same_thread=False: o acesso é serializado pelo lock
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, timeout=5.0
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS videos (
+                video_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                stream_url TEXT,
+                stream_expires REAL NOT NULL DEFAULT 0,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_videos_last_access ON videos(last_access)"
+        )
+        self._conn.commit()
+
+    def _row_to_record(
+        self, data: str, stream_url: Optional[str], stream_expires: float, min_ttl: float
+    ) -> Dict[str, Any]:
+        """Converte uma linha do banco em registro, descartando stream expirada"""
+        record: Dict[str, Any] = json.loads(data)
+
+        if stream_url and stream_expires - time.time() > min_ttl:
+            record["stream_url"] = stream_url
+            record["stream_url_expires"] = stream_expires
+        else:
+            record["stream_url"] = ""
+            record["stream_url_expires"] = 0
+
+        return record
+
+    def get(self, video_id: str, min_ttl: float = 0) -> Optional[Dict[str, Any]]:
+        """
+        Busca metadados de um vídeo
+
+        Args:
+            video_id: ID do vídeo
+            min_ttl: Tempo mínimo (s) de validade restante para retornar a stream_url
+
+        Returns:
+            Registro com campos estáticos e stream_url (vazia se expirada) ou None
+        """
+        try:
+            with self._lock:
+                row = self._pending_writes.get(video_id)
+                if row is None:
+                    row = self._conn.execute(
+                        "SELECT data, stream_url, stream_expires FROM videos WHERE video_id = ?",
+                        (video_id,),
+                    ).fetchone()
+
+                if row is None:
+                    return None
+
+                # Último acesso só em memória (gravado no próximo lote)
+                self._pending_access[video_id] = time.time()
+                self._maybe_flush()
+
+            return self._row_to_record(row[0], row[1], row[2], min_ttl)
+
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Erro ao ler cache persistente ({video_id}): {e}")
+            return None
+
+    def put(self, video_id: str, record: Dict[str, Any]):
+        """
+        Salva (ou atualiza) metadados de um vídeo
+
+        Args:
+            video_id: ID do vídeo
+            record: Registro compacto (url, title, duration, thumbnail,
+                    uploader, stream_url, stream_url_expires)
+        """
+        static = {field: record.get(field) for field in self.STATIC_FIELDS}
+
+        with self._lock:
+            self._pending_writes[video_id] = (
+                json.dumps(static, ensure_ascii=False),
+                record.get("stream_url") or None,
+                record.get("stream_url_expires") or 0,
+            )
+            self._pending_access[video_id] = time.time()
+            self._maybe_flush()
+
+    def _maybe_flush(self):
+        """Grava as alterações pendentes se o lote encheu ou o intervalo passou (com lock)"""
+        pending = len(self._pending_access)  # Toda escrita também marca acesso
+        if pending >= self.FLUSH_BATCH or (
+            pending and time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL
+        ):
+            self._flush()
+
+    def _flush(self):
+        """Grava em uma única transação os vídeos novos e os últimos acessos (com lock)"""
+        self._last_flush = time.monotonic()
+        if not self._pending_writes and not self._pending_access:
+            return
+
+        writes, self._pending_writes = self._pending_writes, {}
+        accesses, self._pending_access = self._pending_access, {}
+        now = time.time()
+
+        try:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO videos
+                    (video_id, data, stream_url, stream_expires, last_access)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (video_id, data, stream_url, stream_expires, accesses.get(video_id, now))
+                    for video_id, (data, stream_url, stream_expires) in writes.items()
+                ],
+            )
+            self._conn.executemany(
+                "UPDATE videos SET last_access = ? WHERE video_id = ?",
+                [
+                    (accessed, video_id)
+                    for video_id, accessed in accesses.items()
+                    if video_id not in writes
+                ],
+            )
+            self._conn.commit()
+
+            self._writes_since_check += len(writes)
+            if self._writes_since_check >= self.SIZE_CHECK_INTERVAL:
+                self._writes_since_check = 0
+                self._enforce_size_limit()
+
+        except sqlite3.Error as e:
+            logger.warning(
+                f"⚠️ Erro ao salvar cache persistente ({len(writes)} vídeo(s)): {e}"
+            )
+
+    def flush(self):
+        """Grava imediatamente as alterações pendentes"""
+        with self._lock:
+            self._flush()
+
+    def load_recent(
+        self, limit: int, min_ttl: float = 0
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Carrega os vídeos acessados mais recentemente (para aquecer o cache LRU)
+
+        Args:
+            limit: Número máximo de vídeos
+            min_ttl: Tempo mínimo de validade restante para manter a stream_url
+
+        Returns:
+            Lista de (video_id, registro) do menos para o mais recente
+        """
+        try:
+            with self._lock:
+                self._flush()
+                rows = self._conn.execute(
+                    """
+                    SELECT video_id, data, stream_url, stream_expires FROM videos
+                    ORDER BY last_access DESC LIMIT ?
+                    """,
+                    (limit,),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Erro ao carregar cache persistente: {e}")
+            return []
+
+        # Ordem crescente de acesso: o mais recente fica no final do LRU
+        return [
+            (row[0], self._row_to_record(row[1], row[2], row[3], min_ttl))
+            for row in reversed(rows)
+        ]
+
+    def _used_bytes(self) -> int:
+        """Bytes efetivamente usados pelo banco (descontando páginas livres)"""
+        page_size: int = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count: int = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages: int = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    def _enforce_size_limit(self):
+        """Remove os vídeos menos acessados até caber em max_size_mb (com lock)"""
+        used = self._used_bytes()
+        if used <= self.max_size_bytes:
+            return
+
+        total = self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+        # Remover proporcionalmente ao excesso (+10% de folga)
+        excess_ratio = 1 - (self.max_size_bytes / used)
+        to_remove = max(1, int(total * min(1.0, excess_ratio + 0.1)))
+
+        self._conn.execute(
+            """
+            DELETE FROM videos WHERE video_id IN (
+                SELECT video_id FROM videos ORDER BY last_access ASC LIMIT ?
+            )
+            """,
+            (to_remove,),
+        )
+        self._conn.commit()
+        logger.info(
+            f"🧹 Cache persistente acima do limite ({used / 1024 / 1024:.1f}MB): "
+            f"{to_remove} vídeo(s) removido(s)"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do cache persistente
+
+        Returns:
+            Dicionário com número de vídeos e tamanho em MB
+        """
+        try:
+            with self._lock:
+                self._flush()
+                entries = self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+                used = self._used_bytes()
+        except sqlite3.Error:
+            entries, used = 0, 0
+
+        return {
+            "entries": entries,
+            "size_mb": used / 1024 / 1024,
+            "max_size_mb": self.max_size_bytes / 1024 / 1024,
+        }
+
+    def close(self):
+        """Grava as alterações pendentes e fecha o banco (chamar no shutdown do bot)"""
+        with self._lock:
+            self._flush()
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
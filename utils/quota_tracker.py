@@ -4,9 +4,10 @@ Rastreia consumo de quota e exibe estatísticas em tempo real
 """
 
 import json
-from datetime import datetime, timedelta
+import threading
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 from core.logger import LoggerFactory
 
 logger = LoggerFactory.create_logger(__name__)
@@ -17,7 +18,8 @@ class QuotaTracker:
     Singleton para rastrear uso de quota da YouTube API e Groq API
     """
 
-    _instance = None
+    _instance: Optional["QuotaTracker"] = None
+    _initialized: bool
 
     # Limites da API (YouTube Data API v3 - Free Tier)
     DAILY_LIMIT = 10000
@@ -28,6 +30,11 @@ class QuotaTracker:
     GROQ_DAILY_LIMIT = 14400  # 14.4K requests/day
     GROQ_PER_MINUTE_LIMIT = 30  # 30 requests/minute
 
+    # Modo sharded: intervalo (segundos) de envio das operações ao coordenador
+    REMOTE_SYNC_INTERVAL = 2.0
+    # Espera máxima do force_save pelo envio final ao coordenador
+    REMOTE_FLUSH_TIMEOUT = 5.0
+
     # Custos de cada operação
     OPERATION_COSTS = {
         "search": 100,
@@ -72,8 +79,141 @@ class QuotaTracker:
         self._last_save_time = datetime.now()
         self._dirty = False  # Flag indicando mudanças não salvas
 
+        # 🧭 Modo sharded: quota única no coordenador (proxy), None = local.
+        # Operações são contadas localmente e enviadas em lote por uma thread
+        # (o event loop nunca espera pelo coordenador)
+        self._remote = None
+        self._remote_lock = threading.Lock()
+        self._remote_pending: List[Tuple[str, str]] = []
+        self._remote_stats: Dict[str, Any] = {}
+        self._remote_wakeup = threading.Event()
+        self._remote_save = threading.Event()  # force_save pedido
+        self._remote_flushed = threading.Event()  # force_save atendido
+
         self._load_usage()
 
+    @staticmethod
+    def current_day() -> date:
+        """
+        Dia da quota (os contadores diários zeram na virada deste dia)
+
+        Returns:
+            Data atual no fuso usado pela contagem de quota
+        """
+        return datetime.now().date()
+
+    def attach_coordinator(self, remote):
+        """
+        Passa a usar a quota do coordenador de shards (processos worker)
+
+        Todos os processos contam na mesma quota diária; só o coordenador
+        grava o arquivo. As operações são contadas localmente na hora e
+        enviadas em lote a cada REMOTE_SYNC_INTERVAL segundos por uma thread
+        própria, que traz de volta o uso somado de todos os workers: entre
+        duas sincronizações, cada worker só enxerga o próprio uso recente.
+
+        Args:
+            remote: Proxy do QuotaTracker do coordenador
+        """
+        self._remote = remote
+        logger.info("📊 Quota compartilhada pelo coordenador de shards")
+
+        # Primeiro retrato da quota antes de atender comandos
+        if self._sync_remote():
+            threading.Thread(
+                target=self._remote_sync_loop, name="quota-sync", daemon=True
+            ).start()
+
+    def _remote_sync_loop(self):
+        """Envia as operações pendentes ao coordenador periodicamente (thread)"""
+        while self._remote is not None:
+            self._remote_wakeup.wait(self.REMOTE_SYNC_INTERVAL)
+            self._remote_wakeup.clear()
+            save = self._remote_save.is_set()
+            if self._remote is None or not self._sync_remote(save):
+                break
+            if save:
+                self._remote_save.clear()
+                self._remote_flushed.set()
+
+    def _sync_remote(self, save: bool = False) -> bool:
+        """
+        Envia o lote pendente e atualiza os contadores com o uso de todos os workers
+
+        Se o coordenador caiu, avisa uma vez e passa a contar localmente
+        (o worker continua funcionando, só perde a quota compartilhada).
+
+        Args:
+            save: Pedir ao coordenador que grave o arquivo de quota
+
+        Returns:
+            False se o coordenador está indisponível
+        """
+        remote = self._remote
+        if remote is None:
+            return False
+        with self._remote_lock:
+            batch, self._remote_pending = self._remote_pending, []
+
+        try:
+            stats = dict(remote.sync_operations(batch, save))
+        except (EOFError, OSError) as e:
+            # OSError cobre ConnectionError/BrokenPipeError (coordenador fora do ar)
+            self._remote = None
+            self._dirty = True  # Contadores locais já incluem o lote
+            self._remote_flushed.set()
+            logger.warning(
+                f"⚠️ Coordenador de shards indisponível ({type(e).__name__}); "
+                f"quota passa a ser contada localmente neste processo"
+            )
+            return False
+        except Exception as e:
+            # Erro no coordenador: o lote volta para a próxima tentativa
+            with self._remote_lock:
+                self._remote_pending[:0] = batch
+            logger.warning(f"⚠️ Erro ao sincronizar quota com o coordenador: {e}")
+            return True
+
+        with self._remote_lock:
+            # Uso global + o que este worker contou durante o envio
+            self._remote_stats = stats
+            self.daily_usage = stats["daily_usage"]
+            self.minute_usage = stats["minute_usage"]
+            self.groq_daily_usage = stats["groq_daily_usage"]
+            self.groq_minute_usage = stats["groq_minute_usage"]
+            for operation, _ in self._remote_pending:
+                self._count(operation)
+        return True
+
+    def sync_operations(
+        self, operations: List[Tuple[str, str]], save: bool = False
+    ) -> Dict:
+        """
+        Registra um lote de operações de um worker (chamado no coordenador)
+
+        Args:
+            operations: Lista de (operação, detalhes)
+            save: Gravar o arquivo de quota em seguida (shutdown do worker)
+
+        Returns:
+            Estatísticas atualizadas (get_stats)
+        """
+        for operation, details in operations:
+            self.track_operation(operation, details)
+        if save:
+            self.force_save()
+        return self.get_stats()
+
+    def _count(self, operation: str):
+        """Soma o custo de uma operação aos contadores de uso"""
+        cost = self.OPERATION_COSTS.get(operation, 1)
+        if operation.startswith("groq_"):
+            self.groq_daily_usage += cost
+            self.groq_minute_usage += cost
+        else:
+            self.daily_usage += cost
+            self.minute_usage += cost
+
     def _load_usage(self):
         """Carrega uso do dia do arquivo de cache"""
         if not self.quota_file.exists():
@@ -85,7 +225,7 @@ class QuotaTracker:
 
             # Verifica se é do mesmo dia
             last_date = datetime.fromisoformat(data.get("date", "2000-01-01"))
-            today = datetime.now().date()
+            today = self.current_day()
 
             if last_date.date() == today:
                 self.daily_usage = data.get("daily_usage", 0)
@@ -159,6 +299,13 @@ class QuotaTracker:
             operation: Tipo de operação (search, videos_list, groq_autoplay, etc)
             details: Detalhes adicionais (query, video_id, etc)
         """
+        if self._remote is not None:
+            # Conta já (can_make_request vê na hora) e envia no próximo lote
+            with self._remote_lock:
+                self._remote_pending.append((operation, details))
+                self._count(operation)
+            return
+
         cost = self.OPERATION_COSTS.get(operation, 1)
 
         # Limpa operações antigas
@@ -168,10 +315,8 @@ class QuotaTracker:
         is_groq = operation.startswith("groq_")
 
         # Atualiza contadores apropriados
+        self._count(operation)
         if is_groq:
-            self.groq_daily_usage += cost
-            self.groq_minute_usage += cost
-
             # Registra operação do Groq
             operation_data = {
                 "timestamp": datetime.now().isoformat(),
@@ -181,9 +326,6 @@ class QuotaTracker:
             }
             self.groq_operations_history.append(operation_data)
         else:
-            self.daily_usage += cost
-            self.minute_usage += cost
-
             # Registra operação do YouTube
             operation_data = {
                 "timestamp": datetime.now().isoformat(),
@@ -319,6 +461,22 @@ class QuotaTracker:
         Returns:
             Dict com estatísticas de uso
         """
+        if self._remote is not None and self._remote_stats:
+            # Último retrato do coordenador com o uso contado desde então
+            with self._remote_lock:
+                stats = dict(self._remote_stats)
+                stats["daily_usage"] = self.daily_usage
+                stats["daily_percent"] = self.daily_usage / self.DAILY_LIMIT * 100
+                stats["daily_remaining"] = self.DAILY_LIMIT - self.daily_usage
+                stats["minute_usage"] = self.minute_usage
+                stats["groq_daily_usage"] = self.groq_daily_usage
+                stats["groq_daily_percent"] = (
+                    self.groq_daily_usage / self.GROQ_DAILY_LIMIT * 100
+                )
+                stats["groq_daily_remaining"] = self.GROQ_DAILY_LIMIT - self.groq_daily_usage
+                stats["groq_minute_usage"] = self.groq_minute_usage
+            return stats
+
         self._cleanup_minute_usage()
 
         # YouTube stats
@@ -326,7 +484,7 @@ class QuotaTracker:
         daily_remaining = self.DAILY_LIMIT - self.daily_usage
 
         # Contagem de operações por tipo (últimas 24h)
-        operations_count = {}
+        operations_count: Dict[str, int] = {}
         for op in self.operations_history:
             op_type = op["operation"]
             operations_count[op_type] = operations_count.get(op_type, 0) + 1
@@ -336,7 +494,7 @@ class QuotaTracker:
         groq_daily_remaining = self.GROQ_DAILY_LIMIT - self.groq_daily_usage
 
         # Contagem de operações Groq por tipo
-        groq_operations_count = {}
+        groq_operations_count: Dict[str, int] = {}
         for op in self.groq_operations_history:
             op_type = op["operation"]
             groq_operations_count[op_type] = groq_operations_count.get(op_type, 0) + 1
@@ -431,6 +589,18 @@ class QuotaTracker:
             - Antes de operações críticas
             - Testes
         """
+        if self._remote is not None:
+            # Envio final do lote pela thread de sincronização, que pede ao
+            # coordenador para gravar o arquivo
+            self._remote_flushed.clear()
+            self._remote_save.set()
+            self._remote_wakeup.set()
+            if not self._remote_flushed.wait(self.REMOTE_FLUSH_TIMEOUT):
+                logger.warning("⚠️ Timeout ao enviar a quota pendente ao coordenador")
+            if self._remote is not None:
+                return
+            # Coordenador caiu durante o envio: grava localmente
+
         if self._dirty:
             self._save_usage()
             self._dirty = False
@@ -450,6 +620,8 @@ class QuotaTracker:
         Returns:
             True se pode fazer a requisição
         """
+        # Modo sharded: contadores locais já refletem o último retrato do
+        # coordenador mais o uso deste worker desde então
         cost = self.OPERATION_COSTS.get(operation, 1)
         is_groq = operation.startswith("groq_")
 
@@ -0,0 +1,270 @@
+"""
+Search Cache - Cache persistente de resultados de busca do YouTube
+Cada search().list custa 100 unidades de quota; a mesma busca (query
+normalizada + parâmetros) feita há pouco, por qualquer servidor, é servida
+do SQLite em config.CACHE_DIR sem gastar quota
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.logger import LoggerFactory
+from utils.quota_tracker import QuotaTracker
+
+logger = LoggerFactory.create_logger(__name__)
+
+
+class SearchCache:
+    """
+    Cache persistente de buscas (SQLite)
+
+    - Chave: query normalizada (minúsculas, espaços colapsados) + parâmetros
+    - Entradas expiram após `ttl` segundos
+    - No máximo `max_entries` buscas: acima disso, as acessadas há mais
+      tempo são removidas
+    - Acertos/erros por dia (da quota) ficam no banco (sobrevivem a
+      reinícios e são somados entre processos do modo sharded)
+    - Leituras não escrevem no banco: acertos/erros e last_access ficam em
+      memória e vão para o disco em lote (STATS_FLUSH_BATCH leituras,
+      STATS_FLUSH_INTERVAL segundos, junto de um put, get_stats ou close)
+    """
+
+    # Verificar limite de entradas a cada N escritas
+    SIZE_CHECK_INTERVAL = 50
+
+    # Gravar estatísticas/acessos pendentes a cada N leituras ou T segundos
+    STATS_FLUSH_BATCH = 50
+    STATS_FLUSH_INTERVAL = 60.0
+
+    def __init__(self, db_path: Path, ttl: float, max_entries: int):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._writes_since_check = 0
+
+        # 📝 Pendentes de gravação (com lock)
+        self._stats_day = QuotaTracker.current_day().isoformat()
+        self._pending_hits = 0
+        self._pending_misses = 0
+        self._pending_access: Dict[str, float] = {}  # key -> last_access
+        self._last_flush = time.monotonic()
+
+        # check_same_thread=False: o acesso é serializado pelo lock
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, timeout=5.0
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS searches (
+                key TEXT PRIMARY KEY,
+                items TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_searches_last_access ON searches(last_access)"
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_stats (
+                day TEXT PRIMARY KEY,
+                hits INTEGER NOT NULL DEFAULT 0,
+                misses INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(query: str, **params) -> str:
+        """
+        Monta a chave de uma busca
+
+        Args:
+            query: Termo de busca (normalizado aqui)
+            **params: Demais parâmetros do search().list (maxResults, ...)
+
+        Returns:
+            Chave estável para a mesma busca
+        """
+        normalized = " ".join(query.lower().split())
+        return json.dumps([normalized, params], sort_keys=True, ensure_ascii=False)
+
+    def _count(self, hit: bool):
+        """Conta um acerto/erro em memória no dia da quota (com lock)"""
+        day = QuotaTracker.current_day().isoformat()
+        if day != self._stats_day:
+            # Virada do dia: contagem pendente pertence ao dia anterior
+            self._flush()
+            self._stats_day = day
+
+        if hit:
+            self._pending_hits += 1
+        else:
+            self._pending_misses += 1
+
+    def _flush(self):
+        """Grava acertos/erros e acessos pendentes em uma transação (com lock)"""
+        if self._pending_access:
+            self._conn.executemany(
+                "UPDATE searches SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._pending_access.items()],
+            )
+        if self._pending_hits or self._pending_misses:
+            self._conn.execute(
+                """
+                INSERT INTO search_stats (day, hits, misses) VALUES (?, ?, ?)
+                ON CONFLICT(day) DO UPDATE SET
+                    hits = hits + excluded.hits,
+                    misses = misses + excluded.misses
+                """,
+                (self._stats_day, self._pending_hits, self._pending_misses),
+            )
+        self._conn.commit()
+
+        self._pending_access.clear()
+        self._pending_hits = 0
+        self._pending_misses = 0
+        self._last_flush = time.monotonic()
+
+    def _maybe_flush(self):
+        """Grava os pendentes se o lote encheu ou o intervalo passou (com lock)"""
+        pending = self._pending_hits + self._pending_misses
+        if (
+            pending >= self.STATS_FLUSH_BATCH
+            or time.monotonic() - self._last_flush >= self.STATS_FLUSH_INTERVAL
+        ):
+            self._flush()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Busca os itens de uma busca em cache
+
+        Args:
+            key: Chave de make_key
+
+        Returns:
+            Itens da resposta da API, ou None (ausente/expirada)
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT items, created FROM searches WHERE key = ?", (key,)
+                ).fetchone()
+
+                now = time.time()
+                hit = row is not None and now - row[1] <= self.ttl
+                self._count(hit)
+                if hit:
+                    self._pending_access[key] = now
+                self._maybe_flush()
+
+            if not hit:
+                return None
+            items: List[Dict[str, Any]] = json.loads(row[0])
+            return items
+
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Erro ao ler cache de buscas: {e}")
+            return None
+
+    def put(self, key: str, items: List[Dict[str, Any]]):
+        """
+        Salva os itens de uma busca
+
+        Args:
+            key: Chave de make_key
+            items: Itens da resposta do search().list
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO searches (key, items, created, last_access)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (key, json.dumps(items, ensure_ascii=False), now, now),
+                )
+                self._pending_access.pop(key, None)
+                self._flush()  # Já vai commitar: leva os pendentes junto
+
+                self._writes_since_check += 1
+                if self._writes_since_check >= self.SIZE_CHECK_INTERVAL:
+                    self._writes_since_check = 0
+                    self._enforce_limits()
+
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Erro ao salvar cache de buscas: {e}")
+
+    def _enforce_limits(self):
+        """Remove buscas expiradas e as menos acessadas acima do limite (com lock)"""
+        self._conn.execute(
+            "DELETE FROM searches WHERE created < ?", (time.time() - self.ttl,)
+        )
+        total = self._conn.execute("SELECT COUNT(*) FROM searches").fetchone()[0]
+        if total > self.max_entries:
+            self._conn.execute(
+                """
+                DELETE FROM searches WHERE key IN (
+                    SELECT key FROM searches ORDER BY last_access ASC LIMIT ?
+                )
+                """,
+                (total - self.max_entries,),
+            )
+            logger.info(
+                f"🧹 Cache de buscas acima do limite: {total - self.max_entries} removida(s)"
+            )
+        self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do cache de buscas (acertos/erros de hoje)
+
+        Returns:
+            Dicionário com entradas, acertos, erros e taxa de acerto do dia
+        """
+        try:
+            with self._lock:
+                self._flush()
+                entries = self._conn.execute("SELECT COUNT(*) FROM searches").fetchone()[0]
+                row = self._conn.execute(
+                    "SELECT hits, misses FROM search_stats WHERE day = ?",
+                    (QuotaTracker.current_day().isoformat(),),
+                ).fetchone()
+        except sqlite3.Error:
+            entries, row = 0, None
+
+        hits, misses = row or (0, 0)
+        total = hits + misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_hours": self.ttl / 3600,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total * 100 if total else 0.0,
+        }
+
+    def close(self):
+        """Fecha a conexão com o banco (chamar no shutdown do bot)"""
+        with self._lock:
+            try:
+                self._flush()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Erro ao gravar estatísticas de buscas: {e}")
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass